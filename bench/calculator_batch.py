@@ -0,0 +1,67 @@
+"""Benchmark batch evaluation in the calculator tool.
+
+Evaluates one expression over N rows through ``call_tool``, first with one
+call per row (as a client without batch support would) and then with a
+single call passing every row in ``batch``.
+
+Usage:
+    python bench/calculator_batch.py --rows 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp.server.fastmcp import FastMCP  # noqa: E402
+
+from src.tools.calculator import _numpy, calculate  # noqa: E402
+
+EXPRESSION = "round(price * quantity * (1 + tax), 2)"
+
+
+async def _run(rows: int) -> None:
+    server = FastMCP("calculator")
+    server.tool()(calculate)
+    batch = [
+        {"price": random.uniform(1, 100), "quantity": random.randint(1, 10)}
+        for _ in range(rows)
+    ]
+    variables = {"tax": 0.2}
+
+    start = time.perf_counter()
+    for row in batch:
+        await server.call_tool(
+            "calculate", {"expression": EXPRESSION, "variables": {**variables, **row}}
+        )
+    single = time.perf_counter() - start
+
+    arguments = {"expression": EXPRESSION, "variables": variables, "batch": batch}
+    # Warm up: import NumPy and compile the expression outside the timing
+    await server.call_tool("calculate", arguments)
+    start = time.perf_counter()
+    await server.call_tool("calculate", arguments)
+    batched = time.perf_counter() - start
+
+    print(f"backend: {'numpy' if _numpy() is not None else 'python'}")
+    print(
+        f"{rows:,} calls: {single * 1e3:9,.1f} ms ({single / rows * 1e6:,.1f} us/row)"
+    )
+    print(f"1 batch:    {batched * 1e3:9,.1f} ms ({batched / rows * 1e6:,.1f} us/row)")
+    print(f"speedup:    {single / batched:9,.1f}x (excluding round trips)")
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark JSON encoding of large search results.
+
+Encodes a page of search rows (with datetimes, Decimals and UUIDs, as
+returned by Postgres) with each installed codec backend, then compares a
+full ``call_tool`` returning that page with FastMCP's own result conversion
+and with ``encode_tool_results``.
+
+Usage:
+    python bench/codec_throughput.py --rows 100 --number 500
+"""
+
+import argparse
+import asyncio
+import datetime
+import importlib.util
+import os
+import sys
+import time
+import timeit
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp.server.fastmcp import FastMCP  # noqa: E402
+
+from src.utils.codec import BACKENDS, create_codec, encode_tool_results  # noqa: E402
+
+
+def search_page(rows: int) -> Dict[str, Any]:
+    """Build a page of search results shaped like ``text_search`` output."""
+    results: List[Dict[str, Any]] = [
+        {
+            "id": uuid.uuid4(),
+            "title": f"Article {i}",
+            "searchable_content": "The quick brown fox jumps over the lazy dog. " * 10,
+            "price": Decimal("19.99"),
+            "created_at": datetime.datetime(2024, 1, 1, 12, 0, i % 60),
+            "rank": 0.5 / (i + 1),
+        }
+        for i in range(rows)
+    ]
+    return {"results": results, "next_cursor": "eyJ2IjoxfQ"}
+
+
+async def _call_rate(server: FastMCP, number: int) -> float:
+    """Return seconds per ``search`` call."""
+    for _ in range(min(number, 50)):
+        await server.call_tool("search", {})
+    start = time.perf_counter()
+    for _ in range(number):
+        await server.call_tool("search", {})
+    return (time.perf_counter() - start) / number
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--number", type=int, default=500)
+    args = parser.parse_args()
+
+    page = search_page(args.rows)
+    for name in BACKENDS:
+        if name != "json" and importlib.util.find_spec(name) is None:
+            print(f"{name:>10}: not installed")
+            continue
+        codec = create_codec(name)
+        size = len(codec.dumps(page))
+        seconds = timeit.timeit(lambda: codec.dumps(page), number=args.number)
+        print(
+            f"{name:>10}: {seconds / args.number * 1e6:8,.1f} us/encode "
+            f"({size:,} bytes)"
+        )
+
+    def search() -> Dict[str, Any]:
+        """Return a page of search results."""
+        return page
+
+    default = FastMCP("default")
+    default.tool()(search)
+    encoded = FastMCP("codec")
+    encoded.tool()(search)
+    encode_tool_results(encoded)
+
+    base = asyncio.run(_call_rate(default, args.number))
+    fast = asyncio.run(_call_rate(encoded, args.number))
+    print(f"{'call_tool':>10}: {base * 1e6:8,.1f} us with FastMCP conversion")
+    print(f"{'':>10}  {fast * 1e6:8,.1f} us with the codec ({base / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
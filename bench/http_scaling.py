@@ -0,0 +1,166 @@
+"""Benchmark tool calls/sec over Streamable HTTP as worker processes are added.
+
+For each worker count, starts the server with ``--workers N`` and drives
+``tools/call`` requests for ``add`` at ``/mcp`` from several client
+processes, each keeping ``--concurrency`` requests in flight. Every
+in-flight loop opens its own session, so sessions spread over the workers
+and requests accepted by a worker that does not own their session measure
+the forwarding cost too.
+
+Usage:
+    python bench/http_scaling.py --duration 10 --clients 4 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+HEADERS = {
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+    "MCP-Protocol-Version": "2025-06-18",
+}
+
+
+async def _open_session(client: "httpx.AsyncClient", url: str) -> Dict[str, str]:
+    """Run the MCP handshake and return the headers naming the session."""
+    response = await client.post(
+        url,
+        json={
+            "jsonrpc": "2.0",
+            "id": 0,
+            "method": "initialize",
+            "params": {
+                "protocolVersion": HEADERS["MCP-Protocol-Version"],
+                "capabilities": {},
+                "clientInfo": {"name": "http_scaling", "version": "1.0"},
+            },
+        },
+    )
+    response.raise_for_status()
+    headers = {"mcp-session-id": response.headers["mcp-session-id"]}
+    response = await client.post(
+        url,
+        json={"jsonrpc": "2.0", "method": "notifications/initialized"},
+        headers=headers,
+    )
+    response.raise_for_status()
+    return headers
+
+
+async def _client(url: str, duration: float, concurrency: int) -> int:
+    """Call ``add`` as fast as possible for ``duration`` seconds."""
+    import httpx
+
+    deadline = time.perf_counter() + duration
+    completed = 0
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=30) as client:
+
+        async def loop(worker: int) -> None:
+            nonlocal completed
+            session = await _open_session(client, url)
+            request_id = worker * 10_000_000
+            while time.perf_counter() < deadline:
+                request_id += 1
+                response = await client.post(
+                    url,
+                    json={
+                        "jsonrpc": "2.0",
+                        "id": request_id,
+                        "method": "tools/call",
+                        "params": {"name": "add", "arguments": {"a": 1, "b": 2}},
+                    },
+                    headers=session,
+                )
+                response.raise_for_status()
+                completed += 1
+
+        await asyncio.gather(*(loop(worker) for worker in range(concurrency)))
+    return completed
+
+
+def _client_process(url: str, duration: float, concurrency: int) -> int:
+    return asyncio.run(_client(url, duration, concurrency))
+
+
+def _wait_ready(port: int, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/mcp", headers=HEADERS, timeout=1)
+            return
+        except httpx.TransportError:
+            time.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+def run(
+    workers: int, port: int, duration: float, clients: int, concurrency: int
+) -> float:
+    """Serve with ``workers`` processes and return tool calls/sec."""
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "src.main",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(port)
+        url = f"http://127.0.0.1:{port}/mcp"
+        start = time.perf_counter()
+        with multiprocessing.Pool(clients) as pool:
+            counts = pool.starmap(
+                _client_process, [(url, duration, concurrency)] * clients
+            )
+        return sum(counts) / (time.perf_counter() - start)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    counts: List[int] = []
+    workers = 1
+    while workers <= args.max_workers:
+        counts.append(workers)
+        workers *= 2
+    if counts[-1] != args.max_workers:
+        counts.append(args.max_workers)
+
+    baseline = None
+    for workers in counts:
+        rate = run(workers, args.port, args.duration, args.clients, args.concurrency)
+        baseline = baseline or rate
+        print(f"workers={workers}: {rate:,.0f} calls/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,583 @@
+"""End-to-end load test of the server over stdio, Streamable HTTP and SSE.
+
+Starts the real server (through ``bench/serve.py``, which adds the search
+and API tools backed by local stand-ins) once per transport, then runs each
+scenario for ``--duration`` seconds and reports throughput, p50/p95/p99
+latency, errors and the server's resident memory:
+
+- ``add``: the ``add`` tool
+- ``prompts``: ``prompts/get`` for the ``math_problem`` prompt
+- ``search``: ``search_database`` and ``semantic_search``
+- ``api``: tools generated from the fake OpenAPI upstream
+
+By default each scenario is closed-loop: ``--concurrency`` clients send
+their next request as soon as the previous one returns. With ``--rate``,
+requests are sent on a fixed schedule instead, and latency is measured
+from the scheduled send time, so a stalled server shows up in the tail
+rather than slowing the load down.
+
+Results can be written with ``--output`` and compared with a baseline
+produced by an earlier run; the exit status is 1 when a result regressed
+beyond ``--tolerance``. No baseline is committed, since the numbers only
+mean something on the machine that recorded them: record one first with
+the same settings, and record it again after changing the machine or the
+settings.
+
+Usage:
+    python bench/loadgen.py --duration 10 --concurrency 16 --output baseline.json
+    python bench/loadgen.py --duration 10 --concurrency 16 --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROTOCOL_VERSION = "2025-06-18"
+HEADERS = {
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+    "MCP-Protocol-Version": PROTOCOL_VERSION,
+}
+
+Request = Tuple[str, Dict[str, Any]]
+
+
+def _tool(name: str, arguments: Dict[str, Any]) -> Request:
+    return "tools/call", {"name": name, "arguments": arguments}
+
+
+# Each scenario cycles through its requests; ``requires`` lists the tools or
+# prompts the server must expose for the scenario to run
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "add": {
+        "requires": ["add"],
+        "requests": lambda i: _tool("add", {"a": i, "b": 2}),
+    },
+    "prompts": {
+        "requires": ["math_problem"],
+        "requests": lambda i: (
+            "prompts/get",
+            {"name": "math_problem", "arguments": {"problem": f"What is {i} * 7?"}},
+        ),
+    },
+    "search": {
+        "requires": ["search_database", "semantic_search"],
+        "requests": lambda i: _tool(
+            "search_database" if i % 2 else "semantic_search",
+            {"collection": "articles", "query": f"w{i % 50} w{i % 7}", "limit": 10},
+        ),
+    },
+    "api": {
+        "requires": ["get_item", "list_items"],
+        "requests": lambda i: (
+            _tool("get_item", {"item_id": i})
+            if i % 2
+            else _tool("list_items", {"q": "bench", "limit": 10})
+        ),
+    },
+}
+
+
+class RpcError(Exception):
+    """A JSON-RPC error response, or a tool result flagged ``isError``."""
+
+
+def _check(message: Dict[str, Any]) -> Dict[str, Any]:
+    if "error" in message:
+        raise RpcError(message["error"].get("message", "error"))
+    result = message.get("result", {})
+    if isinstance(result, dict) and result.get("isError"):
+        raise RpcError("tool returned isError")
+    return result
+
+
+def _sse_data(text: str) -> List[Dict[str, Any]]:
+    """Decode the JSON ``data:`` payloads of an SSE body."""
+    return [
+        json.loads(line[5:].strip())
+        for line in text.splitlines()
+        if line.startswith("data:") and line[5:].strip()
+    ]
+
+
+class _Client:
+    """Correlates responses with requests by id."""
+
+    def __init__(self) -> None:
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+
+    def _resolve(self, message: Dict[str, Any]) -> None:
+        future = self._pending.pop(message.get("id"), None)
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    async def call(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request and wait for its result."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self._send(
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        )
+        return _check(await future)
+
+    async def notify(self, method: str) -> None:
+        """Send a notification."""
+        await self._send({"jsonrpc": "2.0", "method": method})
+
+    async def initialize(self) -> None:
+        """Run the MCP handshake."""
+        await self.call(
+            "initialize",
+            {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": {"name": "loadgen", "version": "1.0"},
+            },
+        )
+        await self.notify("notifications/initialized")
+
+    async def close(self) -> None:
+        """Release the connection."""
+
+
+class StdioClient(_Client):
+    """Talks to a server subprocess over its stdin and stdout."""
+
+    def __init__(self, process: asyncio.subprocess.Process) -> None:
+        super().__init__()
+        self.process = process
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                break
+            self._resolve(json.loads(line))
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        self.process.stdin.write(json.dumps(message).encode() + b"\n")
+        await self.process.stdin.drain()
+
+    async def close(self) -> None:
+        self._reader.cancel()
+
+
+class StreamableHttpClient(_Client):
+    """Posts each request to the Streamable HTTP endpoint."""
+
+    def __init__(self, url: str, concurrency: int) -> None:
+        import httpx
+
+        super().__init__()
+        self.url = url
+        self.http = httpx.AsyncClient(
+            headers=HEADERS,
+            limits=httpx.Limits(max_connections=concurrency),
+            timeout=60,
+        )
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        response = await self.http.post(self.url, json=message)
+        response.raise_for_status()
+        session_id = response.headers.get("mcp-session-id")
+        if session_id:
+            self.http.headers["mcp-session-id"] = session_id
+        if "id" not in message or response.status_code == 202:
+            return
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            replies = _sse_data(response.text)
+        else:
+            replies = [response.json()]
+        for reply in replies:
+            self._resolve(reply)
+
+    async def close(self) -> None:
+        await self.http.aclose()
+
+
+class SseClient(_Client):
+    """Holds an SSE stream open and posts requests to its message endpoint."""
+
+    def __init__(self, url: str, concurrency: int) -> None:
+        import httpx
+
+        super().__init__()
+        self.url = url
+        self.http = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=concurrency + 1), timeout=60
+        )
+        self._endpoint: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        from urllib.parse import urljoin
+
+        event = None
+        async with self.http.stream(
+            "GET", self.url, headers={"Accept": "text/event-stream"}, timeout=None
+        ) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data = line[5:].strip()
+                    if event == "endpoint":
+                        self._endpoint.set_result(urljoin(self.url, data))
+                    else:
+                        self._resolve(json.loads(data))
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        endpoint = await self._endpoint
+        response = await self.http.post(endpoint, json=message)
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        self._reader.cancel()
+        await self.http.aclose()
+
+
+def _rss(pid: int) -> Dict[str, Optional[float]]:
+    """Current and peak resident memory of a process in MiB (Linux only)."""
+    values: Dict[str, Optional[float]] = {"rss_mb": None, "peak_rss_mb": None}
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    values["rss_mb"] = int(line.split()[1]) / 1024
+                elif line.startswith("VmHWM:"):
+                    values["peak_rss_mb"] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return values
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_scenario(
+    client: _Client,
+    requests: Callable[[int], Request],
+    duration: float,
+    concurrency: int,
+    rate: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Drive one scenario and summarize it.
+
+    Args:
+        client: Connected client
+        requests: Builds the i-th request
+        duration: Seconds to run
+        concurrency: Closed-loop clients (ignored with ``rate``)
+        rate: Requests/sec on a fixed schedule (open loop)
+
+    Returns:
+        Throughput, latency percentiles in milliseconds and error count
+    """
+    latencies: List[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def one(scheduled: float) -> None:
+        nonlocal errors
+        method, params = requests(next(counter))
+        try:
+            await client.call(method, params)
+        except Exception:
+            errors += 1
+            return
+        latencies.append(time.perf_counter() - scheduled)
+
+    start = time.perf_counter()
+    deadline = start + duration
+    if rate:
+        tasks = []
+        for i in itertools.count():
+            scheduled = start + i / rate
+            if scheduled >= deadline:
+                break
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            tasks.append(asyncio.create_task(one(scheduled)))
+        await asyncio.gather(*tasks)
+    else:
+
+        async def loop() -> None:
+            while time.perf_counter() < deadline:
+                await one(time.perf_counter())
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def _available(client: _Client) -> set:
+    tools = await client.call("tools/list", {})
+    prompts = await client.call("prompts/list", {})
+    return {tool["name"] for tool in tools.get("tools", [])} | {
+        prompt["name"] for prompt in prompts.get("prompts", [])
+    }
+
+
+def _server_command(transport: str, args: argparse.Namespace) -> List[str]:
+    return [
+        sys.executable,
+        os.path.join(ROOT, "bench", "serve.py"),
+        "--transport",
+        "stdio" if transport == "stdio" else "http",
+        "--port",
+        str(args.port),
+        "--upstream-port",
+        str(args.upstream_port),
+        "--upstream-latency",
+        str(args.upstream_latency),
+        "--search",
+        args.search,
+        "--log-level",
+        "warning",
+    ]
+
+
+async def _wait_ready(url: str, timeout: float = 60.0) -> None:
+    import httpx
+
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(timeout=1) as http:
+        while time.perf_counter() < deadline:
+            try:
+                await http.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+
+async def run_transport(
+    transport: str, scenarios: List[str], args: argparse.Namespace
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Start a server for one transport and run the scenarios against it.
+
+    Returns:
+        Results keyed by ``transport/scenario``, and the server's memory
+    """
+    command = _server_command(transport, args)
+    if transport == "stdio":
+        process: Any = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=ROOT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=1 << 24,
+        )
+        client: _Client = StdioClient(process)
+    else:
+        process = subprocess.Popen(command, cwd=ROOT)
+        base = f"http://127.0.0.1:{args.port}"
+        await _wait_ready(f"{base}/metrics")
+        if transport == "http":
+            client = StreamableHttpClient(f"{base}/mcp", args.concurrency)
+        else:
+            client = SseClient(f"{base}/sse", args.concurrency)
+
+    results: Dict[str, Any] = {}
+    try:
+        await client.initialize()
+        available = await _available(client)
+        for name in scenarios:
+            scenario = SCENARIOS[name]
+            missing = [n for n in scenario["requires"] if n not in available]
+            key = f"{transport}/{name}"
+            if missing:
+                print(f"{key:>16}: skipped, server lacks {', '.join(missing)}")
+                continue
+            if args.warmup:
+                await run_scenario(
+                    client, scenario["requests"], args.warmup, args.concurrency
+                )
+            results[key] = await run_scenario(
+                client,
+                scenario["requests"],
+                args.duration,
+                args.concurrency,
+                args.rate,
+            )
+            _print_result(key, results[key])
+        memory = _rss(process.pid)
+    finally:
+        await client.close()
+        if transport == "stdio":
+            process.stdin.close()
+            process.terminate()
+            await process.wait()
+        else:
+            process.terminate()
+            process.wait()
+    return results, memory
+
+
+def _print_result(key: str, result: Dict[str, Any]) -> None:
+    print(
+        f"{key:>16}: {result['throughput']:9,.0f} req/s  "
+        f"p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms  "
+        f"p99 {result['p99_ms']:7.2f} ms  errors {result['errors']}"
+    )
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    List the regressions of a run against a baseline run.
+
+    Throughput may drop, and p99 latency and peak memory may grow, by at
+    most ``tolerance`` (a fraction). Latency changes under a millisecond
+    are ignored as noise.
+
+    Returns:
+        One line per regression
+    """
+    regressions = []
+    for key, base in baseline.get("results", {}).items():
+        result = current["results"].get(key)
+        if result is None:
+            continue
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{key}: throughput {result['throughput']:,.0f} req/s "
+                f"vs {base['throughput']:,.0f}"
+            )
+        if (
+            result["p99_ms"] > base["p99_ms"] * (1 + tolerance)
+            and result["p99_ms"] - base["p99_ms"] > 1.0
+        ):
+            regressions.append(
+                f"{key}: p99 {result['p99_ms']:.2f} ms vs {base['p99_ms']:.2f} ms"
+            )
+        if result["errors"] > base["errors"]:
+            regressions.append(f"{key}: {result['errors']} errors vs {base['errors']}")
+    for transport, base in baseline.get("memory", {}).items():
+        peak = current["memory"].get(transport, {}).get("peak_rss_mb")
+        if (
+            peak
+            and base.get("peak_rss_mb")
+            and peak > base["peak_rss_mb"] * (1 + tolerance)
+        ):
+            regressions.append(
+                f"{transport}: peak RSS {peak:.0f} MiB vs {base['peak_rss_mb']:.0f}"
+            )
+    return regressions
+
+
+def _machine() -> Dict[str, Any]:
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Run every transport and scenario and collect the results."""
+    report: Dict[str, Any] = {
+        "machine": _machine(),
+        "settings": {
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "search": args.search,
+            "upstream_latency": args.upstream_latency,
+        },
+        "results": {},
+        "memory": {},
+    }
+    for transport in args.transports.split(","):
+        results, memory = await run_transport(
+            transport, args.scenarios.split(","), args
+        )
+        report["results"].update(results)
+        report["memory"][transport] = memory
+        if memory["peak_rss_mb"] is not None:
+            print(
+                f"{transport:>16}: RSS {memory['rss_mb']:.0f} MiB, "
+                f"peak {memory['peak_rss_mb']:.0f} MiB"
+            )
+    return report
+
+
+def main() -> None:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transports", default="stdio,http,sse")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--rate", type=float, default=None, help="Open-loop requests/sec"
+    )
+    parser.add_argument("--search", choices=["standin", "postgres"], default="standin")
+    parser.add_argument("--upstream-latency", type=float, default=0.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--upstream-port", type=int, default=8766)
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="Compare with the results of a past run")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.15,
+        help="Allowed regression as a fraction (default: 0.15)",
+    )
+    args = parser.parse_args()
+
+    for name in args.scenarios.split(","):
+        if name not in SCENARIOS:
+            parser.error(f"Unknown scenario: {name}")
+
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        if baseline.get("machine") != report["machine"]:
+            print("warning: the baseline was recorded on a different machine")
+        if baseline.get("settings") != report["settings"]:
+            print("warning: the baseline was recorded with different settings")
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark the hot-path cost of metrics.
+
+Times the primitive updates (counter increment, histogram observation) and
+the per-call overhead that tool instrumentation adds to ``call_tool`` on an
+in-process FastMCP server.
+
+Usage:
+    python bench/metrics_overhead.py --calls 50000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp.server.fastmcp import FastMCP  # noqa: E402
+
+from src.utils.metrics import MetricsRegistry, instrument_tools  # noqa: E402
+
+
+def add(a: float, b: float) -> float:
+    """Add two numbers together."""
+    return a + b
+
+
+async def _call_rate(server: FastMCP, calls: int) -> float:
+    """Return seconds per ``add`` call."""
+    for _ in range(1000):
+        await server.call_tool("add", {"a": 1, "b": 2})
+    start = time.perf_counter()
+    for i in range(calls):
+        await server.call_tool("add", {"a": i, "b": 2})
+    return (time.perf_counter() - start) / calls
+
+
+def primitives(number: int) -> None:
+    """Print the cost of the primitive metric updates."""
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", "Bench counter.", ["tool"]).labels("add")
+    histogram = registry.histogram(
+        "bench_seconds", "Bench histogram.", ["tool"]
+    ).labels("add")
+    for label, statement in (
+        ("counter inc", counter.inc),
+        ("histogram observe", lambda: histogram.observe(0.0042)),
+        ("perf_counter", time.perf_counter),
+    ):
+        seconds = timeit.timeit(statement, number=number) / number
+        print(f"{label:>18}: {seconds * 1e9:,.0f} ns")
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    primitives(args.calls * 10)
+
+    plain = FastMCP("plain")
+    plain.tool()(add)
+    instrumented = FastMCP("instrumented")
+    instrumented.tool()(add)
+    instrument_tools(instrumented)
+
+    # Interleave rounds and keep the best of each to filter out noise
+    base = measured = float("inf")
+    for _ in range(args.rounds):
+        base = min(base, asyncio.run(_call_rate(plain, args.calls)))
+        measured = min(measured, asyncio.run(_call_rate(instrumented, args.calls)))
+    print(f"{'call_tool':>18}: {base * 1e6:,.2f} us")
+    print(
+        f"{'instrumented':>18}: {measured * 1e6:,.2f} us "
+        f"(+{(measured - base) * 1e9:,.0f} ns, {measured / base - 1:+.1%})"
+    )
+
+
+if __name__ == "__main__":
+    main()
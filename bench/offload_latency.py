@@ -0,0 +1,121 @@
+"""Benchmark tool latency while a CPU-heavy tool runs, per execution policy.
+
+For each policy, registers a CPU-bound ``spin`` tool with that policy next to
+an inline ``add`` tool, keeps ``--heavy`` ``spin`` calls running and measures
+the latency of ``add`` calls made from other concurrent sessions.
+
+Usage:
+    python bench/offload_latency.py --calls 200 --sessions 8 --heavy 2
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp.server.fastmcp import FastMCP  # noqa: E402
+
+from src.utils.execution import (  # noqa: E402
+    ExecutionPolicy,
+    offloaded_tool,
+    shutdown_pools,
+)
+
+
+def spin(iterations: int) -> int:
+    """Burn CPU in pure Python."""
+    total = 0
+    for i in range(iterations):
+        total += i * i % 7
+    return total
+
+
+def add(a: float, b: float) -> float:
+    """Add two numbers together."""
+    return a + b
+
+
+async def run(
+    policy: ExecutionPolicy,
+    calls: int,
+    sessions: int,
+    heavy: int,
+    iterations: int,
+    interval: float,
+) -> Dict[str, float]:
+    """Measure ``add`` latency while ``spin`` runs under ``policy``."""
+    server = FastMCP("offload-bench")
+    server.tool()(add)
+    offloaded_tool(server, policy)(spin)
+
+    stop = asyncio.Event()
+
+    async def heavy_session() -> None:
+        while not stop.is_set():
+            await server.call_tool("spin", {"iterations": iterations})
+            # Give other sessions a turn, as a transport's read loop would
+            await asyncio.sleep(0)
+
+    latencies: List[float] = []
+
+    async def light_session() -> None:
+        # Requests are due on a fixed schedule; latency counts from the due
+        # time so time spent waiting for a blocked loop is included
+        first = time.perf_counter()
+        for i in range(calls):
+            due = first + i * interval
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            await server.call_tool("add", {"a": i, "b": 1})
+            latencies.append(time.perf_counter() - due)
+
+    background = [asyncio.create_task(heavy_session()) for _ in range(heavy)]
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*(light_session() for _ in range(sessions)))
+    stop.set()
+    await asyncio.gather(*background)
+
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "max": latencies[-1] * 1000,
+    }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--heavy", type=int, default=2)
+    parser.add_argument("--iterations", type=int, default=2_000_000)
+    parser.add_argument(
+        "--interval", type=float, default=0.005, help="Seconds between add calls"
+    )
+    args = parser.parse_args()
+
+    for policy in ExecutionPolicy:
+        stats = asyncio.run(
+            run(
+                policy,
+                args.calls,
+                args.sessions,
+                args.heavy,
+                args.iterations,
+                args.interval,
+            )
+        )
+        print(
+            f"{policy.value:>7}: add p50 {stats['p50']:.2f} ms, "
+            f"p99 {stats['p99']:.2f} ms, max {stats['max']:.2f} ms"
+        )
+    shutdown_pools()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Run the server from ``src/main.py`` with benchmark stand-ins wired in.
+
+On top of the tools and prompts ``src/main.py`` registers, this adds:
+
+- ``search_database`` and ``semantic_search``, backed by the in-memory
+  stand-in from ``bench/standins.py`` (or Postgres with ``--search
+  postgres``, using the ``DB_*`` settings)
+- the tools generated from the fake OpenAPI upstream, which is started in
+  the same process; each tool sends real HTTP requests to it through
+  ``APIToolFactory``
+
+The server is then run exactly as by ``mcp-server-template``.
+
+Usage:
+    python bench/serve.py --transport stdio
+    python bench/serve.py --transport http --port 8765
+"""
+
+import argparse
+import asyncio
+import inspect
+import os
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.standins import (  # noqa: E402
+    InMemorySearchEngine,
+    hash_embedder,
+    serve_upstream,
+)
+from src.database.embeddings import get_embedding, register_embedder  # noqa: E402
+from src.utils import setup_logging  # noqa: E402
+
+_SCHEMA_TYPES = {"integer": int, "number": float, "boolean": bool, "string": str}
+
+
+def register_search_tools(server: Any, engine: Any) -> None:
+    """Register the search tools against a search engine."""
+
+    @server.tool()
+    async def search_database(
+        collection: str, query: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Search the database using text-based search."""
+        return await engine.text_search(collection, query, limit, cursor)
+
+    @server.tool()
+    async def semantic_search(
+        collection: str, query: str, limit: int = 10, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Search the database using semantic vector search."""
+        embedding = await get_embedding(query)
+        return await engine.vector_search(collection, embedding, limit, cursor=cursor)
+
+
+def _with_signature(
+    function: Callable[..., Awaitable[Any]], parameters: List[Dict[str, Any]]
+) -> Callable[..., Awaitable[Any]]:
+    """Give an operation function a typed signature for tool registration."""
+
+    async def call(**kwargs: Any) -> Any:
+        return await function(
+            **{key: value for key, value in kwargs.items() if value is not None}
+        )
+
+    call.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+        [
+            inspect.Parameter(
+                param["name"],
+                inspect.Parameter.KEYWORD_ONLY,
+                annotation=(
+                    _SCHEMA_TYPES.get(param.get("schema", {}).get("type"), str)
+                    if param.get("required")
+                    else Optional[
+                        _SCHEMA_TYPES.get(param.get("schema", {}).get("type"), str)
+                    ]
+                ),
+                default=inspect.Parameter.empty if param.get("required") else None,
+            )
+            for param in parameters
+            if param.get("in") in ("path", "query")
+        ]
+    )
+    return call
+
+
+async def register_upstream_tools(server: Any, spec_url: str) -> List[str]:
+    """
+    Register a tool for every operation of an OpenAPI upstream.
+
+    Args:
+        server: The FastMCP server
+        spec_url: URL of the upstream's OpenAPI spec
+
+    Returns:
+        Names of the registered tools
+    """
+    from src.api.factory import APIToolFactory
+
+    factory = APIToolFactory()
+    spec = await factory._fetch_spec(spec_url)
+    base_url = factory._base_url(spec, spec_url)
+    names = []
+    for path, operations in spec.get("paths", {}).items():
+        for method, operation in operations.items():
+            parameters = operation.get("parameters", [])
+            function = factory._operation_function(
+                path, method, parameters, {}, base_url
+            )
+            server.add_tool(
+                _with_signature(function, parameters),
+                name=operation["operationId"],
+                description=operation.get("description", ""),
+            )
+            names.append(operation["operationId"])
+    return names
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """Wire in the stand-ins and run the server."""
+    from src import main as server
+
+    register_embedder(hash_embedder)
+    if args.search == "postgres":
+        from src.database.search import DatabaseSearchEngine
+
+        engine: Any = DatabaseSearchEngine()
+    else:
+        engine = InMemorySearchEngine(documents=args.documents)
+    register_search_tools(server.mcp, engine)
+
+    if args.upstream_port:
+        spec_url = serve_upstream(args.upstream_port, args.upstream_latency)
+        await register_upstream_tools(server.mcp, spec_url)
+
+    transport = (
+        server.Transport.STDIO if args.transport == "stdio" else server.Transport.HTTP
+    )
+    await server.run_server(port=args.port, host=args.host, transport=transport)
+
+
+def main() -> None:
+    """Run the harness from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transport", choices=["http", "stdio"], default="http")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--search", choices=["standin", "postgres"], default="standin")
+    parser.add_argument(
+        "--documents", type=int, default=5000, help="Stand-in corpus size"
+    )
+    parser.add_argument(
+        "--upstream-port",
+        type=int,
+        default=8766,
+        help="Port for the fake OpenAPI upstream (0 disables it)",
+    )
+    parser.add_argument(
+        "--upstream-latency",
+        type=float,
+        default=0.0,
+        help="Seconds the fake upstream waits before answering",
+    )
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    setup_logging(args.log_level, stream=sys.stderr)
+    asyncio.run(serve(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""Local stand-ins for the services the server talks to during benchmarks.
+
+- ``upstream_app`` is a fake OpenAPI upstream: it serves its own spec at
+  ``/openapi.json`` plus a few JSON operations, optionally with a fixed
+  delay to mimic a remote API.
+- ``InMemorySearchEngine`` has the interface of ``DatabaseSearchEngine``
+  and serves full-text and vector search over a generated corpus, with the
+  same result shape and keyset cursors, for runs without Postgres.
+- ``hash_embedder`` is a deterministic embedding model.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from src.database.pagination import (
+    clamp_limit,
+    decode_cursor,
+    fingerprint,
+    next_cursor,
+)
+
+DIMENSIONS = 32
+COLLECTION = "articles"
+
+SPEC: Dict[str, Any] = {
+    "openapi": "3.0.3",
+    "info": {"title": "Bench upstream", "version": "1.0"},
+    "paths": {
+        "/items/{item_id}": {
+            "get": {
+                "operationId": "get_item",
+                "description": "Fetch one item.",
+                "parameters": [
+                    {
+                        "name": "item_id",
+                        "in": "path",
+                        "required": True,
+                        "schema": {"type": "integer"},
+                    }
+                ],
+            }
+        },
+        "/items": {
+            "get": {
+                "operationId": "list_items",
+                "description": "List items matching a query.",
+                "parameters": [
+                    {"name": "q", "in": "query", "schema": {"type": "string"}},
+                    {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+                ],
+            }
+        },
+    },
+}
+
+
+def upstream_app(latency: float = 0.0) -> Any:
+    """
+    Build the fake OpenAPI upstream.
+
+    Args:
+        latency: Seconds each operation waits before answering
+
+    Returns:
+        A Starlette app
+    """
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    async def spec(request: Any) -> Any:
+        return JSONResponse(SPEC)
+
+    async def get_item(request: Any) -> Any:
+        if latency:
+            await asyncio.sleep(latency)
+        item_id = int(request.path_params["item_id"])
+        return JSONResponse({"id": item_id, "name": f"item-{item_id}", "price": 9.99})
+
+    async def list_items(request: Any) -> Any:
+        if latency:
+            await asyncio.sleep(latency)
+        query = request.query_params.get("q", "")
+        limit = int(request.query_params.get("limit", "10"))
+        return JSONResponse(
+            {"items": [{"id": i, "name": f"{query}-{i}"} for i in range(limit)]}
+        )
+
+    return Starlette(
+        routes=[
+            Route("/openapi.json", spec),
+            Route("/items/{item_id}", get_item),
+            Route("/items", list_items),
+        ]
+    )
+
+
+def serve_upstream(port: int, latency: float = 0.0) -> str:
+    """
+    Serve the fake upstream from a background thread.
+
+    Args:
+        port: Port to listen on (127.0.0.1)
+        latency: Seconds each operation waits before answering
+
+    Returns:
+        URL of the upstream's OpenAPI spec
+    """
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            upstream_app(latency), host="127.0.0.1", port=port, log_level="warning"
+        )
+    )
+    threading.Thread(target=server.run, name="bench-upstream", daemon=True).start()
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Fake upstream did not start")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/openapi.json"
+
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def _embed(text: str) -> List[float]:
+    """Deterministic unit vector for a text."""
+    seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "big")
+    rng = random.Random(seed)
+    vector = [rng.gauss(0.0, 1.0) for _ in range(DIMENSIONS)]
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+async def hash_embedder(texts: List[str]) -> List[List[float]]:
+    """Embedding model stand-in for ``register_embedder``."""
+    return [_embed(text) for text in texts]
+
+
+class InMemorySearchEngine:
+    """Serves the search tools from a generated in-memory corpus."""
+
+    def __init__(self, documents: int = 5000, vocabulary: int = 2000, seed: int = 7):
+        """
+        Generate the corpus and its indexes.
+
+        Args:
+            documents: Number of documents in the ``articles`` collection
+            vocabulary: Number of distinct words; word frequencies follow
+                a Zipf distribution like natural text
+            seed: Random seed, so runs are comparable
+        """
+        rng = random.Random(seed)
+        words = [f"w{i}" for i in range(vocabulary)]
+        weights = [1.0 / (rank + 1) for rank in range(vocabulary)]
+        self.rows: List[Dict[str, Any]] = []
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        for doc_id in range(1, documents + 1):
+            content = " ".join(rng.choices(words, weights, k=rng.randint(20, 80)))
+            tokens = _tokens(content)
+            for token in tokens:
+                postings = self._postings[token]
+                postings[doc_id] = postings.get(doc_id, 0) + 1
+            self.rows.append(
+                {
+                    "id": doc_id,
+                    "title": f"Article {doc_id}",
+                    "searchable_content": content,
+                    "length": len(tokens),
+                }
+            )
+        self._embeddings = [_embed(row["searchable_content"]) for row in self.rows]
+
+    def _require(self, collection: str) -> None:
+        if collection != COLLECTION:
+            raise ValueError(f"Unknown collection: {collection}")
+
+    async def text_search(
+        self,
+        collection: str,
+        query: str,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Rank documents by query term frequency, like ``ts_rank``."""
+        self._require(collection)
+        limit = clamp_limit(limit, 100)
+        search_fingerprint = fingerprint("fts", collection, query)
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(_tokens(query)):
+            for doc_id, count in self._postings.get(token, {}).items():
+                scores[doc_id] += count / self.rows[doc_id - 1]["length"]
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if cursor:
+            after_rank, after_key = decode_cursor(cursor, "fts", search_fingerprint)
+            ranked = [
+                (doc_id, rank)
+                for doc_id, rank in ranked
+                if rank < after_rank or (rank == after_rank and doc_id > after_key)
+            ]
+        rows = [
+            {**self.rows[doc_id - 1], "rank": rank}
+            for doc_id, rank in ranked[: limit + 1]
+        ]
+        return {
+            "results": rows,
+            "next_cursor": next_cursor(
+                rows, limit, "fts", "rank", "id", search_fingerprint
+            ),
+        }
+
+    async def vector_search(
+        self,
+        collection: str,
+        embedding: List[float],
+        limit: int = 10,
+        similarity_threshold: float = 0.0,
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Brute-force cosine distance over every document."""
+        self._require(collection)
+        limit = clamp_limit(limit, 100)
+        search_fingerprint = fingerprint(
+            "vector", collection, embedding, similarity_threshold
+        )
+        max_distance = 1 - similarity_threshold
+        scored = []
+        for index, vector in enumerate(self._embeddings):
+            distance = 1 - sum(a * b for a, b in zip(embedding, vector))
+            if distance < max_distance:
+                scored.append((distance, index + 1))
+        scored.sort()
+        if cursor:
+            after_distance, after_key = decode_cursor(
+                cursor, "vector", search_fingerprint
+            )
+            scored = [
+                (distance, doc_id)
+                for distance, doc_id in scored
+                if distance > after_distance
+                or (distance == after_distance and doc_id > after_key)
+            ]
+        rows = [
+            {**self.rows[doc_id - 1], "distance": distance, "similarity": 1 - distance}
+            for distance, doc_id in scored[: limit + 1]
+        ]
+        return {
+            "results": rows,
+            "next_cursor": next_cursor(
+                rows, limit, "vector", "distance", "id", search_fingerprint
+            ),
+        }
+
+    async def get_available_collections(self) -> List[Dict[str, Any]]:
+        """Describe the generated collection."""
+        return [
+            {
+                "name": COLLECTION,
+                "row_estimate": len(self.rows),
+                "supports_text_search": True,
+                "supports_vector_search": True,
+            }
+        ]
@@ -0,0 +1,94 @@
+"""Benchmark messages/sec through the stdio transport.
+
+Starts the server as a subprocess with ``--transport stdio`` and pipes
+``tools/call`` requests for ``add`` through it, keeping up to ``--window``
+requests outstanding.
+
+Usage:
+    python bench/stdio_throughput.py --messages 20000 --window 256
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+
+def _request(request_id: int, method: str, params: dict) -> bytes:
+    message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+    return json.dumps(message).encode() + b"\n"
+
+
+async def run(messages: int, window: int) -> float:
+    """Pipe ``messages`` requests through the server and return messages/sec."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "src.main",
+        "--transport",
+        "stdio",
+        "--log-level",
+        "warning",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        limit=1 << 24,
+    )
+    process.stdin.write(
+        _request(
+            0,
+            "initialize",
+            {
+                "protocolVersion": "2025-06-18",
+                "capabilities": {},
+                "clientInfo": {"name": "stdio_throughput", "version": "1.0"},
+            },
+        )
+    )
+    await process.stdin.drain()
+    await process.stdout.readline()
+
+    slots = asyncio.Semaphore(window)
+
+    async def send() -> None:
+        for request_id in range(1, messages + 1):
+            await slots.acquire()
+            process.stdin.write(
+                _request(
+                    request_id,
+                    "tools/call",
+                    {"name": "add", "arguments": {"a": request_id, "b": 1}},
+                )
+            )
+            if request_id % 64 == 0:
+                await process.stdin.drain()
+        await process.stdin.drain()
+
+    async def receive() -> None:
+        for _ in range(messages):
+            line = await process.stdout.readline()
+            if not line:
+                raise RuntimeError("Server closed stdout early")
+            slots.release()
+
+    start = time.perf_counter()
+    await asyncio.gather(send(), receive())
+    elapsed = time.perf_counter() - start
+
+    process.stdin.close()
+    await process.wait()
+    return messages / elapsed
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--window", type=int, default=256)
+    args = parser.parse_args()
+    rate = asyncio.run(run(args.messages, args.window))
+    print(f"stdio: {args.messages} messages, window {args.window}: {rate:,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
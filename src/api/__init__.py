@@ -2,12 +2,13 @@
 
 from .factory import APIToolFactory
 from .provider import DynamicToolProvider
-from .models import APIConfig, AuthConfig, RateLimitConfig
+from .models import APIConfig, AuthConfig, ConcurrencyLimitConfig, RateLimitConfig
 
 __all__ = [
     "APIToolFactory",
     "DynamicToolProvider",
     "APIConfig",
     "AuthConfig",
+    "ConcurrencyLimitConfig",
     "RateLimitConfig",
 ] 
\ No newline at end of file
@@ -1,14 +1,35 @@
 """API tool factory for generating MCP tools from API specifications."""
 
+import asyncio
 import json
-from typing import Any, Dict, List, Optional, Type, TypeVar
-from urllib.parse import urljoin
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
+from urllib.parse import quote, urljoin, urlsplit
 
-import httpx
 from mcp import Tool
+from mcp.shared.exceptions import McpError
 from pydantic import BaseModel
 
-from .models import APISpec, AuthConfig, RateLimitConfig
+from src.utils.metrics import record_upstream
+from src.utils.tracing import SpanKind, span
+
+from .models import APISpec, AuthConfig, ConcurrencyLimitConfig, RateLimitConfig
+
+if TYPE_CHECKING:
+    import httpx
+
+    from src.utils.ratelimit import RateLimiter
+    from src.utils.state import SharedCache
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -18,10 +39,38 @@ class APIToolFactory:
 
     def __init__(self):
         """Initialize the API tool factory."""
-        self._http_client = httpx.AsyncClient()
+        self._client: Optional["httpx.AsyncClient"] = None
+        # Base URL of every API, with the rate limiter its requests take from
+        self._base_urls: Dict[str, Optional["RateLimiter"]] = {}
+        self._rate_limiters: Dict[str, "RateLimiter"] = {}
+
+    @property
+    def _http_client(self) -> "httpx.AsyncClient":
+        """HTTP client, created (and httpx imported) on first use."""
+        if self._client is None:
+            import httpx
+
+            from src.config import config
+
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(keepalive_expiry=config.upstream_keepalive_expiry)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the HTTP client if it was created."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def create_tool_from_openapi(
-        self, spec_url: str, auth_config: Optional[AuthConfig] = None
+        self,
+        spec_url: str,
+        auth_config: Optional[AuthConfig] = None,
+        limits: Optional[ConcurrencyLimitConfig] = None,
+        rate_limits: Optional[RateLimitConfig] = None,
+        cache_ttl: Optional[float] = None,
+        api_name: Optional[str] = None,
     ) -> List[Tool]:
         """
         Create tools from an OpenAPI specification.
@@ -29,11 +78,21 @@ class APIToolFactory:
         Args:
             spec_url: URL to the OpenAPI specification
             auth_config: Optional authentication configuration
+            limits: Optional concurrency limits for each generated tool
+            rate_limits: Optional rate limits shared by the generated tools
+            cache_ttl: Optional seconds GET responses are cached
+            api_name: Name of the API, which scopes its limiters (defaults to
+                the API's host)
             
         Returns:
             List of generated MCP tools
         """
         spec = await self._fetch_spec(spec_url)
+        base_url = self._base_url(spec, spec_url)
+        api = api_name or urlsplit(base_url).netloc
+        rate_limiter = self._rate_limiter(api, rate_limits)
+        self._base_urls[base_url] = rate_limiter
+        cache = self._response_cache(base_url, cache_ttl)
         tools = []
         
         for path, path_data in spec.get("paths", {}).items():
@@ -46,7 +105,12 @@ class APIToolFactory:
                     path,
                     method,
                     spec,
-                    auth_config
+                    auth_config,
+                    limits,
+                    base_url,
+                    rate_limiter,
+                    cache,
+                    api,
                 )
                 if tool:
                     tools.append(tool)
@@ -54,7 +118,13 @@ class APIToolFactory:
         return tools
 
     async def create_tool_from_swagger(
-        self, spec_url: str, auth_config: Optional[AuthConfig] = None
+        self,
+        spec_url: str,
+        auth_config: Optional[AuthConfig] = None,
+        limits: Optional[ConcurrencyLimitConfig] = None,
+        rate_limits: Optional[RateLimitConfig] = None,
+        cache_ttl: Optional[float] = None,
+        api_name: Optional[str] = None,
     ) -> List[Tool]:
         """
         Create tools from a Swagger specification.
@@ -62,15 +132,28 @@ class APIToolFactory:
         Args:
             spec_url: URL to the Swagger specification
             auth_config: Optional authentication configuration
+            limits: Optional concurrency limits for each generated tool
+            rate_limits: Optional rate limits shared by the generated tools
+            cache_ttl: Optional seconds GET responses are cached
+            api_name: Name of the API, which scopes its limiters (defaults to
+                the API's host)
             
         Returns:
             List of generated MCP tools
         """
         # Swagger 2.0 is a subset of OpenAPI 3.0
-        return await self.create_tool_from_openapi(spec_url, auth_config)
+        return await self.create_tool_from_openapi(
+            spec_url, auth_config, limits, rate_limits, cache_ttl, api_name
+        )
 
     async def create_tool_from_graphql(
-        self, schema_url: str, auth_config: Optional[AuthConfig] = None
+        self,
+        schema_url: str,
+        auth_config: Optional[AuthConfig] = None,
+        limits: Optional[ConcurrencyLimitConfig] = None,
+        rate_limits: Optional[RateLimitConfig] = None,
+        cache_ttl: Optional[float] = None,
+        api_name: Optional[str] = None,
     ) -> List[Tool]:
         """
         Create tools from a GraphQL schema.
@@ -78,6 +161,11 @@ class APIToolFactory:
         Args:
             schema_url: URL to the GraphQL schema
             auth_config: Optional authentication configuration
+            limits: Optional concurrency limits for each generated tool
+            rate_limits: Optional rate limits shared by the generated tools
+            cache_ttl: Optional seconds GET responses are cached
+            api_name: Name of the API, which scopes its limiters (defaults to
+                the API's host)
             
         Returns:
             List of generated MCP tools
@@ -85,19 +173,225 @@ class APIToolFactory:
         # TODO: Implement GraphQL schema parsing and tool generation
         raise NotImplementedError("GraphQL support coming soon")
 
+    async def warm_connections(self, connections: int) -> int:
+        """
+        Open connections to every API tools were generated for.
+
+        Each connection is opened with a ``HEAD`` of the API's base URL,
+        which pays for DNS, TCP and TLS before the first tool call does. The
+        response status does not matter; the connection stays in the pool.
+        The requests take from the API's rate limit like any other, and are
+        skipped when it has no tokens to spare.
+
+        Args:
+            connections: Connections to open to each API at once
+
+        Returns:
+            Connections opened
+        """
+        async def open_connection(
+            base_url: str, rate_limiter: Optional["RateLimiter"]
+        ) -> bool:
+            if rate_limiter is not None:
+                try:
+                    await rate_limiter.acquire()
+                except McpError:
+                    return False
+            await self._request("HEAD", base_url)
+            return True
+
+        results = await asyncio.gather(
+            *(
+                open_connection(base_url, rate_limiter)
+                for base_url, rate_limiter in self._base_urls.items()
+                for _ in range(connections)
+            ),
+            return_exceptions=True,
+        )
+        return sum(result is True for result in results)
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """
+        Send a request upstream, recording its latency, status and span.
+
+        Within a request deadline the request's timeout is the time left,
+        and a request whose deadline has already passed is not sent, so
+        abandoned calls do not spend upstream rate limits.
+        """
+        from src.utils.deadline import check_deadline, remaining
+
+        method = method.upper()
+        left = remaining()
+        if left is not None:
+            check_deadline(f"{method} {url}")
+            kwargs.setdefault("timeout", left)
+        status = None
+        start = time.perf_counter()
+        try:
+            with span(
+                f"HTTP {method}",
+                SpanKind.CLIENT,
+                {"http.request.method": method, "url.full": url},
+            ) as current:
+                response = await self._http_client.request(method, url, **kwargs)
+                status = response.status_code
+                if current is not None:
+                    current.set_attribute("http.response.status_code", status)
+            return response
+        finally:
+            record_upstream(
+                urlsplit(url).netloc, method, status, time.perf_counter() - start
+            )
+
     async def _fetch_spec(self, url: str) -> Dict[str, Any]:
         """Fetch API specification from URL."""
-        response = await self._http_client.get(url)
+        response = await self._request("GET", url)
         response.raise_for_status()
         return response.json()
 
+    @staticmethod
+    def _base_url(spec: Dict[str, Any], spec_url: str) -> str:
+        """Resolve the URL operations are relative to."""
+        servers = spec.get("servers")
+        if servers:
+            return urljoin(spec_url, servers[0].get("url", ""))
+        if "host" in spec:
+            # Swagger 2.0
+            scheme = (spec.get("schemes") or ["https"])[0]
+            return f"{scheme}://{spec['host']}{spec.get('basePath', '')}"
+        return urljoin(spec_url, "/")
+
+    def _rate_limiter(
+        self, api: str, rate_limits: Optional[RateLimitConfig]
+    ) -> Optional["RateLimiter"]:
+        """
+        Build the rate limiter shared by an API's tools, keyed by its name.
+
+        APIs registered under the same name share one limiter, so they must
+        configure the same limits.
+
+        Raises:
+            ValueError: If the name already has different limits
+        """
+        if rate_limits is None:
+            return None
+        from src.utils.ratelimit import RateLimiter
+
+        limiter = RateLimiter(api, rate_limits)
+        if not limiter.buckets:
+            return None
+        existing = self._rate_limiters.get(api)
+        if existing is not None:
+            if existing.buckets != limiter.buckets:
+                raise ValueError(f"Conflicting rate limits configured for {api}")
+            return existing
+        self._rate_limiters[api] = limiter
+        return limiter
+
+    @staticmethod
+    def _response_cache(
+        base_url: str, cache_ttl: Optional[float]
+    ) -> Optional["SharedCache"]:
+        """Build the cache of an API's GET responses, shared across replicas."""
+        if not cache_ttl:
+            return None
+        from src.utils.state import SharedCache
+
+        return SharedCache(f"api:{urlsplit(base_url).netloc}", cache_ttl)
+
+    @staticmethod
+    def _auth_headers(auth_config: Optional[AuthConfig]) -> Dict[str, str]:
+        """Build request headers for the configured authentication."""
+        if auth_config is None:
+            return {}
+        if auth_config.type == "bearer" and auth_config.token:
+            return {"Authorization": f"Bearer {auth_config.token}"}
+        if auth_config.type == "api_key" and auth_config.key:
+            return {"X-API-Key": auth_config.key}
+        return {}
+
+    def _operation_function(
+        self,
+        path: str,
+        method: str,
+        parameters: List[Dict[str, Any]],
+        auth_headers: Dict[str, str],
+        base_url: str,
+        rate_limiter: Optional["RateLimiter"] = None,
+        cache: Optional["SharedCache"] = None,
+    ) -> Callable[..., Awaitable[Any]]:
+        """
+        Build the function that calls one API operation.
+
+        Args:
+            path: Operation path, with ``{name}`` placeholders
+            method: HTTP method
+            parameters: The operation's OpenAPI parameters
+            auth_headers: Headers added to every request
+            base_url: URL the path is relative to
+            rate_limiter: Limiter every request takes a token from
+            cache: Cache of successful GET responses, checked before the
+                rate limiter so hits are free
+
+        Returns:
+            An async function taking the operation's parameters (and
+            ``body``) as keyword arguments and returning the decoded response
+        """
+        parameters = [p for p in parameters if "name" in p]
+        if method.upper() != "GET":
+            cache = None
+
+        async def tool_function(**kwargs):
+            url = base_url.rstrip("/") + path
+            query: Dict[str, Any] = {}
+            headers = dict(auth_headers)
+            for param in parameters:
+                name = param["name"]
+                if name not in kwargs:
+                    continue
+                location = param.get("in")
+                if location == "path":
+                    url = url.replace(f"{{{name}}}", quote(str(kwargs[name]), safe=""))
+                elif location == "query":
+                    query[name] = kwargs[name]
+                elif location == "header":
+                    headers[name] = str(kwargs[name])
+            key = None
+            if cache is not None:
+                # Credentials are part of the key: responses may differ per
+                # caller
+                key = [url, sorted(query.items()), sorted(headers.items())]
+                cached = await cache.get(key)
+                if cached is not None:
+                    return cached
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            response = await self._request(
+                method, url, params=query, headers=headers, json=kwargs.get("body")
+            )
+            response.raise_for_status()
+            try:
+                result = response.json()
+            except ValueError:
+                result = {"status": response.status_code, "text": response.text}
+            if key is not None:
+                await cache.set(key, result)
+            return result
+
+        return tool_function
+
     async def _create_tool_from_operation(
         self,
         operation: Dict[str, Any],
         path: str,
         method: str,
         spec: Dict[str, Any],
-        auth_config: Optional[AuthConfig] = None
+        auth_config: Optional[AuthConfig] = None,
+        limits: Optional[ConcurrencyLimitConfig] = None,
+        base_url: str = "",
+        rate_limiter: Optional["RateLimiter"] = None,
+        cache: Optional["SharedCache"] = None,
+        api: str = "",
     ) -> Optional[Tool]:
         """Create a tool from an OpenAPI operation."""
         operation_id = operation.get("operationId")
@@ -110,10 +404,29 @@ class APIToolFactory:
         # Generate response type
         response_type = self._generate_response_type(operation, spec)
         
-        # Create tool function
-        async def tool_function(**kwargs):
-            # TODO: Implement actual API call with authentication and rate limiting
-            return {"status": "not implemented"}
+        tool_function = self._operation_function(
+            path,
+            method,
+            operation.get("parameters", []),
+            self._auth_headers(auth_config),
+            base_url,
+            rate_limiter,
+            cache,
+        )
+
+        if limits is not None:
+            from src.utils.limits import get_limiter, limit
+
+            # Operation ids are only unique within one API
+            tool_function = limit(
+                tool_function,
+                get_limiter(
+                    f"{api}/{operation_id}" if api else operation_id,
+                    limits.max_concurrency,
+                    limits.queue_depth,
+                    limits.queue_timeout,
+                ),
+            )
         
         # Create tool
         return Tool(
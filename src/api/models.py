@@ -20,6 +20,13 @@ class RateLimitConfig(BaseModel):
     requests_per_day: Optional[int] = Field(None, description="Maximum requests per day")
 
 
+class ConcurrencyLimitConfig(BaseModel):
+    """Concurrency limits applied to each tool generated from an API."""
+    max_concurrency: int = Field(..., description="Maximum calls running at once per tool")
+    queue_depth: Optional[int] = Field(None, description="Maximum calls waiting for a slot per tool")
+    queue_timeout: Optional[float] = Field(None, description="Seconds a call may wait before it is rejected")
+
+
 class APISpec(BaseModel):
     """API specification configuration."""
     name: str = Field(..., description="Unique name for the API")
@@ -27,6 +34,8 @@ class APISpec(BaseModel):
     type: str = Field(..., description="API specification type (openapi, swagger, graphql)")
     auth: Optional[AuthConfig] = Field(None, description="Authentication configuration")
     rate_limits: Optional[RateLimitConfig] = Field(None, description="Rate limiting configuration")
+    limits: Optional[ConcurrencyLimitConfig] = Field(None, description="Concurrency limits for the generated tools")
+    cache_ttl: Optional[float] = Field(None, description="Seconds GET responses are cached, shared across replicas")
 
 
 class APIConfig(BaseModel):
@@ -4,7 +4,7 @@ from typing import Any, Dict, List, Optional, Literal
 from mcp import Tool
 
 from .factory import APIToolFactory
-from .models import APISpec, AuthConfig, RateLimitConfig
+from .models import APISpec, AuthConfig, ConcurrencyLimitConfig, RateLimitConfig
 
 
 class DynamicToolProvider:
@@ -20,41 +20,53 @@ class DynamicToolProvider:
         spec_url: str,
         api_type: Literal["openapi", "swagger", "graphql"],
         auth_config: Optional[AuthConfig] = None,
-        rate_limit_config: Optional[RateLimitConfig] = None
+        rate_limit_config: Optional[RateLimitConfig] = None,
+        limits: Optional[ConcurrencyLimitConfig] = None,
+        cache_ttl: Optional[float] = None,
+        api_name: Optional[str] = None,
     ) -> List[str]:
         """
         Register tools from an API specification.
-        
+
         Args:
             spec_url: URL to the API specification
             api_type: Type of API specification
             auth_config: Optional authentication configuration
             rate_limit_config: Optional rate limiting configuration
-            
+            limits: Optional concurrency limits for each generated tool
+            cache_ttl: Optional seconds GET responses are cached
+            api_name: Name of the API, which scopes its limiters
+
         Returns:
             List of registered tool names
         """
         tools = []
-        
+
         if api_type == "openapi":
-            tools = await self._factory.create_tool_from_openapi(spec_url, auth_config)
+            tools = await self._factory.create_tool_from_openapi(
+                spec_url, auth_config, limits, rate_limit_config, cache_ttl, api_name
+            )
         elif api_type == "swagger":
-            tools = await self._factory.create_tool_from_swagger(spec_url, auth_config)
+            tools = await self._factory.create_tool_from_swagger(
+                spec_url, auth_config, limits, rate_limit_config, cache_ttl, api_name
+            )
         elif api_type == "graphql":
-            tools = await self._factory.create_tool_from_graphql(spec_url, auth_config)
-        
+            tools = await self._factory.create_tool_from_graphql(
+                spec_url, auth_config, limits, rate_limit_config, cache_ttl, api_name
+            )
+
         # Store registered tools
         self._registered_tools[spec_url] = tools
-        
+
         return [tool.name for tool in tools]
 
     def get_registered_tools(self, spec_url: Optional[str] = None) -> List[Tool]:
         """
         Get registered tools, optionally filtered by spec URL.
-        
+
         Args:
             spec_url: Optional URL to filter tools by
-            
+
         Returns:
             List of registered tools
         """
@@ -65,9 +77,25 @@ class DynamicToolProvider:
     def unregister_tools(self, spec_url: str) -> None:
         """
         Unregister tools for a specific API specification.
-        
+
         Args:
             spec_url: URL of the API specification
         """
         if spec_url in self._registered_tools:
-            del self._registered_tools[spec_url] 
\ No newline at end of file
+            del self._registered_tools[spec_url]
+
+    async def warm_connections(self, connections: int) -> int:
+        """
+        Open connections to the registered APIs before the first tool call.
+
+        Args:
+            connections: Connections to open to each API
+
+        Returns:
+            Connections opened
+        """
+        return await self._factory.warm_connections(connections)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self._factory.aclose()
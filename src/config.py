@@ -1,5 +1,6 @@
 """Configuration settings for the MCP server."""
 
+import os
 from typing import Any, Dict, List, Optional
 from pydantic import BaseSettings
 
@@ -9,6 +10,7 @@ from .api.models import APIConfig
 class DatabaseConfig(BaseSettings):
     """Database configuration settings."""
     # Database connection settings
+    DB_ENABLED: Optional[bool] = None
     DB_HOST: str = "localhost"
     DB_PORT: int = 5432
     DB_NAME: str = "mcp_db"
@@ -16,17 +18,59 @@ class DatabaseConfig(BaseSettings):
     DB_PASSWORD: str = ""
     DB_POOL_SIZE: int = 5
     DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # Connections opened per pool at startup, and SQL each one runs then
+    DB_WARMUP_CONNECTIONS: int = 2
+    DB_WARMUP_QUERIES: List[str] = []
+
+    # Read replica routing (entries are "host" or "host:port")
+    DB_READ_REPLICAS: List[str] = []
+    DB_REPLICA_STRATEGY: str = "round_robin"
+    DB_REPLICA_HEALTH_INTERVAL: float = 10.0
+    DB_REPLICA_HEALTH_TIMEOUT: float = 2.0
     
     # Search configuration
     VECTOR_SIMILARITY_THRESHOLD: float = 0.7
-    MAX_SEARCH_RESULTS: int = 100
+    MAX_SEARCH_RESULTS: int = 100  # Largest page a single search may return
+    DB_PRIMARY_KEY: str = "id"  # Tie-breaker column for keyset pagination
     ENABLE_VECTOR_SEARCH: bool = True
     SEARCHABLE_COLLECTIONS: List[str] = []
 
+    # Bulk ingestion
+    INGEST_BATCH_SIZE: int = 5000
+    INGEST_QUEUE_DEPTH: int = 4
+    INGEST_EMBED_CONCURRENCY: int = 4
+    INGEST_ROWS_PER_TRANSACTION: int = 100000
+
+    # Collection catalog cache
+    CATALOG_REFRESH_INTERVAL: float = 300.0
+    CATALOG_NOTIFY_CHANNEL: str = ""  # LISTEN channel fired by a DDL event trigger
+    CHANGE_NOTIFY_CHANNEL: str = ""  # LISTEN channel fired by data change triggers
+    # Checks of idle LISTEN connections, and the longest wait to reconnect one
+    LISTEN_KEEPALIVE_INTERVAL: float = 30.0
+    LISTEN_MAX_BACKOFF: float = 60.0
+
+    # Seconds search results are cached, shared across replicas (0 disables)
+    SEARCH_CACHE_TTL: float = 0
+
+    # Blobs served as blob:// resources (disabled unless BLOB_TABLE is set)
+    BLOB_TABLE: str = ""
+    BLOB_KEY_COLUMN: str = "id"
+    BLOB_KEY_TYPE: str = "text"  # SQL type of the key column
+    BLOB_DATA_COLUMN: str = "data"
+    BLOB_MIME_COLUMN: str = ""  # Optional column holding each blob's MIME type
+
     class Config:
         env_prefix = ""
         case_sensitive = True
 
+    @property
+    def is_configured(self) -> bool:
+        """Whether a database is configured (DB_ENABLED, else DB_HOST is set)."""
+        if self.DB_ENABLED is not None:
+            return self.DB_ENABLED
+        return "DB_HOST" in self.__fields_set__
+
 
 class ServerConfig:
     """Server configuration settings."""
@@ -42,6 +86,84 @@ class ServerConfig:
         self.host: str = "0.0.0.0"
         self.debug: bool = False
         self.log_level: str = "info"
+        self.startup_budget_ms: float = 1500.0
+        self.stdio_max_concurrency: int = 64
+        self.workers: int = 1
+        self.metrics_path: Optional[str] = "/metrics"  # None disables the endpoint
+        # Returns 503 until startup and warm-up finish (None disables it)
+        self.readiness_path: Optional[str] = "/ready"
+        # Seconds startup may spend warming pools, connections and
+        # validators before serving anyway (None skips the warm-up)
+        self.warmup_timeout: Optional[float] = 30.0
+        # Connections opened to each upstream API during warm-up, and how
+        # long idle upstream connections are kept open
+        self.warmup_upstream_connections: int = 2
+        self.upstream_keepalive_expiry: float = 30.0
+        # JSON backend: orjson, msgspec or json (unset picks the fastest installed)
+        self.json_codec: Optional[str] = os.environ.get("MCP_JSON_CODEC")
+        # Tracing: JSON Lines file or OTLP/HTTP collector URL (unset disables)
+        self.trace_export: Optional[str] = os.environ.get("MCP_TRACE_EXPORT")
+        self.trace_sample_rate: float = float(
+            os.environ.get("MCP_TRACE_SAMPLE_RATE", "1.0")
+        )
+        # Bearer token guarding the admin endpoints (unset disables them)
+        self.admin_token: Optional[str] = os.environ.get("MCP_ADMIN_TOKEN")
+        # Pool sizes for offloaded tools (None uses the executor default)
+        self.tool_thread_workers: Optional[int] = None
+        self.tool_process_workers: Optional[int] = None
+        # Defaults for concurrency-limited tools
+        self.tool_queue_depth: int = 32
+        self.tool_queue_timeout: Optional[float] = 10.0
+        # Seconds a tool call may run before it is cancelled; clients can ask
+        # for less with _meta.timeout (None: no limit)
+        self.tool_timeout: Optional[float] = 60.0
+        # Defaults for memoized tools and prompts (None TTL: keep until evicted)
+        self.memo_cache_size: int = 1024
+        self.memo_cache_ttl: Optional[float] = None
+        # JSON-RPC batches and multi_call: items run at once, and most accepted
+        self.batch_max_concurrency: int = 8
+        self.batch_max_items: int = 100
+        # Files under this directory are served as artifact:// resources
+        self.resource_root: Optional[str] = os.environ.get("MCP_RESOURCE_ROOT")
+        # Largest chunk one resource read returns
+        self.resource_chunk_size: int = 1024 * 1024
+        # Files up to this size are cached whole, in an LRU of this many
+        # entries (so at most 64 MiB by default)
+        self.resource_cache_file_size: int = 256 * 1024
+        self.resource_cache_size: int = 256
+        # Tool results with a list of more than result_page_items items
+        # adding up to result_spill_threshold bytes are sent a page at a
+        # time; the rest is kept for result_spill_ttl seconds in memory up to
+        # result_spill_memory bytes, then in files up to result_spill_disk
+        self.result_page_items: int = 100
+        self.result_spill_threshold: int = 256 * 1024
+        self.result_spill_memory: int = 64 * 1024 * 1024
+        self.result_spill_disk: int = 1024 * 1024 * 1024
+        self.result_spill_ttl: float = 300.0
+        self.result_spill_dir: Optional[str] = os.environ.get("MCP_RESULT_SPILL_DIR")
+        # Smallest HTTP response body compressed (None disables compression)
+        self.http_compression_min_size: Optional[int] = 1024
+        # Rate limits and caches shared by every replica live in this Redis
+        # (unset: each process keeps its own). Commands taking longer than
+        # state_timeout seconds fail over to local state, which enforces
+        # state_local_share of each limit (set it to 1 / replicas), for
+        # state_retry_interval seconds
+        self.state_url: Optional[str] = os.environ.get("MCP_STATE_URL")
+        self.state_timeout: float = 0.25
+        self.state_retry_interval: float = 5.0
+        self.state_local_share: float = 1.0
+        # Longest a rate-limited call waits for a token before it is rejected
+        self.rate_limit_max_wait: float = 1.0
+        # Resource changes are coalesced for this many seconds before
+        # subscribers are notified; a subscriber that takes longer than the
+        # send timeout to accept a notification is dropped
+        self.subscription_window: float = 0.25
+        self.subscription_send_timeout: float = 5.0
+        # Seconds between scans of the resource root for changed files
+        watch_interval = os.environ.get("MCP_RESOURCE_WATCH_INTERVAL", "2.0")
+        self.resource_watch_interval: Optional[float] = (
+            float(watch_interval) if watch_interval else None
+        )
         self.metadata: Dict[str, Any] = {
             "github": "https://github.com/yourusername/mcp-server-template-python",
         }
@@ -0,0 +1,121 @@
+"""Binary column values served as chunked resources."""
+
+import re
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+
+from ..config import config
+from ..resources.base import ResourceChunk
+from ..utils.tracing import SpanKind, span
+from .connection import get_read_session
+from .ingest import _quote
+
+_TYPE_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_ ]*$")
+
+
+class BlobStore:
+    """
+    Serves the ``bytea`` values of a table one chunk at a time.
+
+    Each read fetches only the requested slice with ``substring``, and the
+    ETag is the row version (``xmin``) and length, so a conditional read
+    of an unchanged blob transfers no data. Postgres can only slice a
+    value without loading all of it when the column is stored
+    uncompressed (``ALTER TABLE ... ALTER COLUMN ... SET STORAGE
+    EXTERNAL``).
+    """
+
+    def __init__(
+        self,
+        table: str,
+        key_column: str = "id",
+        key_type: str = "text",
+        data_column: str = "data",
+        mime_column: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            table: Table holding the blobs
+            key_column: Column identifying a blob (the resource name)
+            key_type: SQL type of the key column, so lookups use its index
+            data_column: ``bytea`` column holding the blob
+            mime_column: Column holding each blob's MIME type, if any
+            chunk_size: Most bytes returned by one read (defaults to
+                config.resource_chunk_size)
+        """
+        if not _TYPE_NAME.match(key_type):
+            raise ValueError(f"Invalid key type: {key_type}")
+        self.table = table
+        self.chunk_size = chunk_size or config.resource_chunk_size
+        data = _quote(data_column)
+        mime = _quote(mime_column) if mime_column else "NULL"
+        self._sql = text(f"""
+            SELECT version, size, mime_type,
+                   CASE WHEN version || '-' || size = :etag THEN NULL
+                        ELSE substring({data} FROM :start FOR :length) END AS chunk
+            FROM (
+                SELECT xmin::text AS version,
+                       octet_length({data}) AS size,
+                       {mime} AS mime_type,
+                       {data}
+                FROM {_quote(table)}
+                WHERE {_quote(key_column)} = CAST(CAST(:key AS text) AS {key_type})
+            ) blob
+        """)
+
+    def _attributes(self) -> Dict[str, Any]:
+        return {
+            "db.system": "postgresql",
+            "db.operation.name": "blob_read",
+            "db.collection.name": self.table,
+        }
+
+    async def read(
+        self,
+        name: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+    ) -> ResourceChunk:
+        """
+        Read a chunk of a blob.
+
+        Args:
+            name: Key of the blob's row
+            offset: First byte to read
+            length: Most bytes to read (capped at the chunk size)
+            if_none_match: ETag the caller holds; a match returns no data
+
+        Returns:
+            The chunk
+
+        Raises:
+            FileNotFoundError: If there is no such row
+            ValueError: If the offset is past the end of the blob
+        """
+        length = min(length or self.chunk_size, self.chunk_size)
+        params = {
+            "key": name,
+            # substring() counts from 1
+            "start": offset + 1,
+            "length": length,
+            "etag": if_none_match or "",
+        }
+        async with get_read_session() as session:
+            with span("db.execute", SpanKind.CLIENT, self._attributes()):
+                result = await session.execute(self._sql, params)
+            row = result.first()
+        if row is None:
+            raise FileNotFoundError(f"No blob {name} in {self.table}")
+        size = row.size or 0
+        etag = f"{row.version}-{size}"
+        mime_type = row.mime_type or "application/octet-stream"
+        if row.chunk is None and if_none_match == etag:
+            return ResourceChunk(b"", offset, size, etag, mime_type, True)
+        if offset > size:
+            raise ValueError(f"Offset {offset} is past the end of blob {name}")
+        return ResourceChunk(bytes(row.chunk or b""), offset, size, etag, mime_type)
@@ -0,0 +1,318 @@
+"""In-memory catalog of searchable collections."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import text
+
+from ..config import config
+from ..utils.metrics import MetricFamily
+from .connection import get_read_session
+from .listen import NotificationListener
+
+logger = logging.getLogger(__name__)
+
+TEXT_SEARCH_COLUMN = "searchable_content"
+VECTOR_SEARCH_COLUMN = "embedding"
+
+_TABLES_SQL = text("""
+    SELECT c.relname AS collection,
+           obj_description(c.oid, 'pg_class') AS description,
+           c.reltuples::bigint AS row_estimate
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'public'
+      AND c.relkind IN ('r', 'p')
+""")
+
+_COLUMNS_SQL = text("""
+    SELECT c.relname AS collection,
+           a.attname AS name,
+           format_type(a.atttypid, a.atttypmod) AS type,
+           NOT a.attnotnull AS nullable
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = 'public'
+      AND c.relkind IN ('r', 'p')
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+    ORDER BY c.relname, a.attnum
+""")
+
+_INDEXES_SQL = text("""
+    SELECT tablename AS collection, indexname AS name, indexdef AS definition
+    FROM pg_indexes
+    WHERE schemaname = 'public'
+""")
+
+
+class CollectionCatalog:
+    """
+    Caches collection schemas, row estimates and indexes.
+
+    The catalog is loaded at startup and refreshed in the background on a
+    timer or when a DDL notification arrives, so metadata lookups and
+    collection validation never touch the database on the request path.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 300.0,
+        notify_channel: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize an empty catalog.
+
+        Args:
+            refresh_interval: Seconds between background refreshes
+            notify_channel: Optional Postgres LISTEN channel that signals DDL
+        """
+        self.refresh_interval = refresh_interval
+        self.notify_channel = notify_channel
+        self._collections: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._changed = asyncio.Event()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._listener: Optional[NotificationListener] = None
+        self._change_listeners: List[Callable[[Set[str]], None]] = []
+        self.refreshes: int = 0
+        self.refresh_failures: int = 0
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the catalog has been loaded at least once."""
+        return self._loaded_at is not None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the catalog was last loaded, if it ever was."""
+        if self._loaded_at is None:
+            return None
+        return time.time() - self._loaded_at
+
+    async def refresh(self) -> None:
+        """Reload the catalog from the database."""
+        async with self._lock:
+            try:
+                await self._load()
+            except Exception:
+                self.refresh_failures += 1
+                raise
+
+    async def ensure_loaded(self) -> None:
+        """Load the catalog if it has never been loaded."""
+        if self.loaded:
+            return
+        async with self._lock:
+            if not self.loaded:
+                await self._load()
+
+    async def _load(self) -> None:
+        """Query the catalog tables and swap in the new snapshot."""
+        async with get_read_session() as session:
+            tables = (await session.execute(_TABLES_SQL)).mappings().all()
+            columns = (await session.execute(_COLUMNS_SQL)).mappings().all()
+            indexes = (await session.execute(_INDEXES_SQL)).mappings().all()
+
+        allowed = set(config.db.SEARCHABLE_COLLECTIONS)
+        collections: Dict[str, Dict[str, Any]] = {}
+        for row in tables:
+            if allowed and row["collection"] not in allowed:
+                continue
+            collections[row["collection"]] = {
+                "collection": row["collection"],
+                "description": row["description"],
+                "row_estimate": (
+                    row["row_estimate"] if row["row_estimate"] >= 0 else None
+                ),
+                "columns": [],
+                "indexes": [],
+            }
+        for row in columns:
+            entry = collections.get(row["collection"])
+            if entry is not None:
+                entry["columns"].append(
+                    {
+                        "name": row["name"],
+                        "type": row["type"],
+                        "nullable": row["nullable"],
+                    }
+                )
+        for row in indexes:
+            entry = collections.get(row["collection"])
+            if entry is not None:
+                entry["indexes"].append(
+                    {"name": row["name"], "definition": row["definition"]}
+                )
+        for entry in collections.values():
+            names = {column["name"] for column in entry["columns"]}
+            entry["supports_text_search"] = TEXT_SEARCH_COLUMN in names
+            entry["supports_vector_search"] = (
+                config.db.ENABLE_VECTOR_SEARCH and VECTOR_SEARCH_COLUMN in names
+            )
+
+        missing = allowed - collections.keys()
+        if missing:
+            logger.warning(
+                f"SEARCHABLE_COLLECTIONS not found in database: {sorted(missing)}"
+            )
+
+        previous = self._collections if self.loaded else None
+        self._collections = collections
+        self._loaded_at = time.time()
+        self.refreshes += 1
+        logger.debug(f"Collection catalog loaded with {len(collections)} entries")
+
+        if previous is not None:
+            changed = {
+                name
+                for name in previous.keys() | collections.keys()
+                if previous.get(name) != collections.get(name)
+            }
+            if changed:
+                for listener in self._change_listeners:
+                    listener(changed)
+
+    async def list_collections(self) -> List[Dict[str, Any]]:
+        """Return every catalogued collection."""
+        await self.ensure_loaded()
+        return list(self._collections.values())
+
+    async def get(self, collection: str) -> Optional[Dict[str, Any]]:
+        """Return the catalog entry for a collection, if it exists."""
+        await self.ensure_loaded()
+        return self._collections.get(collection)
+
+    async def require(self, collection: str, capability: str) -> Dict[str, Any]:
+        """
+        Validate that a collection exists and supports a kind of search.
+
+        Collection names are interpolated into SQL, so only names present in
+        the catalog (and in SEARCHABLE_COLLECTIONS when set) are accepted.
+
+        Args:
+            collection: Name of the collection
+            capability: ``text_search`` or ``vector_search``
+
+        Returns:
+            The catalog entry
+
+        Raises:
+            ValueError: If the collection is unknown or unsupported
+        """
+        entry = await self.get(collection)
+        if entry is None:
+            raise ValueError(f"Unknown or non-searchable collection: {collection}")
+        if not entry[f"supports_{capability}"]:
+            raise ValueError(
+                f"Collection {collection} does not support {capability.replace('_', ' ')}"
+            )
+        return entry
+
+    def collect_metrics(self) -> Iterable[MetricFamily]:
+        """
+        Produce catalog metrics for the metrics endpoint.
+
+        Lookups are always served from the snapshot, so what matters is
+        how often it is reloaded and how stale it has become.
+        """
+        yield MetricFamily(
+            "mcp_catalog_refreshes_total",
+            "counter",
+            "Catalog loads from the database.",
+            [({}, self.refreshes)],
+        )
+        yield MetricFamily(
+            "mcp_catalog_refresh_failures_total",
+            "counter",
+            "Catalog loads that failed.",
+            [({}, self.refresh_failures)],
+        )
+        age = self.age
+        if age is not None:
+            yield MetricFamily(
+                "mcp_catalog_age_seconds",
+                "gauge",
+                "Seconds since the catalog was last loaded.",
+                [({}, age)],
+            )
+            yield MetricFamily(
+                "mcp_catalog_collections",
+                "gauge",
+                "Collections in the catalog.",
+                [({}, len(self._collections))],
+            )
+
+    def add_change_listener(self, listener: Callable[[Set[str]], None]) -> None:
+        """
+        Call a function whenever a refresh changes the catalog.
+
+        Args:
+            listener: Called with the names of the collections that were
+                added, removed or changed
+        """
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def invalidate(self) -> None:
+        """Request a background refresh as soon as possible."""
+        self._changed.set()
+
+    def _on_notify(self, payload: str) -> None:
+        self.invalidate()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait(), timeout=self.refresh_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._changed.clear()
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Collection catalog refresh failed: {e}")
+
+    async def start(self) -> None:
+        """Start background refreshes and DDL notifications."""
+        if self.notify_channel and self._listener is None:
+            # DDL notified while reconnecting was missed, so refresh then too
+            self._listener = NotificationListener(
+                self.notify_channel, self._on_notify, on_reconnect=self.invalidate
+            )
+            self._listener.start()
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background refreshes and release the listen connection."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._listener is not None:
+            await self._listener.stop()
+            self._listener = None
+
+
+_catalog: Optional[CollectionCatalog] = None
+
+
+def get_catalog() -> CollectionCatalog:
+    """Get the collection catalog, creating it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = CollectionCatalog(
+            refresh_interval=config.db.CATALOG_REFRESH_INTERVAL,
+            notify_channel=config.db.CATALOG_NOTIFY_CHANNEL or None,
+        )
+    return _catalog
@@ -0,0 +1,124 @@
+"""Collection resources that push change notifications to subscribers.
+
+Collections are served as ``db://collections`` (every catalogued collection)
+and ``db://collections/<name>`` (one collection's catalog entry). Data
+changes are reported by triggers that notify ``CHANGE_NOTIFY_CHANNEL`` with
+the table name, and schema changes by catalog refreshes, so subscribed
+clients are told to re-read instead of polling.
+"""
+
+import logging
+from typing import Any, Optional, Set
+
+from ..config import config
+from ..resources.subscriptions import SubscriptionHub, get_hub
+from ..utils.codec import dumps
+from .catalog import get_catalog
+from .listen import NotificationListener
+
+logger = logging.getLogger(__name__)
+
+COLLECTIONS_URI = "db://collections"
+
+
+def collection_uri(collection: str) -> str:
+    """Get the resource URI of a collection."""
+    return f"{COLLECTIONS_URI}/{collection}"
+
+
+class ChangeListener:
+    """
+    Reports collection changes to a subscription hub.
+
+    Holds one dedicated connection to the primary that LISTENs for data
+    change notifications, and follows catalog refreshes for schema changes.
+    The hub coalesces the bursts a bulk write produces.
+    """
+
+    def __init__(self, hub: SubscriptionHub, channel: Optional[str] = None) -> None:
+        """
+        Initialize the listener.
+
+        Args:
+            hub: Hub that notifies subscribers
+            channel: Postgres LISTEN channel whose payload is the name of the
+                changed table (None follows only catalog changes)
+        """
+        self.hub = hub
+        self.channel = channel
+        self._listener: Optional[NotificationListener] = None
+
+    def _on_notify(self, payload: str) -> None:
+        collection = payload.strip()
+        if collection:
+            self.hub.changed(collection_uri(collection))
+
+    def _on_reconnect(self) -> None:
+        # Changes made while the connection was down were not notified
+        for uri in self.hub.uris():
+            if uri.startswith(COLLECTIONS_URI):
+                self.hub.changed(uri)
+
+    def _on_catalog_change(self, collections: Set[str]) -> None:
+        self.hub.changed(COLLECTIONS_URI)
+        for collection in collections:
+            self.hub.changed(collection_uri(collection))
+
+    async def start(self) -> None:
+        """Start following data and catalog changes."""
+        get_catalog().add_change_listener(self._on_catalog_change)
+        if self.channel and self._listener is None:
+            self._listener = NotificationListener(
+                self.channel, self._on_notify, on_reconnect=self._on_reconnect
+            )
+            self._listener.start()
+
+    async def stop(self) -> None:
+        """Release the listen connection."""
+        if self._listener is not None:
+            await self._listener.stop()
+            self._listener = None
+
+
+_listener: Optional[ChangeListener] = None
+
+
+def get_change_listener() -> ChangeListener:
+    """Get the change listener, creating it on first use."""
+    global _listener
+    if _listener is None:
+        _listener = ChangeListener(
+            get_hub(), channel=config.db.CHANGE_NOTIFY_CHANNEL or None
+        )
+    return _listener
+
+
+def register_collection_resources(server: Any) -> None:
+    """
+    Serve the collection catalog as subscribable resources.
+
+    Args:
+        server: The FastMCP server
+    """
+
+    @server.resource(
+        COLLECTIONS_URI,
+        name="collections",
+        description="Searchable collections and their schemas",
+        mime_type="application/json",
+    )
+    async def collections() -> str:
+        entries = await get_catalog().list_collections()
+        return dumps({"collections": entries}).decode("utf-8")
+
+    @server.resource(
+        COLLECTIONS_URI + "/{collection}",
+        name="collection",
+        description="Schema, indexes and row estimate of one collection",
+        mime_type="application/json",
+    )
+    async def collection(collection: str) -> str:
+        entry = await get_catalog().get(collection)
+        if entry is None:
+            raise ValueError(f"Unknown or non-searchable collection: {collection}")
+        return dumps(entry).decode("utf-8")
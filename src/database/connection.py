@@ -1,46 +1,295 @@
-"""Database connection management."""
+"""Database connection management.
 
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+Engines, the replica router and the session factory are created on first
+use so that importing this module stays cheap and servers without a
+database never open a pool.
+"""
 
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from ..config import config
+from ..utils.deadline import check_deadline, remaining
+from ..utils.metrics import MetricFamily
+from .pool import InstrumentedQueuePool, pool_stats
+from .replicas import Replica, ReplicaRouter
 
-# Create the async engine
-DATABASE_URL = (
-    f"postgresql+asyncpg://{config.db.DB_USER}:{config.db.DB_PASSWORD}"
-    f"@{config.db.DB_HOST}:{config.db.DB_PORT}/{config.db.DB_NAME}"
-)
+_engine: Optional[AsyncEngine] = None
+_replica_router: Optional[ReplicaRouter] = None
+_session_factory: Optional[async_sessionmaker] = None
 
-engine = create_async_engine(
-    DATABASE_URL,
-    poolclass=AsyncAdaptedQueuePool,
-    pool_size=config.db.DB_POOL_SIZE,
-    max_overflow=config.db.DB_MAX_OVERFLOW,
-    echo=config.debug,
-)
 
-# Create session factory
-async_session = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+def _database_url(host: str, port: int) -> str:
+    """Build the asyncpg connection URL for a host."""
+    return (
+        f"postgresql+asyncpg://{config.db.DB_USER}:{config.db.DB_PASSWORD}"
+        f"@{host}:{port}/{config.db.DB_NAME}"
+    )
+
+
+def _create_engine(host: str, port: int) -> AsyncEngine:
+    """Create an async engine with the configured, instrumented pool."""
+    return create_async_engine(
+        _database_url(host, port),
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.db.DB_POOL_SIZE,
+        max_overflow=config.db.DB_MAX_OVERFLOW,
+        pool_timeout=config.db.DB_POOL_TIMEOUT,
+        echo=config.debug,
+    )
+
+
+def _create_replica(address: str) -> Replica:
+    """Create a replica from a ``host`` or ``host:port`` entry."""
+    host, _, port = address.partition(":")
+    return Replica(address, _create_engine(host, int(port or config.db.DB_PORT)))
+
+
+def get_engine() -> AsyncEngine:
+    """Get the primary engine, creating it on first use."""
+    global _engine
+    if _engine is None:
+        _engine = _create_engine(config.db.DB_HOST, config.db.DB_PORT)
+    return _engine
+
+
+def get_replica_router() -> ReplicaRouter:
+    """Get the read replica router, creating it on first use."""
+    global _replica_router
+    if _replica_router is None:
+        _replica_router = ReplicaRouter(
+            [_create_replica(address) for address in config.db.DB_READ_REPLICAS],
+            strategy=config.db.DB_REPLICA_STRATEGY,
+            health_interval=config.db.DB_REPLICA_HEALTH_INTERVAL,
+            health_timeout=config.db.DB_REPLICA_HEALTH_TIMEOUT,
+        )
+    return _replica_router
+
+
+def get_session_factory() -> async_sessionmaker:
+    """Get the session factory bound to the primary engine."""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = async_sessionmaker(
+            get_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return _session_factory
+
+
+_SET_STATEMENT_TIMEOUT = text("SELECT set_config('statement_timeout', :timeout, true)")
+
+
+def _apply_deadline(session: Any, transaction: Any, connection: Any) -> None:
+    """
+    Bound a transaction's statements by the current request deadline.
+
+    Runs as the session's ``after_begin`` hook, so every transaction (not
+    just the first: a transaction-local setting ends with its commit) sets
+    ``statement_timeout`` to the time left, and Postgres stops the query
+    itself even if the server cannot cancel it. Sessions without a deadline
+    skip the extra statement.
+
+    Raises:
+        McpError: If the deadline has already passed
+    """
+    left = remaining()
+    if left is None:
+        return
+    check_deadline("database query")
+    timeout_ms = max(1, int(left * 1000))
+    connection.execute(_SET_STATEMENT_TIMEOUT, {"timeout": f"{timeout_ms}ms"})
+
+
+@asynccontextmanager
+async def _deadline_session(bind: Any = None) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Open a session that honours the request deadline.
+
+    When the task is cancelled (the client cancelled, disconnected or ran
+    out of time), asyncpg asks the backend to cancel the running query and
+    the connection is invalidated rather than rolled back, so its pool slot
+    is freed at once instead of after the query winds down.
+    """
+    factory = get_session_factory()
+    async with factory(bind=bind) if bind is not None else factory() as session:
+        event.listen(session.sync_session, "after_begin", _apply_deadline)
+        try:
+            yield session
+        except asyncio.CancelledError:
+            await session.invalidate()
+            raise
 
 
 @asynccontextmanager
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Get a database session."""
-    async with async_session() as session:
+    async with _deadline_session() as session:
         try:
             yield session
             await session.commit()
         except Exception:
             await session.rollback()
-            raise 
\ No newline at end of file
+            raise
+
+
+@asynccontextmanager
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get a session for read-only work.
+
+    The session is bound to a healthy read replica when one is available and
+    to the primary otherwise. Nothing is committed.
+    """
+    async with get_replica_router().acquire() as replica:
+        bind = replica.engine if replica is not None else get_engine()
+        async with _deadline_session(bind) as session:
+            yield session
+
+
+async def _warm_engine(
+    engine: AsyncEngine, connections: int, statements: List[str]
+) -> int:
+    """Open connections on an engine at once and run statements on each."""
+    async with AsyncExitStack() as stack:
+        results = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(connections)),
+            return_exceptions=True,
+        )
+        opened = [r for r in results if not isinstance(r, BaseException)]
+        if not opened:
+            raise results[0]
+
+        async def prime(connection: Any) -> None:
+            # Every session sets its statement timeout; prepare that too
+            await connection.execute(_SET_STATEMENT_TIMEOUT, {"timeout": "0"})
+            for statement in statements:
+                await connection.execute(text(statement))
+            await connection.rollback()
+
+        await asyncio.gather(*(prime(connection) for connection in opened))
+    return len(opened)
+
+
+async def warm_pools(
+    connections: Optional[int] = None, statements: Optional[List[str]] = None
+) -> Dict[str, int]:
+    """
+    Open idle connections on the primary and every replica before serving.
+
+    The connections are opened at the same time, so the pool keeps that
+    many; each then runs the warm-up statements, which asyncpg prepares
+    and keeps in the connection's statement cache for later queries.
+
+    Args:
+        connections: Connections to open per pool (defaults to
+            DB_WARMUP_CONNECTIONS, capped at DB_POOL_SIZE)
+        statements: Representative read-only SQL to run on each connection
+            (defaults to DB_WARMUP_QUERIES)
+
+    Returns:
+        Connections opened, by pool
+    """
+    if connections is None:
+        connections = config.db.DB_WARMUP_CONNECTIONS
+    connections = min(connections, config.db.DB_POOL_SIZE)
+    if statements is None:
+        statements = config.db.DB_WARMUP_QUERIES
+    if connections <= 0:
+        return {}
+    engines = {"primary": get_engine()}
+    for replica in get_replica_router().replicas:
+        engines[replica.name] = replica.engine
+    opened = await asyncio.gather(
+        *(_warm_engine(engine, connections, statements) for engine in engines.values())
+    )
+    return dict(zip(engines, opened))
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Get connection pool statistics for the primary and every replica."""
+    return {
+        "primary": pool_stats(get_engine()),
+        "replicas": get_replica_router().stats(),
+    }
+
+
+# (metric, type, help, pool_stats key)
+_POOL_METRICS = [
+    ("mcp_db_pool_size", "gauge", "Configured pool size.", "size"),
+    ("mcp_db_pool_checked_out", "gauge", "Connections in use.", "checked_out"),
+    ("mcp_db_pool_checked_in", "gauge", "Idle connections.", "checked_in"),
+    ("mcp_db_pool_overflow", "gauge", "Connections above the pool size.", "overflow"),
+    ("mcp_db_pool_checkouts_total", "counter", "Connection checkouts.", "checkouts"),
+    (
+        "mcp_db_pool_checkout_timeouts_total",
+        "counter",
+        "Checkouts that timed out waiting for a connection.",
+        "checkout_timeouts",
+    ),
+    (
+        "mcp_db_pool_checkout_wait_seconds_total",
+        "counter",
+        "Time spent waiting for a connection.",
+        "wait_seconds_total",
+    ),
+    (
+        "mcp_db_pool_checkout_wait_seconds_max",
+        "gauge",
+        "Longest wait for a connection.",
+        "wait_seconds_max",
+    ),
+]
+
+
+def collect_metrics() -> Iterable[MetricFamily]:
+    """
+    Produce pool and replica metrics for the metrics endpoint.
+
+    Only pools that have already been opened are reported; scraping never
+    creates an engine.
+    """
+    pools: List[Tuple[Dict[str, str], Dict[str, Any]]] = []
+    if _engine is not None:
+        pools.append(({"pool": "primary"}, pool_stats(_engine)))
+    replicas = _replica_router.stats() if _replica_router is not None else []
+    for replica in replicas:
+        pools.append(({"pool": replica["name"]}, replica["pool"]))
+
+    for name, kind, help, key in _POOL_METRICS:
+        samples = [(labels, stats[key]) for labels, stats in pools if key in stats]
+        if samples:
+            yield MetricFamily(name, kind, help, samples)
+    if replicas:
+        yield MetricFamily(
+            "mcp_db_replica_healthy",
+            "gauge",
+            "Whether the replica is in rotation.",
+            [({"pool": r["name"]}, int(r["healthy"])) for r in replicas],
+        )
+        yield MetricFamily(
+            "mcp_db_replica_outstanding",
+            "gauge",
+            "Sessions currently routed to the replica.",
+            [({"pool": r["name"]}, r["outstanding"]) for r in replicas],
+        )
+
+
+async def dispose_engines() -> None:
+    """Stop replica health checks and close every pool that was opened."""
+    if _replica_router is not None:
+        await _replica_router.stop()
+        for replica in _replica_router.replicas:
+            await replica.engine.dispose()
+    if _engine is not None:
+        await _engine.dispose()
@@ -2,6 +2,8 @@
 
 from typing import Any, Dict
 from mcp import Context, ContextProvider
+from .connection import get_pool_stats
+from .ingest import ingest_documents
 from .search import DatabaseSearchEngine
 
 
@@ -20,7 +22,9 @@ class DatabaseContextProvider(ContextProvider):
                     "text_search": self.search_engine.text_search,
                     "vector_search": self.search_engine.vector_search,
                     "metadata": self.search_engine.get_available_collections
-                }
+                },
+                "pool_stats": get_pool_stats,
+                "ingest": ingest_documents,
             }
         )
 
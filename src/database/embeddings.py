@@ -0,0 +1,43 @@
+"""Embedding model registration."""
+
+from typing import Awaitable, Callable, List, Optional
+
+Embedder = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+_embedder: Optional[Embedder] = None
+
+
+def register_embedder(embedder: Embedder) -> None:
+    """
+    Register the function used to embed text.
+
+    The embedder receives a batch of texts and returns one vector per text,
+    so models that support batching are called once per batch.
+
+    Args:
+        embedder: Async function mapping texts to embeddings
+    """
+    global _embedder
+    _embedder = embedder
+
+
+def get_embedder() -> Optional[Embedder]:
+    """Get the registered embedder, if any."""
+    return _embedder
+
+
+async def embed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Embed a batch of texts with the registered embedder.
+
+    Raises:
+        RuntimeError: If no embedder has been registered
+    """
+    if _embedder is None:
+        raise RuntimeError("No embedding model registered; call register_embedder()")
+    return await _embedder(texts)
+
+
+async def get_embedding(text: str) -> List[float]:
+    """Embed a single text with the registered embedder."""
+    return (await embed_texts([text]))[0]
@@ -0,0 +1,479 @@
+"""High-throughput bulk ingestion into searchable collections.
+
+Documents flow through three stages connected by bounded queues::
+
+    reader -> [batches] -> embedders (N) -> [batches] -> writer
+
+The bounded queues apply backpressure: a slow writer stalls the embedders,
+which stall the reader, so memory stays proportional to
+``queue_depth * batch_size`` no matter how large the input is.
+
+The writer streams each batch into a temporary staging table with binary
+``COPY`` and merges it into the collection with one set-based
+``INSERT ... SELECT`` (optionally ``ON CONFLICT ... DO UPDATE``), committing
+in large transactions. Binary ``COPY`` takes Python values of each column's
+type, so JSON values are converted first using the column types in the
+catalog: ISO 8601 strings to timestamps, dates and times, strings to UUIDs,
+numbers and strings to decimals, and any value to JSON text for ``json``
+columns.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import date, datetime
+from datetime import time as time_of_day
+from decimal import Decimal
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+)
+
+from ..config import config
+from .catalog import VECTOR_SEARCH_COLUMN, get_catalog
+from .connection import get_engine
+from .embeddings import Embedder, get_embedder
+
+logger = logging.getLogger(__name__)
+
+INGEST_MODES = ("copy", "upsert")
+STAGE_TABLE = "_mcp_ingest_stage"
+
+_DONE = object()
+
+_SECONDARY_INDEXES_SQL = """
+    SELECT c.relname AS name, pg_get_indexdef(i.indexrelid) AS definition
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE i.indrelid = $1::regclass
+      AND NOT i.indisprimary
+      AND NOT i.indisunique
+"""
+
+
+def _quote(identifier: str) -> str:
+    """Quote a SQL identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _parse_datetime(value: str) -> datetime:
+    # fromisoformat only accepts a "Z" suffix from Python 3.11
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
+def _from_string(parse: Callable[[str], Any]) -> Callable[[Any], Any]:
+    return lambda value: parse(value) if isinstance(value, str) else value
+
+
+def _to_decimal(value: Any) -> Any:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return value
+    # str() keeps a float's shortest representation rather than its binary
+    # expansion
+    return Decimal(str(value))
+
+
+def _converter(type_name: str) -> Optional[Callable[[Any], Any]]:
+    """
+    Build the conversion of JSON values for a column type.
+
+    Args:
+        type_name: The column type, as ``format_type`` names it
+
+    Returns:
+        A function converting one non-null value, or None when JSON values
+        can be copied as they are
+    """
+    if type_name.endswith("[]"):
+        element = _converter(type_name[:-2])
+        if element is None:
+            return None
+        return lambda value: (
+            [None if item is None else element(item) for item in value]
+            if isinstance(value, list)
+            else value
+        )
+    base = type_name.split("(")[0].strip()
+    if base.startswith("timestamp"):
+        return _from_string(_parse_datetime)
+    if base == "date":
+        return _from_string(date.fromisoformat)
+    if base.startswith("time"):
+        return _from_string(time_of_day.fromisoformat)
+    if base == "uuid":
+        return _from_string(uuid.UUID)
+    if base == "numeric":
+        return _to_decimal
+    if base in ("json", "jsonb"):
+        return json.dumps
+    return None
+
+
+class BulkIngestor:
+    """Streams documents into a collection in large batches."""
+
+    def __init__(
+        self,
+        collection: str,
+        mode: str = "upsert",
+        batch_size: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+        embed_concurrency: Optional[int] = None,
+        rows_per_transaction: Optional[int] = None,
+        defer_indexes: bool = False,
+        text_field: str = "searchable_content",
+        embedder: Optional[Embedder] = None,
+    ) -> None:
+        """
+        Initialize the ingestor.
+
+        Args:
+            collection: Collection (table) to load into
+            mode: ``copy`` to append, ``upsert`` to update rows whose primary
+                key already exists
+            batch_size: Documents per COPY batch and per embedding call
+            queue_depth: Batches buffered between stages
+            embed_concurrency: Concurrent embedding calls
+            rows_per_transaction: Rows written before each commit
+            defer_indexes: Drop secondary indexes while loading an empty
+                collection and rebuild them at the end
+            text_field: Document field to embed
+            embedder: Embedding function; defaults to the registered one
+        """
+        if mode not in INGEST_MODES:
+            raise ValueError(
+                f"Unknown ingest mode {mode!r}, expected one of {', '.join(INGEST_MODES)}"
+            )
+        self.collection = collection
+        self.mode = mode
+        self.batch_size = batch_size or config.db.INGEST_BATCH_SIZE
+        self.queue_depth = queue_depth or config.db.INGEST_QUEUE_DEPTH
+        self.embed_concurrency = embed_concurrency or config.db.INGEST_EMBED_CONCURRENCY
+        self.rows_per_transaction = (
+            rows_per_transaction or config.db.INGEST_ROWS_PER_TRANSACTION
+        )
+        self.defer_indexes = defer_indexes
+        self.text_field = text_field
+        self.embedder = embedder or get_embedder()
+        self.columns: List[str] = []
+        self._converters: List[Optional[Callable[[Any], Any]]] = []
+        self._fields: Set[str] = set()
+        self._optional: Set[str] = set()
+        self.rows_written = 0
+        self.batches_written = 0
+
+    async def _resolve_columns(self, first: Dict[str, Any]) -> None:
+        """Derive the column list from the first document and the catalog."""
+        entry = await get_catalog().get(self.collection)
+        if entry is None:
+            raise ValueError(f"Unknown or non-searchable collection: {self.collection}")
+        known = {column["name"] for column in entry["columns"]}
+        columns = [name for name in first if name in known]
+        if self.embedder is not None and VECTOR_SEARCH_COLUMN in known:
+            if VECTOR_SEARCH_COLUMN not in columns:
+                columns.append(VECTOR_SEARCH_COLUMN)
+        unknown = set(first) - known
+        if unknown:
+            raise ValueError(
+                f"Fields not in collection {self.collection}: {sorted(unknown)}"
+            )
+        self.columns = columns
+        types = {column["name"]: column.get("type", "") for column in entry["columns"]}
+        # The vector column is staged as real[], which takes lists as they are
+        self._converters = [
+            None if name == VECTOR_SEARCH_COLUMN else _converter(types[name])
+            for name in columns
+        ]
+        # With an embedder, documents may give their vector or leave it to
+        # be computed
+        if self.embedder is not None and VECTOR_SEARCH_COLUMN in columns:
+            self._optional = {VECTOR_SEARCH_COLUMN}
+        self._fields = set(first) - self._optional
+
+    def _check_fields(self, document: Dict[str, Any], index: int) -> None:
+        """
+        Reject a document whose fields differ from the first document's.
+
+        Every row is written with the same column list, so a field only some
+        documents have would be dropped, and a missing one would be written
+        as NULL (overwriting the stored value on upsert).
+        """
+        fields = set(document) - self._optional
+        if fields != self._fields:
+            missing = sorted(self._fields - fields)
+            extra = sorted(fields - self._fields)
+            raise ValueError(
+                f"Document {index} has different fields from the first one "
+                f"(missing {missing}, extra {extra}); every document must "
+                "have the same fields"
+            )
+
+    async def _read(
+        self, documents: AsyncIterable[Dict[str, Any]], queue: asyncio.Queue
+    ) -> None:
+        batch: List[Dict[str, Any]] = []
+        index = 0
+        try:
+            async for document in documents:
+                if not self.columns:
+                    await self._resolve_columns(document)
+                self._check_fields(document, index)
+                index += 1
+                batch.append(document)
+                if len(batch) >= self.batch_size:
+                    await queue.put(batch)
+                    batch = []
+            if batch:
+                await queue.put(batch)
+        finally:
+            # Close the source (e.g. the input file) now, not when collected
+            close = getattr(documents, "aclose", None)
+            if close is not None:
+                await close()
+
+    async def _embed(self, inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+        while True:
+            batch = await inbox.get()
+            if batch is _DONE:
+                return
+            if self.embedder is not None and VECTOR_SEARCH_COLUMN in self.columns:
+                missing = [
+                    document
+                    for document in batch
+                    if document.get(VECTOR_SEARCH_COLUMN) is None
+                ]
+                if missing:
+                    vectors = await self.embedder(
+                        [document.get(self.text_field) or "" for document in missing]
+                    )
+                    for document, vector in zip(missing, vectors):
+                        document[VECTOR_SEARCH_COLUMN] = vector
+            await outbox.put([self._record(document) for document in batch])
+
+    def _record(self, document: Dict[str, Any]) -> tuple:
+        """Convert a document to the row binary COPY writes."""
+        values = []
+        for name, convert in zip(self.columns, self._converters):
+            value = document.get(name)
+            if value is not None and convert is not None:
+                try:
+                    value = convert(value)
+                except (TypeError, ValueError, ArithmeticError) as e:
+                    raise ValueError(
+                        f"Invalid value for column {name}: {value!r} ({e})"
+                    ) from None
+            values.append(value)
+        return tuple(values)
+
+    def _merge_sql(self) -> str:
+        """Build the statement that moves staged rows into the collection."""
+        target = [_quote(name) for name in self.columns]
+        source = [
+            f"{_quote(name)}::vector" if name == VECTOR_SEARCH_COLUMN else _quote(name)
+            for name in self.columns
+        ]
+        sql = (
+            f"INSERT INTO {_quote(self.collection)} ({', '.join(target)}) "
+            f"SELECT {', '.join(source)} FROM {STAGE_TABLE}"
+        )
+        if self.mode == "upsert":
+            key = config.db.DB_PRIMARY_KEY
+            updates = [
+                f"{_quote(name)} = EXCLUDED.{_quote(name)}"
+                for name in self.columns
+                if name != key
+            ]
+            action = f"DO UPDATE SET {', '.join(updates)}" if updates else "DO NOTHING"
+            sql += f" ON CONFLICT ({_quote(key)}) {action}"
+        return sql
+
+    async def _prepare_stage(self, connection: Any) -> None:
+        await connection.execute(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
+        await connection.execute(
+            f"CREATE TEMP TABLE {STAGE_TABLE} "
+            f"(LIKE {_quote(self.collection)} INCLUDING DEFAULTS)"
+        )
+        if VECTOR_SEARCH_COLUMN in self.columns:
+            # Binary COPY has no codec for pgvector; stage as real[] and cast
+            await connection.execute(
+                f"ALTER TABLE {STAGE_TABLE} ALTER COLUMN {VECTOR_SEARCH_COLUMN} "
+                f"TYPE real[] USING NULL"
+            )
+
+    async def _drop_secondary_indexes(self, connection: Any) -> List[str]:
+        """Drop secondary indexes when the collection is empty."""
+        is_empty = await connection.fetchval(
+            f"SELECT NOT EXISTS (SELECT 1 FROM {_quote(self.collection)})"
+        )
+        if not is_empty:
+            logger.info(
+                f"Not deferring indexes: {self.collection} already contains rows"
+            )
+            return []
+        indexes = await connection.fetch(
+            _SECONDARY_INDEXES_SQL, _quote(self.collection)
+        )
+        for index in indexes:
+            await connection.execute(f"DROP INDEX {_quote(index['name'])}")
+        return [index["definition"] for index in indexes]
+
+    async def _write(self, queue: asyncio.Queue) -> None:
+        async with get_engine().connect() as sa_connection:
+            raw = await sa_connection.get_raw_connection()
+            connection = raw.driver_connection
+            merge_sql: Optional[str] = None
+            deferred: List[str] = []
+            # Deferring indexes keeps the whole load in one transaction so a
+            # failure can never leave the collection without its indexes
+            single_transaction = self.defer_indexes
+            transaction = connection.transaction()
+            await transaction.start()
+            try:
+                if self.defer_indexes:
+                    deferred = await self._drop_secondary_indexes(connection)
+                pending = 0
+                while True:
+                    records = await queue.get()
+                    if records is _DONE:
+                        break
+                    if merge_sql is None:
+                        await self._prepare_stage(connection)
+                        merge_sql = self._merge_sql()
+                    await connection.copy_records_to_table(
+                        STAGE_TABLE, records=records, columns=self.columns
+                    )
+                    await connection.execute(merge_sql)
+                    await connection.execute(f"TRUNCATE {STAGE_TABLE}")
+                    self.rows_written += len(records)
+                    self.batches_written += 1
+                    pending += len(records)
+                    if not single_transaction and pending >= self.rows_per_transaction:
+                        await transaction.commit()
+                        transaction = connection.transaction()
+                        await transaction.start()
+                        pending = 0
+                for definition in deferred:
+                    await connection.execute(definition)
+                await connection.execute(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
+            except BaseException:
+                await transaction.rollback()
+                raise
+            await transaction.commit()
+
+    async def ingest(self, documents: AsyncIterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Load documents into the collection.
+
+        Args:
+            documents: Async iterable of documents (column name to value)
+
+        Returns:
+            Dictionary with rows and batches written and throughput
+        """
+        start = time.perf_counter()
+        to_embed: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        to_write: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+
+        # End-of-stream markers are only sent on success; a failing stage
+        # cancels the others below so the open transaction rolls back
+        async def read() -> None:
+            await self._read(documents, to_embed)
+            for _ in range(self.embed_concurrency):
+                await to_embed.put(_DONE)
+
+        async def embed() -> None:
+            await asyncio.gather(
+                *(
+                    self._embed(to_embed, to_write)
+                    for _ in range(self.embed_concurrency)
+                )
+            )
+            await to_write.put(_DONE)
+
+        tasks = [
+            asyncio.create_task(read()),
+            asyncio.create_task(embed()),
+            asyncio.create_task(self._write(to_write)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        elapsed = time.perf_counter() - start
+        return {
+            "collection": self.collection,
+            "mode": self.mode,
+            "rows": self.rows_written,
+            "batches": self.batches_written,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": (
+                round(self.rows_written / elapsed, 1) if elapsed else 0.0
+            ),
+        }
+
+
+async def iter_jsonl(path: str) -> AsyncIterable[Dict[str, Any]]:
+    """
+    Stream documents from a JSON Lines file.
+
+    The file is read in chunks off the event loop, so arbitrarily large
+    files never have to fit in memory.
+    """
+    with open(path, "r", encoding="utf-8") as handle:
+        while True:
+            lines = await asyncio.to_thread(handle.readlines, 1 << 20)
+            if not lines:
+                return
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+
+
+async def _iterate(
+    documents: Sequence[Dict[str, Any]],
+) -> AsyncIterable[Dict[str, Any]]:
+    for document in documents:
+        yield document
+
+
+async def ingest_documents(
+    collection: str,
+    documents: Any,
+    mode: str = "upsert",
+    defer_indexes: bool = False,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Bulk load documents into a collection.
+
+    Args:
+        collection: Collection (table) to load into
+        documents: A sequence or async iterable of documents
+        mode: ``copy`` to append or ``upsert`` to insert-or-update
+        defer_indexes: Rebuild secondary indexes after loading an empty
+            collection instead of maintaining them row by row
+        **options: Extra ``BulkIngestor`` options
+
+    Returns:
+        Ingestion statistics
+    """
+    if not hasattr(documents, "__aiter__"):
+        documents = _iterate(documents)
+    ingestor = BulkIngestor(
+        collection, mode=mode, defer_indexes=defer_indexes, **options
+    )
+    return await ingestor.ingest(documents)
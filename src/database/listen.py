@@ -0,0 +1,152 @@
+"""Postgres LISTEN on a dedicated connection that survives restarts.
+
+A listening connection sits idle for its whole life, so it is opened
+directly with asyncpg rather than taken from a pool, where it would hold a
+slot that queries need. When the connection is lost (a failover, a restart,
+an idle timeout) it is reopened with exponential backoff, and
+``on_reconnect`` is called because notifications sent meanwhile were missed.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+
+async def _connect() -> Any:
+    """Open a connection to the primary outside the pool."""
+    import asyncpg
+
+    return await asyncpg.connect(
+        host=config.db.DB_HOST,
+        port=config.db.DB_PORT,
+        user=config.db.DB_USER,
+        password=config.db.DB_PASSWORD,
+        database=config.db.DB_NAME,
+        timeout=config.db.DB_POOL_TIMEOUT,
+    )
+
+
+class NotificationListener:
+    """Keeps a connection LISTENing on a channel, reconnecting when it drops."""
+
+    def __init__(
+        self,
+        channel: str,
+        on_notify: Callable[[str], None],
+        on_reconnect: Optional[Callable[[], None]] = None,
+        connect: Optional[Callable[[], Awaitable[Any]]] = None,
+        keepalive_interval: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the listener.
+
+        Args:
+            channel: Postgres LISTEN channel
+            on_notify: Called with each notification's payload
+            on_reconnect: Called after the connection was lost and reopened
+            connect: Opens an asyncpg connection (defaults to the primary)
+            keepalive_interval: Seconds between checks that an idle
+                connection is still alive (defaults to
+                config.db.LISTEN_KEEPALIVE_INTERVAL)
+            max_backoff: Longest wait between reconnect attempts (defaults
+                to config.db.LISTEN_MAX_BACKOFF)
+        """
+        self.channel = channel
+        self.on_notify = on_notify
+        self.on_reconnect = on_reconnect
+        self._connect = connect or _connect
+        self.keepalive_interval = (
+            config.db.LISTEN_KEEPALIVE_INTERVAL
+            if keepalive_interval is None
+            else keepalive_interval
+        )
+        self.max_backoff = (
+            config.db.LISTEN_MAX_BACKOFF if max_backoff is None else max_backoff
+        )
+        self.connected = asyncio.Event()
+        self.reconnects = 0
+        self._connection: Any = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.on_notify(payload)
+        except Exception as e:
+            logger.error(f"Handling a notification on {self.channel} failed: {e!r}")
+
+    async def _open(self, lost: asyncio.Event) -> Any:
+        connection = await self._connect()
+        try:
+            connection.add_termination_listener(lambda _: lost.set())
+            await connection.add_listener(self.channel, self._notify)
+        except BaseException:
+            connection.terminate()
+            raise
+        return connection
+
+    async def _wait_until_lost(self, connection: Any, lost: asyncio.Event) -> None:
+        """Return once the connection is closed or stops answering."""
+        while not lost.is_set():
+            try:
+                await asyncio.wait_for(lost.wait(), self.keepalive_interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await asyncio.wait_for(
+                    connection.execute("SELECT 1"), self.keepalive_interval
+                )
+            except Exception as e:
+                logger.warning(f"Listen connection on {self.channel} lost: {e!r}")
+                return
+
+    async def _run(self) -> None:
+        backoff = 0.0
+        opened = False
+        while True:
+            lost = asyncio.Event()
+            try:
+                connection = await self._open(lost)
+            except Exception as e:
+                backoff = min(self.max_backoff, max(1.0, backoff * 2))
+                logger.warning(
+                    f"Could not listen on {self.channel}, retrying in "
+                    f"{backoff:.0f}s: {e!r}"
+                )
+                await asyncio.sleep(backoff)
+                continue
+            self._connection = connection
+            backoff = 0.0
+            self.connected.set()
+            logger.info(f"Listening on {self.channel}")
+            if opened:
+                self.reconnects += 1
+                if self.on_reconnect is not None:
+                    self.on_reconnect()
+            opened = True
+            try:
+                await self._wait_until_lost(connection, lost)
+            finally:
+                self.connected.clear()
+                self._connection = None
+                connection.terminate()
+
+    def start(self) -> None:
+        """Start listening in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop listening and close the connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,97 @@
+"""Opaque cursor tokens for keyset-paginated search."""
+
+import base64
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+CURSOR_VERSION = 1
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Fingerprint the inputs that define a result ordering.
+
+    A cursor is only valid for the search that produced it; the fingerprint
+    lets a mismatched cursor be rejected instead of silently skipping rows.
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=8)
+    return digest.hexdigest()
+
+
+def encode_cursor(
+    kind: str, sort_value: float, key: Any, search_fingerprint: str
+) -> str:
+    """
+    Encode the position after the last row of a page.
+
+    Args:
+        kind: The search kind the cursor belongs to (``fts`` or ``vector``)
+        sort_value: Rank or distance of the last row
+        key: Primary key of the last row
+        search_fingerprint: Fingerprint of the search inputs
+
+    Returns:
+        URL-safe opaque cursor token
+    """
+    if not isinstance(key, (int, str)):
+        key = str(key)
+    payload = [CURSOR_VERSION, kind, sort_value, key, search_fingerprint]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token: str, kind: str, search_fingerprint: str) -> Tuple[float, Any]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        token: The opaque cursor token
+        kind: The search kind the cursor must belong to
+        search_fingerprint: Fingerprint of the current search inputs
+
+    Returns:
+        Tuple of (sort value, primary key) to seek past
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another search
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        version, cursor_kind, sort_value, key, cursor_fingerprint = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if version != CURSOR_VERSION or cursor_kind != kind:
+        raise ValueError("Cursor does not belong to this kind of search")
+    if cursor_fingerprint != search_fingerprint:
+        raise ValueError("Cursor does not belong to this search")
+    return float(sort_value), key
+
+
+def clamp_limit(limit: int, maximum: int) -> int:
+    """Clamp a requested page size to ``1..maximum``."""
+    return max(1, min(limit, maximum))
+
+
+def next_cursor(
+    rows: List[Dict[str, Any]],
+    limit: int,
+    kind: str,
+    sort_column: str,
+    key_column: str,
+    search_fingerprint: str,
+) -> Optional[str]:
+    """
+    Build the cursor for the page after ``rows``.
+
+    Callers fetch ``limit + 1`` rows; the extra row only signals that
+    another page exists and is dropped from ``rows`` here.
+
+    Returns:
+        The next cursor, or None when this is the last page
+    """
+    if len(rows) <= limit:
+        return None
+    del rows[limit:]
+    last = rows[-1]
+    return encode_cursor(kind, last[sort_column], last[key_column], search_fingerprint)
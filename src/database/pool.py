@@ -0,0 +1,98 @@
+"""Connection pool instrumentation."""
+
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+
+class _TimedQueue(AsyncAdaptedQueue):
+    """Queue of idle connections that times how long callers block on it."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wait_seconds_total: float = 0.0
+        self.wait_seconds_max: float = 0.0
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        if not block:
+            return super().get(block, timeout)
+        start = time.perf_counter()
+        connection = super().get(block, timeout)
+        # Only waits that got a connection; timeouts are counted by the pool
+        waited = time.perf_counter() - start
+        self.wait_seconds_total += waited
+        if waited > self.wait_seconds_max:
+            self.wait_seconds_max = waited
+        return connection
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long callers wait for a connection.
+
+    Waits are timed on the pool's queue, so they cover only the time spent
+    blocked for a free slot, not opening, pinging or resetting connections.
+    """
+
+    _queue_class = _TimedQueue
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the pool and its wait counters."""
+        super().__init__(*args, **kwargs)
+        self.checkouts: int = 0
+        self.checkout_timeouts: int = 0
+
+    @property
+    def wait_seconds_total(self) -> float:
+        return self._pool.wait_seconds_total
+
+    @property
+    def wait_seconds_max(self) -> float:
+        return self._pool.wait_seconds_max
+
+    def connect(self) -> Any:
+        """Check out a connection, counting checkouts and timeouts."""
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        self.checkouts += 1
+        return connection
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """
+    Collect usage statistics for an engine's connection pool.
+
+    Args:
+        engine: The engine whose pool should be inspected
+
+    Returns:
+        Dictionary with pool size, checked-out and overflow counts and
+        checkout wait times
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(
+            {
+                "checkouts": pool.checkouts,
+                "checkout_timeouts": pool.checkout_timeouts,
+                "wait_seconds_total": pool.wait_seconds_total,
+                "wait_seconds_max": pool.wait_seconds_max,
+                "wait_seconds_avg": (
+                    pool.wait_seconds_total / pool.checkouts if pool.checkouts else 0.0
+                ),
+            }
+        )
+    return stats
@@ -0,0 +1,170 @@
+"""Read-replica routing with health checking."""
+
+import asyncio
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .pool import pool_stats
+
+logger = logging.getLogger(__name__)
+
+ROUTING_STRATEGIES = ("round_robin", "least_outstanding")
+
+
+class Replica:
+    """A read replica engine and its routing state."""
+
+    def __init__(self, name: str, engine: AsyncEngine) -> None:
+        """
+        Initialize the replica.
+
+        Args:
+            name: Display name for the replica (usually ``host:port``)
+            engine: Async engine connected to the replica
+        """
+        self.name = name
+        self.engine = engine
+        self.healthy: bool = True
+        self.outstanding: int = 0
+        self.failures: int = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return routing and pool statistics for the replica."""
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "failures": self.failures,
+            "pool": pool_stats(self.engine),
+        }
+
+
+class ReplicaRouter:
+    """Routes read-only work across healthy replicas."""
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        strategy: str = "round_robin",
+        health_interval: float = 10.0,
+        health_timeout: float = 2.0,
+    ) -> None:
+        """
+        Initialize the router.
+
+        Args:
+            replicas: Replicas available for read traffic
+            strategy: Either ``round_robin`` or ``least_outstanding``
+            health_interval: Seconds between health checks
+            health_timeout: Seconds before a health check counts as failed
+        """
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(
+                f"Unknown replica routing strategy {strategy!r}, "
+                f"expected one of {', '.join(ROUTING_STRATEGIES)}"
+            )
+        self.replicas = replicas
+        self.strategy = strategy
+        self.health_interval = health_interval
+        self.health_timeout = health_timeout
+        self._counter = itertools.count()
+        self._health_task: Optional[asyncio.Task] = None
+
+    def choose(self) -> Optional[Replica]:
+        """Pick a healthy replica, or None when none are in rotation."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        if self.strategy == "least_outstanding":
+            return min(healthy, key=lambda replica: replica.outstanding)
+        return healthy[next(self._counter) % len(healthy)]
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncGenerator[Optional[Replica], None]:
+        """
+        Reserve a replica for the duration of a unit of work.
+
+        Yields None when no replica is healthy so callers can fall back to
+        the primary. Connection-level failures take the replica out of
+        rotation until the health checker sees it recover.
+        """
+        replica = self.choose()
+        if replica is None:
+            yield None
+            return
+        replica.outstanding += 1
+        try:
+            yield replica
+        except (exc.DisconnectionError, exc.InterfaceError, OSError):
+            self.mark_unhealthy(replica)
+            raise
+        except exc.DBAPIError as e:
+            if e.connection_invalidated:
+                self.mark_unhealthy(replica)
+            raise
+        finally:
+            replica.outstanding -= 1
+
+    def mark_unhealthy(self, replica: Replica) -> None:
+        """Remove a replica from rotation."""
+        replica.failures += 1
+        if replica.healthy:
+            logger.warning(f"Read replica {replica.name} removed from rotation")
+        replica.healthy = False
+
+    def mark_healthy(self, replica: Replica) -> None:
+        """Return a replica to rotation."""
+        replica.failures = 0
+        if not replica.healthy:
+            logger.info(f"Read replica {replica.name} returned to rotation")
+        replica.healthy = True
+
+    async def check(self, replica: Replica) -> bool:
+        """Run a single health check against a replica."""
+
+        async def probe() -> None:
+            async with replica.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        # The timeout covers connecting too: an unreachable host hangs there
+        try:
+            await asyncio.wait_for(probe(), timeout=self.health_timeout)
+        except Exception as e:
+            logger.debug(f"Health check failed for {replica.name}: {e}")
+            self.mark_unhealthy(replica)
+            return False
+        self.mark_healthy(replica)
+        return True
+
+    async def check_all(self) -> None:
+        """Health check every replica concurrently."""
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    async def _health_loop(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.health_interval)
+
+    def start(self) -> None:
+        """Start the background health checker."""
+        if self.replicas and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop(self) -> None:
+        """Stop the background health checker."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return statistics for every replica."""
+        return [replica.stats() for replica in self.replicas]
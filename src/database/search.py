@@ -3,91 +3,234 @@
 from typing import Any, Dict, List, Optional
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
-from .connection import get_db_session
+from ..config import config
+from ..utils.state import SharedCache
+from ..utils.tracing import SpanKind, span
+from .catalog import get_catalog
+from .connection import get_read_session
+from .pagination import (
+    clamp_limit,
+    decode_cursor,
+    fingerprint,
+    next_cursor,
+)
+
+
+def _vector_literal(embedding: List[float]) -> str:
+    """Format an embedding as a pgvector text literal."""
+    return "[" + ",".join(repr(float(value)) for value in embedding) + "]"
+
+
+def _db_attributes(operation: str, collection: str) -> Dict[str, Any]:
+    """Span attributes for a search statement."""
+    return {
+        "db.system": "postgresql",
+        "db.operation.name": operation,
+        "db.collection.name": collection,
+    }
+
+
+_cache: Optional[SharedCache] = None
+
+
+def _search_cache() -> Optional[SharedCache]:
+    """The cache of search pages shared across replicas, if enabled."""
+    global _cache
+    if _cache is None and config.db.SEARCH_CACHE_TTL > 0:
+        _cache = SharedCache("search", config.db.SEARCH_CACHE_TTL)
+    return _cache
 
 
 class DatabaseSearchEngine:
     """Handles database search operations."""
 
     async def text_search(
-        self, 
-        collection: str, 
-        query: str, 
-        limit: int = 10
-    ) -> List[Dict[str, Any]]:
+        self,
+        collection: str,
+        query: str,
+        limit: int = 10,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Perform a text-based search on a collection.
-        
+
+        Results are ordered by rank, then primary key, and paginated by
+        seeking past the last (rank, key) pair rather than with OFFSET. The
+        match itself can use a GIN index on the tsvector expression, but
+        rank has no index: every page ranks all matches before seeking, so
+        a page costs the same at any depth and grows with the match count.
+        With SEARCH_CACHE_TTL set, pages are cached for that long and shared
+        by every replica.
+
         Args:
             collection: Name of the collection/table to search
             query: Search query text
-            limit: Maximum number of results to return
-            
+            limit: Maximum number of results to return, capped by
+                MAX_SEARCH_RESULTS
+            cursor: Cursor from a previous page to continue after
+
         Returns:
-            List of matching records
+            Dictionary with the matching records and the cursor for the
+            next page (None on the last page)
         """
-        async with get_db_session() as session:
+        await get_catalog().require(collection, "text_search")
+        limit = clamp_limit(limit, config.db.MAX_SEARCH_RESULTS)
+        pk = config.db.DB_PRIMARY_KEY
+        search_fingerprint = fingerprint("fts", collection, query)
+        params: Dict[str, Any] = {"query": query, "limit": limit + 1}
+        seek = ""
+        if cursor:
+            params["after_rank"], params["after_key"] = decode_cursor(
+                cursor, "fts", search_fingerprint
+            )
+            seek = f"""
+                  AND (rank < CAST(:after_rank AS real)
+                       OR (rank = CAST(:after_rank AS real) AND "{pk}" > :after_key))
+            """
+        cache = _search_cache()
+        cache_key = ["fts", collection, query, limit, cursor]
+        if cache is not None:
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async with get_read_session() as session:
             # Implementation depends on your specific database setup
             # This is a basic example using PostgreSQL's full-text search
             sql = text(f"""
-                SELECT * FROM {collection}
-                WHERE to_tsvector('english', searchable_content) @@ plainto_tsquery('english', :query)
+                SELECT * FROM (
+                    SELECT c.*,
+                           ts_rank(to_tsvector('english', c.searchable_content), q) AS rank
+                    FROM "{collection}" c, plainto_tsquery('english', :query) q
+                    WHERE to_tsvector('english', c.searchable_content) @@ q
+                ) ranked
+                WHERE TRUE {seek}
+                ORDER BY rank DESC, "{pk}" ASC
                 LIMIT :limit
             """)
-            result = await session.execute(sql, {"query": query, "limit": limit})
-            return [dict(row) for row in result]
+            with span(
+                "db.execute", SpanKind.CLIENT, _db_attributes("text_search", collection)
+            ):
+                result = await session.execute(sql, params)
+            with span("db.rows") as rows_span:
+                rows = [dict(row._mapping) for row in result]
+                if rows_span is not None:
+                    rows_span.set_attribute("db.response.returned_rows", len(rows))
+
+        page = {
+            "results": rows,
+            "next_cursor": next_cursor(
+                rows, limit, "fts", "rank", pk, search_fingerprint
+            ),
+        }
+        if cache is not None:
+            await cache.set(cache_key, page)
+        return page
 
     async def vector_search(
         self,
         collection: str,
         embedding: List[float],
         limit: int = 10,
-        similarity_threshold: float = 0.7
-    ) -> List[Dict[str, Any]]:
+        similarity_threshold: float = 0.7,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Perform a vector similarity search.
-        
+
+        The nearest rows are found by ordering on the distance operator
+        alone, so a pgvector HNSW or IVFFlat index serves the scan; the
+        cursor's (distance, key) pair is applied as a filter and the page is
+        then sorted by distance and primary key. With an index the results
+        are approximate, as with any ANN search, and rows at exactly the
+        same distance (duplicate embeddings) that straddle a page boundary
+        may be skipped. With SEARCH_CACHE_TTL set, pages are cached for that
+        long and shared by every replica.
+
         Args:
             collection: Name of the collection/table to search
             embedding: Vector representation to search against
-            limit: Maximum number of results to return
+            limit: Maximum number of results to return, capped by
+                MAX_SEARCH_RESULTS
             similarity_threshold: Minimum similarity score (0-1)
-            
+            cursor: Cursor from a previous page to continue after
+
         Returns:
-            List of matching records with similarity scores
+            Dictionary with the matching records (including similarity
+            scores) and the cursor for the next page (None on the last page)
         """
-        async with get_db_session() as session:
+        await get_catalog().require(collection, "vector_search")
+        limit = clamp_limit(limit, config.db.MAX_SEARCH_RESULTS)
+        pk = config.db.DB_PRIMARY_KEY
+        search_fingerprint = fingerprint(
+            "vector", collection, embedding, similarity_threshold
+        )
+        params: Dict[str, Any] = {
+            "query_embedding": _vector_literal(embedding),
+            "max_distance": 1 - similarity_threshold,
+            "limit": limit + 1,
+        }
+        seek = ""
+        if cursor:
+            params["after_distance"], params["after_key"] = decode_cursor(
+                cursor, "vector", search_fingerprint
+            )
+            seek = f"""
+                  AND embedding <=> CAST(:query_embedding AS vector) >= :after_distance
+                  AND NOT (embedding <=> CAST(:query_embedding AS vector) = :after_distance
+                           AND "{pk}" <= :after_key)
+            """
+        cache = _search_cache()
+        cache_key = [
+            "vector", collection, embedding, similarity_threshold, limit, cursor
+        ]
+        if cache is not None:
+            cached = await cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        async with get_read_session() as session:
             # Implementation depends on your vector storage setup
             # This is an example using PostgreSQL with pgvector
+            # The inner ORDER BY must be the bare operator for the ANN index
+            # to be used; ties are broken by key only within the page
             sql = text(f"""
-                SELECT *, 
-                       1 - (embedding <=> :query_embedding) as similarity
-                FROM {collection}
-                WHERE 1 - (embedding <=> :query_embedding) > :threshold
-                ORDER BY similarity DESC
-                LIMIT :limit
+                SELECT * FROM (
+                    SELECT *,
+                           embedding <=> CAST(:query_embedding AS vector) AS distance,
+                           1 - (embedding <=> CAST(:query_embedding AS vector)) AS similarity
+                    FROM "{collection}"
+                    WHERE embedding <=> CAST(:query_embedding AS vector) < :max_distance
+                    {seek}
+                    ORDER BY embedding <=> CAST(:query_embedding AS vector)
+                    LIMIT :limit
+                ) nearest
+                ORDER BY distance ASC, "{pk}" ASC
             """)
-            result = await session.execute(
-                sql,
-                {
-                    "query_embedding": embedding,
-                    "threshold": similarity_threshold,
-                    "limit": limit
-                }
-            )
-            return [dict(row) for row in result]
+            with span(
+                "db.execute", SpanKind.CLIENT, _db_attributes("vector_search", collection)
+            ):
+                result = await session.execute(sql, params)
+            with span("db.rows") as rows_span:
+                rows = [dict(row._mapping) for row in result]
+                if rows_span is not None:
+                    rows_span.set_attribute("db.response.returned_rows", len(rows))
+
+        page = {
+            "results": rows,
+            "next_cursor": next_cursor(
+                rows, limit, "vector", "distance", pk, search_fingerprint
+            ),
+        }
+        if cache is not None:
+            await cache.set(cache_key, page)
+        return page
 
     async def get_available_collections(self) -> List[Dict[str, Any]]:
-        """Get information about available searchable collections."""
-        async with get_db_session() as session:
-            # Return metadata about available collections and their schemas
-            sql = text("""
-                SELECT 
-                    table_name as collection,
-                    obj_description((table_schema || '.' || table_name)::regclass) as description
-                FROM information_schema.tables
-                WHERE table_schema = 'public'
-                  AND table_type = 'BASE TABLE'
-            """)
-            result = await session.execute(sql)
-            return [dict(row) for row in result] 
\ No newline at end of file
+        """
+        Get information about available searchable collections.
+
+        Served from the in-memory catalog: column schemas, row-count
+        estimates and indexes for each collection.
+        """
+        return await get_catalog().list_collections()
@@ -2,21 +2,27 @@
 
 import argparse
 import asyncio
+import json
 import logging
-import math
 import sys
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-import uvicorn
 from mcp.server.fastmcp import FastMCP
-from mcp import MCP, Transport
-from mcp.errors import MCPError
 
 from src.config import config
+from src.resources.subscriptions import enable_subscriptions, get_hub
+from src.tools.calculator import calculate
+from src.tools.multi_call import register_multi_call
+from src.tools.result_pages import register_result_pages
 from src.utils import get_version, setup_logging
-from src.database.context import DatabaseContextProvider
-from src.api.provider import DynamicToolProvider
+from src.utils.codec import encode_tool_results
+from src.utils.deadline import enforce_deadlines
+from src.utils.execution import offloaded_tool
+from src.utils.limits import propagate_tool_errors
+from src.utils.memo import PromptTemplate
+from src.utils.metrics import instrument_tools, registry
+from src.utils.warmup import set_ready
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -38,12 +44,107 @@ mcp = FastMCP(
     icon="🚀",  # Optional server icon
     metadata=config.metadata,
 )
+encode_tool_results(mcp)
+instrument_tools(mcp)
+# Cancel tool calls, and their queries and upstream requests, at the deadline
+enforce_deadlines(mcp)
+# Push resource updates and list changes instead of having clients poll
+enable_subscriptions(mcp)
+# Send shed and timed-out calls as retryable JSON-RPC errors on every transport
+propagate_tool_errors(mcp)
+
+# Register the database context provider only when a database is configured;
+# SQLAlchemy is not imported otherwise
+if config.db.is_configured:
+    from src.database.context import DatabaseContextProvider
+
+    mcp.register_context_provider(DatabaseContextProvider())
+
+    from src.database.changes import register_collection_resources
+
+    register_collection_resources(mcp)
+
+    from src.tools.ingest import ingest_documents
+    from src.tools.search import (
+        database_pool_stats,
+        list_searchable_collections,
+        search_database,
+        semantic_search,
+    )
+
+    for database_tool in (
+        search_database,
+        semantic_search,
+        list_searchable_collections,
+        database_pool_stats,
+        ingest_documents,
+    ):
+        mcp.add_tool(database_tool)
+
+    if config.db.BLOB_TABLE:
+        from src.database.blobs import BlobStore
+        from src.resources import register_chunked_resources
+
+        register_chunked_resources(
+            mcp,
+            BlobStore(
+                config.db.BLOB_TABLE,
+                key_column=config.db.BLOB_KEY_COLUMN,
+                key_type=config.db.BLOB_KEY_TYPE,
+                data_column=config.db.BLOB_DATA_COLUMN,
+                mime_column=config.db.BLOB_MIME_COLUMN or None,
+            ),
+            scheme="blob",
+            description=f"Blobs stored in {config.db.BLOB_TABLE}, by key",
+        )
+
+# Serve local files as chunked resources when a resource root is configured
+if config.resource_root:
+    from src.resources import FileStore, register_chunked_resources
+
+    _file_store = FileStore(config.resource_root)
+    register_chunked_resources(
+        mcp,
+        _file_store,
+        scheme="artifact",
+        description="Files under the resource root, by relative path",
+        listing=_file_store.listing,
+    )
+
+# Background tasks started with the server, such as file watchers
+_background_tasks: List[asyncio.Task] = []
+
+# API tool provider, created on first use
+_api_provider = None
 
-# Register the database context provider
-mcp.register_context_provider(DatabaseContextProvider())
 
-# Initialize API tool provider
-api_provider = DynamicToolProvider()
+def get_api_provider():
+    """Get the API tool provider, creating it on first use."""
+    global _api_provider
+    if _api_provider is None:
+        from src.api.provider import DynamicToolProvider
+
+        _api_provider = DynamicToolProvider()
+    return _api_provider
+
+
+API_TOOLS_URI = "api://tools"
+
+if config.api.specs:
+
+    @mcp.resource(
+        API_TOOLS_URI,
+        name="api_tools",
+        description="Tools generated from the configured API specifications",
+        mime_type="application/json",
+    )
+    def api_tools() -> str:
+        """List the registered API tools."""
+        tools = [
+            {"name": tool.name, "description": tool.description}
+            for tool in get_api_provider().get_registered_tools()
+        ]
+        return json.dumps({"tools": tools})
 
 
 # Define tools
@@ -58,11 +159,20 @@ def add(a: float, b: float) -> Dict[str, Any]:
     }
 
 
-# Define prompts
-@mcp.prompt()
-def math_problem(problem: str) -> str:
-    """Create a prompt for solving a math problem."""
-    return f"""Please solve this mathematical problem:
+# Expressions evaluated over whole batches of rows in one call; large
+# batches without NumPy are pure Python, so keep them off the event loop
+offloaded_tool(mcp)(calculate)
+
+# Let clients fan out many tool calls in one request
+register_multi_call(mcp)
+
+# Send long tool results a page at a time
+register_result_pages(mcp)
+
+
+# Define prompts; templates are compiled once at import
+MATH_PROBLEM = PromptTemplate(
+    """Please solve this mathematical problem:
 
 Problem: {problem}
 
@@ -73,13 +183,10 @@ Steps:
 4. Verify your answer
 
 Answer:"""
+)
 
-
-@mcp.prompt()
-def language_comparison(languages: List[str]) -> str:
-    """Create a prompt for comparing programming languages."""
-    language_list = ", ".join(languages)
-    return f"""Please compare the following programming languages: {language_list}
+LANGUAGE_COMPARISON = PromptTemplate(
+    """Please compare the following programming languages: {languages}
 
 For each language, please discuss:
 - Key features and strengths
@@ -88,25 +195,191 @@ For each language, please discuss:
 - Performance characteristics
 
 Then provide a concise comparison highlighting when each would be the best choice for different scenarios."""
+)
+
+
+@mcp.prompt()
+def math_problem(problem: str) -> str:
+    """Create a prompt for solving a math problem."""
+    return MATH_PROBLEM.render(problem=problem)
+
+
+@mcp.prompt()
+def language_comparison(languages: List[str]) -> str:
+    """Create a prompt for comparing programming languages."""
+    return LANGUAGE_COMPARISON.render(languages=", ".join(languages))
 
 
 async def register_api_tools():
     """Register tools from configured API specifications."""
     for spec in config.api.specs:
         try:
-            tool_names = await api_provider.register_api_tools(
+            tool_names = await get_api_provider().register_api_tools(
                 spec_url=spec.url,
                 api_type=spec.type,
                 auth_config=spec.auth,
                 rate_limit_config=spec.rate_limits
+                or config.api.rate_limits.get(spec.name),
+                limits=spec.limits,
+                cache_ttl=spec.cache_ttl,
+                api_name=spec.name,
             )
             logger.info(f"Registered {len(tool_names)} tools from {spec.name}")
         except Exception as e:
             logger.error(f"Failed to register tools from {spec.name}: {e}")
+    get_hub().changed(API_TOOLS_URI)
+    get_hub().list_changed("tools")
+
+
+def startup_phases() -> Dict[str, Any]:
+    """Initialization steps that run before the server accepts requests."""
+    phases: Dict[str, Any] = {
+        "mcp app": mcp.sse_app,
+    }
+    if config.api.specs:
+        phases["api tool provider"] = get_api_provider
+    if config.db.is_configured:
+        from src.database.connection import get_engine, get_replica_router
+
+        phases["database engine"] = get_engine
+        phases["replica router"] = get_replica_router
+    return phases
+
+
+def warmup_steps() -> Dict[str, Any]:
+    """Work done during startup so the first requests do not pay for it."""
+    from src.utils.codec import get_codec
+    from src.utils.warmup import warm_tool_validators
+
+    async def warm_codec() -> str:
+        return get_codec().name
+
+    steps: Dict[str, Any] = {
+        "tool validators": lambda: warm_tool_validators(mcp),
+        "json codec": warm_codec,
+    }
+    if config.api.specs and config.warmup_upstream_connections > 0:
+        steps["upstream connections"] = lambda: get_api_provider().warm_connections(
+            config.warmup_upstream_connections
+        )
+    if config.db.is_configured:
+        from src.database.connection import warm_pools
+
+        steps["database pools"] = warm_pools
+    return steps
+
+
+async def startup() -> None:
+    """Prepare shared resources before the server accepts requests."""
+    if config.trace_export:
+        from src.utils.tracing import configure_tracing, trace_tools
+
+        tracer = configure_tracing(
+            config.trace_export, config.name, config.trace_sample_rate
+        )
+        trace_tools(mcp)
+        tracer.exporter.start()
+
+    # Register API tools before serving requests
+    if config.api.specs:
+        await register_api_tools()
 
+    if config.db.is_configured:
+        from src.database import connection
+        from src.database.catalog import get_catalog
 
-# Register API tools before starting the server
-asyncio.create_task(register_api_tools())
+        registry.register_collector(connection.collect_metrics)
+
+        # Keep unhealthy read replicas out of rotation while serving
+        connection.get_replica_router().start()
+
+        # Load the collection catalog now so requests are served from memory
+        catalog = get_catalog()
+        registry.register_collector(catalog.collect_metrics)
+        try:
+            await catalog.refresh()
+        except Exception as e:
+            logger.error(f"Failed to load collection catalog: {e}")
+        await catalog.start()
+
+        # Tell subscribers when collections change
+        from src.database.changes import get_change_listener
+
+        await get_change_listener().start()
+
+    if config.resource_root and config.resource_watch_interval:
+        _background_tasks.append(
+            asyncio.create_task(
+                _file_store.watch(get_hub(), "artifact", config.resource_watch_interval)
+            )
+        )
+
+    # Open connections and build validators before reporting ready
+    report = None
+    if config.warmup_timeout is not None:
+        from src.utils.warmup import warm_up
+
+        report = await warm_up(warmup_steps(), config.warmup_timeout)
+    set_ready(True, report)
+
+
+async def shutdown() -> None:
+    """Release shared resources once the server has stopped."""
+    from src.utils.execution import shutdown_pools
+    from src.utils.spill import close_spill_store
+    from src.utils.state import close_state_backend
+    from src.utils.tracing import get_tracer
+
+    # Readiness probes fail from here on
+    set_ready(False)
+    for task in _background_tasks:
+        task.cancel()
+    _background_tasks.clear()
+    if config.db.is_configured:
+        from src.database.catalog import get_catalog
+        from src.database.changes import get_change_listener
+        from src.database.connection import dispose_engines
+
+        await get_change_listener().stop()
+        await get_catalog().stop()
+        # Stops replica health checks and closes every pool
+        await dispose_engines()
+    if _api_provider is not None:
+        # Closes the upstream HTTP client and its pooled connections
+        await _api_provider.aclose()
+    # Deliver notifications still waiting for their window to close
+    await get_hub().flush()
+
+    # Let offloaded tool calls finish before the process exits
+    shutdown_pools()
+    close_spill_store()
+    await close_state_backend()
+    tracer = get_tracer()
+    if tracer is not None:
+        await tracer.exporter.stop()
+
+
+def create_worker_app() -> Any:
+    """Build the HTTP app for one worker process in multi-worker mode."""
+    from src.transport.http import build_http_app
+    from src.transport.workers import worker_log_level, worker_registry
+
+    # Workers are fresh processes: run_cli's logging setup did not reach them
+    setup_logging(worker_log_level())
+    # Stateful: the affinity layer sends each session's requests to the
+    # worker holding it, so subscriptions and notifications keep working
+    return build_http_app(
+        mcp,
+        registry=worker_registry(),
+        on_startup=startup,
+        on_shutdown=shutdown,
+        metrics_path=config.metrics_path,
+        readiness_path=config.readiness_path,
+        admin_token=config.admin_token,
+        batch_max_concurrency=config.batch_max_concurrency,
+        batch_max_items=config.batch_max_items,
+        compression_min_size=config.http_compression_min_size,
+    )
 
 
 async def run_server(
@@ -123,23 +396,79 @@ async def run_server(
         transport: The transport type (HTTP or stdio).
         debug: Whether to enable debug mode.
     """
+    await startup()
+
     # Run the server with the specified transport
-    if transport == Transport.STDIO:
-        logger.info("Starting MCP server with stdio transport")
-        # Use asyncio.StreamReader/StreamWriter instead of stdin_stdout_transport
-        # This is a placeholder - implement based on MCP library requirements
-        raise NotImplementedError("stdio transport not implemented in this version")
-    else:
-        logger.info(f"Starting MCP server at http://{host}:{port}")
-        # FastAPI app integration - FastMCP exposes app through sse_app attribute
-        config_dict = uvicorn.Config(
-            app=mcp.sse_app,  # Access the SSE app (FastAPI app)
-            host=host,
-            port=port,
-            log_level="debug" if debug else "info",
+    try:
+        if transport == Transport.STDIO:
+            from src.transport import JSONRPCDispatcher, serve_stdio
+
+            logger.info("Starting MCP server with stdio transport")
+            await serve_stdio(
+                JSONRPCDispatcher(
+                    mcp,
+                    version=get_version(),
+                    batch_max_concurrency=config.batch_max_concurrency,
+                    batch_max_items=config.batch_max_items,
+                ),
+                max_concurrency=config.stdio_max_concurrency,
+            )
+        else:
+            import uvicorn
+
+            from src.transport.http import build_http_app
+
+            logger.info(f"Starting MCP server at http://{host}:{port}")
+            # Streamable HTTP at /mcp, SSE at /sse
+            config_dict = uvicorn.Config(
+                app=build_http_app(
+                    mcp,
+                    metrics_path=config.metrics_path,
+                    readiness_path=config.readiness_path,
+                    admin_token=config.admin_token,
+                    batch_max_concurrency=config.batch_max_concurrency,
+                    batch_max_items=config.batch_max_items,
+                    compression_min_size=config.http_compression_min_size,
+                ),
+                host=host,
+                port=port,
+                log_level="debug" if debug else "info",
+            )
+            server = uvicorn.Server(config_dict)
+            await server.serve()
+    finally:
+        await shutdown()
+
+
+async def run_ingest(
+    collection: str,
+    path: str,
+    mode: str = "upsert",
+    batch_size: Optional[int] = None,
+    defer_indexes: bool = False,
+) -> Dict[str, Any]:
+    """Bulk load a JSON Lines file into a collection.
+
+    Args:
+        collection: The collection to load into.
+        path: Path to a JSON Lines file with one document per line.
+        mode: "upsert" to update existing keys or "copy" to append.
+        batch_size: Documents per COPY batch and embedding call.
+        defer_indexes: Rebuild secondary indexes after loading an empty collection.
+    """
+    from src.database.connection import dispose_engines
+    from src.database.ingest import BulkIngestor, iter_jsonl
+
+    try:
+        ingestor = BulkIngestor(
+            collection,
+            mode=mode,
+            batch_size=batch_size,
+            defer_indexes=defer_indexes,
         )
-        server = uvicorn.Server(config_dict)
-        await server.serve()
+        return await ingestor.ingest(iter_jsonl(path))
+    finally:
+        await dispose_engines()
 
 
 def run_cli() -> None:
@@ -161,6 +490,12 @@ def run_cli() -> None:
         default="http",
         help="Transport type (default: http)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.workers,
+        help="HTTP worker processes (default: 1)",
+    )
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     parser.add_argument(
         "--log-level",
@@ -172,6 +507,47 @@ def run_cli() -> None:
     parser.add_argument(
         "--version", action="store_true", help="Show version information and exit"
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import and initialization time per module and exit",
+    )
+    parser.add_argument(
+        "--profile-for",
+        type=float,
+        metavar="SECONDS",
+        help="Sample stacks for the first SECONDS of serving",
+    )
+    parser.add_argument(
+        "--profile-output",
+        default="profile.folded",
+        help="Collapsed-stack file written by --profile-for (default: profile.folded)",
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    ingest_parser = subparsers.add_parser(
+        "ingest", help="Bulk load a JSON Lines file into a collection"
+    )
+    ingest_parser.add_argument("collection", help="Collection to load into")
+    ingest_parser.add_argument("path", help="JSON Lines file, one document per line")
+    ingest_parser.add_argument(
+        "--mode",
+        type=str,
+        choices=["upsert", "copy"],
+        default="upsert",
+        help="Update existing keys or append only (default: upsert)",
+    )
+    ingest_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Documents per COPY batch (default: INGEST_BATCH_SIZE)",
+    )
+    ingest_parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help="Rebuild secondary indexes after loading an empty collection",
+    )
 
     args = parser.parse_args()
 
@@ -179,12 +555,64 @@ def run_cli() -> None:
         print(f"{config.name} v{get_version()}")
         sys.exit(0)
 
-    # Set up logging
-    setup_logging(args.log_level)
+    if args.profile_startup:
+        from src.utils.startup import profile_startup
+
+        profile = profile_startup(startup_phases())
+        print(profile.report(budget_ms=config.startup_budget_ms))
+        sys.exit(0)
+
+    if args.profile_for:
+        from src.utils.profiler import profile_to_file
+
+        profile_to_file(args.profile_for, args.profile_output)
 
     # Determine transport type
     transport_type = Transport.STDIO if args.transport == "stdio" else Transport.HTTP
 
+    # Set up logging; stdout carries the protocol when using stdio
+    setup_logging(
+        args.log_level,
+        stream=sys.stderr if transport_type == Transport.STDIO else None,
+    )
+
+    if transport_type == Transport.STDIO and args.workers > 1:
+        logger.warning("--workers only applies to HTTP; stdio runs one process")
+
+    if args.command == "ingest":
+        try:
+            stats = asyncio.run(
+                run_ingest(
+                    args.collection,
+                    args.path,
+                    mode=args.mode,
+                    batch_size=args.batch_size,
+                    defer_indexes=args.defer_indexes,
+                )
+            )
+        except Exception as e:
+            logger.error(f"Ingestion failed: {e}", exc_info=True)
+            sys.exit(1)
+        print(json.dumps(stats))
+        sys.exit(0)
+
+    if transport_type == Transport.HTTP and args.workers > 1:
+        from src.transport.workers import serve_workers
+
+        logger.info(
+            f"Starting MCP server at http://{args.host}:{args.port} "
+            f"with {args.workers} workers"
+        )
+        serve_workers(
+            "src.main:create_worker_app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level="debug" if args.debug else "info",
+            app_log_level=args.log_level,
+        )
+        return
+
     # Run the server
     try:
         asyncio.run(
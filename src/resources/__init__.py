@@ -1,5 +1,31 @@
 """MCP Resources Package."""
 
-from src.resources.example import ExampleResource  # type: ignore
+from src.resources.base import (
+    ChunkedResource,
+    ResourceChunk,
+    parse_resource_uri,
+    register_chunked_resources,
+    resource_uri,
+)
+from src.resources.files import FileStore
+from src.resources.subscriptions import (
+    Subscriber,
+    SubscriptionHub,
+    close_session,
+    enable_subscriptions,
+    get_hub,
+)
 
-__all__ = ["ExampleResource"]
+__all__ = [
+    "ChunkedResource",
+    "FileStore",
+    "ResourceChunk",
+    "Subscriber",
+    "SubscriptionHub",
+    "close_session",
+    "enable_subscriptions",
+    "get_hub",
+    "parse_resource_uri",
+    "register_chunked_resources",
+    "resource_uri",
+]
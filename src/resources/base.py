@@ -0,0 +1,236 @@
+"""Chunked, conditional resource reads shared by file and blob resources.
+
+Large resources are never returned whole. A read returns at most one chunk,
+described in the result's ``_meta`` by its ``offset``, ``length``, the
+resource's total ``size`` and ``etag``, and the ``nextUri`` to read the
+following chunk. Ranges and conditions are passed as URI query parameters:
+
+    artifact://reports/q3.parquet?offset=1048576&length=65536&if_none_match=<etag>
+
+A read whose ``if_none_match`` equals the current ETag returns no content and
+``notModified: true``, so clients can skip unchanged resources.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Protocol, Tuple, Union
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlsplit
+
+from mcp.server.fastmcp.resources import Resource
+from pydantic import Field
+
+# MIME types whose complete contents are returned as text
+_TEXT_TYPES = ("application/json", "application/xml", "application/yaml")
+
+
+@dataclass
+class ResourceChunk:
+    """A byte range of a resource, or a not-modified marker."""
+
+    data: bytes
+    offset: int
+    size: int
+    etag: str
+    mime_type: str = "application/octet-stream"
+    not_modified: bool = False
+
+    @property
+    def next_offset(self) -> Optional[int]:
+        """Offset of the following chunk, or None after the last one."""
+        end = self.offset + len(self.data)
+        if self.not_modified or end >= self.size:
+            return None
+        return end
+
+    def meta(self) -> Dict[str, Any]:
+        """Describe the chunk for a read result's ``_meta``."""
+        meta: Dict[str, Any] = {
+            "etag": self.etag,
+            "size": self.size,
+            "offset": self.offset,
+            "length": len(self.data),
+        }
+        if self.not_modified:
+            meta["notModified"] = True
+        return meta
+
+
+class ChunkSource(Protocol):
+    """Storage that resources are read from one chunk at a time."""
+
+    async def read(
+        self,
+        name: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+    ) -> ResourceChunk:
+        """Read a chunk of the named resource."""
+        ...
+
+
+def resource_uri(
+    scheme: str,
+    name: str,
+    offset: int = 0,
+    length: Optional[int] = None,
+    if_none_match: Optional[str] = None,
+) -> str:
+    """
+    Build the URI of a resource chunk.
+
+    Args:
+        scheme: URI scheme the source is registered under
+        name: Resource name (a relative path or key)
+        offset: First byte to read
+        length: Most bytes to read (None reads one chunk)
+        if_none_match: ETag the client already holds
+
+    Returns:
+        The URI
+    """
+    query = {}
+    if offset:
+        query["offset"] = offset
+    if length is not None:
+        query["length"] = length
+    if if_none_match is not None:
+        query["if_none_match"] = if_none_match
+    uri = f"{scheme}://{quote(name)}"
+    return f"{uri}?{urlencode(query)}" if query else uri
+
+
+def parse_resource_uri(uri: str) -> Tuple[str, int, Optional[int], Optional[str]]:
+    """
+    Split a chunk URI into its name, range and condition.
+
+    Args:
+        uri: URI built like ``resource_uri`` builds them
+
+    Returns:
+        (name, offset, length, if_none_match)
+
+    Raises:
+        ValueError: If the range is not a pair of non-negative integers
+    """
+    parts = urlsplit(uri)
+    name = unquote(parts.netloc + parts.path).strip("/")
+    query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+    offset = int(query.get("offset", 0))
+    length = int(query["length"]) if "length" in query else None
+    if offset < 0 or (length is not None and length < 0):
+        raise ValueError("offset and length must not be negative")
+    return name, offset, length, query.get("if_none_match")
+
+
+def _is_text(mime_type: str) -> bool:
+    return mime_type.startswith("text/") or mime_type in _TEXT_TYPES
+
+
+class ChunkedResource(Resource):
+    """A resource read one chunk at a time from a ``ChunkSource``."""
+
+    source: Any = Field(exclude=True)
+    scheme: str
+    key: str
+    offset: int = 0
+    length: Optional[int] = None
+    if_none_match: Optional[str] = None
+
+    async def read(self) -> Union[str, bytes]:
+        """Read the chunk, recording its range and ETag in ``meta``."""
+        chunk = await self.source.read(
+            self.key, self.offset, self.length, self.if_none_match
+        )
+        self.mime_type = chunk.mime_type
+        meta = chunk.meta()
+        if chunk.next_offset is not None:
+            meta["nextUri"] = resource_uri(
+                self.scheme, self.key, chunk.next_offset, self.length
+            )
+        self.meta = meta
+        if (
+            chunk.offset == 0
+            and len(chunk.data) == chunk.size
+            and _is_text(chunk.mime_type)
+        ):
+            try:
+                return chunk.data.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
+        return chunk.data
+
+
+def register_chunked_resources(
+    server: Any,
+    source: ChunkSource,
+    scheme: str,
+    description: str,
+    listing: Optional[Callable[[], Iterable[Tuple[str, int, str, str]]]] = None,
+) -> None:
+    """
+    Serve a chunk source under a URI scheme.
+
+    Reads of ``<scheme>://<name>`` URIs are routed to ``source`` ahead of
+    the server's other resources and templates. The scheme is advertised as
+    a resource template, and when ``listing`` is given the resources it
+    returns are listed as well.
+
+    Args:
+        server: The FastMCP server
+        source: Where chunks are read from
+        scheme: URI scheme, e.g. ``artifact``
+        description: Description of the resource template
+        listing: Callable returning ``(name, size, etag, mime_type)`` tuples
+            for ``resources/list`` (None lists nothing)
+    """
+    manager = server._resource_manager
+    prefix = f"{scheme}://"
+
+    def create(uri: str) -> ChunkedResource:
+        name, offset, length, if_none_match = parse_resource_uri(uri)
+        return ChunkedResource(
+            uri=uri,
+            name=name,
+            source=source,
+            scheme=scheme,
+            key=name,
+            offset=offset,
+            length=length,
+            if_none_match=if_none_match,
+        )
+
+    get_resource = manager.get_resource
+
+    async def chunked_get_resource(uri: Any, context: Any = None) -> Any:
+        uri = str(uri)
+        if uri.startswith(prefix):
+            return create(uri)
+        return await get_resource(uri, context=context)
+
+    manager.get_resource = chunked_get_resource
+
+    async def read_first_chunk(name: str) -> bytes:
+        return (await source.read(name)).data
+
+    manager.add_template(
+        read_first_chunk,
+        uri_template=f"{scheme}://{{name}}",
+        name=scheme,
+        description=description,
+        mime_type="application/octet-stream",
+    )
+
+    if listing is None:
+        return
+    list_resources = manager.list_resources
+
+    def chunked_list_resources() -> List[Resource]:
+        resources = list_resources()
+        for name, size, etag, mime_type in listing():
+            resource = create(resource_uri(scheme, name))
+            resource.mime_type = mime_type
+            resource.meta = {"size": size, "etag": etag}
+            resources.append(resource)
+        return resources
+
+    manager.list_resources = chunked_list_resources
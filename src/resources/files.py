@@ -0,0 +1,233 @@
+"""Local files served as chunked resources through memory-mapped reads."""
+
+import asyncio
+import functools
+import logging
+import mimetypes
+import mmap
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.config import config
+from src.utils.execution import get_thread_pool
+from src.utils.memo import TTLCache, get_cache
+
+from .base import ResourceChunk, resource_uri
+from .subscriptions import SubscriptionHub
+
+logger = logging.getLogger(__name__)
+
+
+def _etag(stat: os.stat_result) -> str:
+    """ETag derived from a file's identity, size and modification time."""
+    return f"{stat.st_ino:x}-{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+def _map_range(fd: int, offset: int, length: int) -> bytes:
+    """Copy a byte range out of a file by mapping only the pages it spans."""
+    if length == 0:
+        return b""
+    start = offset - offset % mmap.ALLOCATIONGRANULARITY
+    with mmap.mmap(
+        fd, offset - start + length, access=mmap.ACCESS_READ, offset=start
+    ) as mapped:
+        return mapped[offset - start :]
+
+
+class FileStore:
+    """
+    Serves the files under a directory one chunk at a time.
+
+    Each read maps just the pages of the requested range and copies them
+    out, so the memory a read needs is bounded by the chunk size whatever
+    the size of the file. Files up to ``cache_file_size`` bytes are kept
+    whole in an LRU cache, keyed by path and validated against the file's
+    ETag on every read. Reads run in the shared thread pool.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        chunk_size: Optional[int] = None,
+        cache_file_size: Optional[int] = None,
+        cache: Optional[TTLCache] = None,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory whose files are served
+            chunk_size: Most bytes returned by one read (defaults to
+                config.resource_chunk_size)
+            cache_file_size: Largest file kept in the cache (defaults to
+                config.resource_cache_file_size; 0 disables caching)
+            cache: Cache for small files (defaults to a ``resources:files``
+                cache of config.resource_cache_size entries)
+        """
+        self.root = os.path.realpath(root)
+        self.chunk_size = chunk_size or config.resource_chunk_size
+        self.cache_file_size = (
+            config.resource_cache_file_size
+            if cache_file_size is None
+            else cache_file_size
+        )
+        self.cache = cache or get_cache("resources:files", config.resource_cache_size)
+
+    def resolve(self, name: str) -> str:
+        """
+        Get the path of a file, refusing names that leave the root.
+
+        Args:
+            name: Path relative to the root
+
+        Returns:
+            The absolute path, with symlinks resolved
+
+        Raises:
+            ValueError: If the path is outside the root
+        """
+        path = os.path.realpath(os.path.join(self.root, name))
+        if os.path.commonpath([self.root, path]) != self.root or path == self.root:
+            raise ValueError(f"Not a resource: {name}")
+        return path
+
+    async def read(
+        self,
+        name: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        if_none_match: Optional[str] = None,
+    ) -> ResourceChunk:
+        """
+        Read a chunk of a file.
+
+        Args:
+            name: Path relative to the root
+            offset: First byte to read
+            length: Most bytes to read (capped at the chunk size)
+            if_none_match: ETag the caller holds; a match returns no data
+
+        Returns:
+            The chunk
+
+        Raises:
+            ValueError: If the file is outside the root or the offset is past
+                its end
+            FileNotFoundError: If the file does not exist
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_thread_pool(),
+            functools.partial(self._read, name, offset, length, if_none_match),
+        )
+
+    def _read(
+        self,
+        name: str,
+        offset: int,
+        length: Optional[int],
+        if_none_match: Optional[str],
+    ) -> ResourceChunk:
+        path = self.resolve(name)
+        mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            # Stat the open file so the ETag matches the bytes read
+            stat = os.fstat(fd)
+            size = stat.st_size
+            etag = _etag(stat)
+            if if_none_match == etag:
+                return ResourceChunk(b"", offset, size, etag, mime_type, True)
+            if offset > size:
+                raise ValueError(f"Offset {offset} is past the end of {name}")
+            length = min(length or self.chunk_size, self.chunk_size, size - offset)
+            if size > self.cache_file_size:
+                data = _map_range(fd, offset, length)
+            else:
+                data = self._cached(path, etag, fd, size)[offset : offset + length]
+        finally:
+            os.close(fd)
+        return ResourceChunk(data, offset, size, etag, mime_type)
+
+    def _cached(self, path: str, etag: str, fd: int, size: int) -> bytes:
+        entry = self.cache.get(path)
+        if isinstance(entry, tuple) and entry[0] == etag:
+            return entry[1]
+        data = _map_range(fd, 0, size)
+        self.cache.set(path, (etag, data))
+        return data
+
+    def _walk(self) -> Iterator[str]:
+        for directory, subdirectories, files in os.walk(self.root):
+            subdirectories.sort()
+            for file_name in sorted(files):
+                yield os.path.join(directory, file_name)
+
+    def listing(self, limit: int = 1000) -> List[Tuple[str, int, str, str]]:
+        """
+        List the files under the root.
+
+        Args:
+            limit: Most files listed
+
+        Returns:
+            ``(name, size, etag, mime_type)`` for each file
+        """
+        entries = []
+        for path in self._walk():
+            if len(entries) >= limit:
+                break
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            name = os.path.relpath(path, self.root).replace(os.sep, "/")
+            entries.append((name, stat.st_size, _etag(stat), mime_type))
+        return entries
+
+    def snapshot(self) -> Dict[str, str]:
+        """
+        Get the ETag of every file under the root.
+
+        Returns:
+            Mapping of file name to ETag
+        """
+        etags = {}
+        for path in self._walk():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            etags[os.path.relpath(path, self.root).replace(os.sep, "/")] = _etag(stat)
+        return etags
+
+    async def watch(self, hub: SubscriptionHub, scheme: str, interval: float) -> None:
+        """
+        Report changed files to a subscription hub until cancelled.
+
+        The root is rescanned every ``interval`` seconds in the shared
+        thread pool. A file whose ETag changed or that was removed is
+        reported as changed, and files appearing or disappearing change the
+        resource list.
+
+        Args:
+            hub: Hub that notifies subscribers
+            scheme: URI scheme the store is registered under
+            interval: Seconds between scans
+        """
+        loop = asyncio.get_running_loop()
+        previous = await loop.run_in_executor(get_thread_pool(), self.snapshot)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                current = await loop.run_in_executor(get_thread_pool(), self.snapshot)
+            except OSError as e:
+                logger.error(f"Could not scan {self.root}: {e}")
+                continue
+            for name, etag in previous.items():
+                if current.get(name) != etag:
+                    hub.changed(resource_uri(scheme, name))
+            if current.keys() != previous.keys():
+                hub.list_changed("resources")
+            previous = current
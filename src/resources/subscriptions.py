@@ -0,0 +1,368 @@
+"""Resource subscriptions with debounced, coalesced change notifications.
+
+Change sources (Postgres notifications, file watches, tool registration)
+report changed URIs to a ``SubscriptionHub``. The hub collects changes for
+a short window, then sends each subscribed session one
+``notifications/resources/updated`` per changed URI, however many times it
+changed within the window. Sessions that listed tools or resources are told
+when those lists change.
+"""
+
+import asyncio
+import contextvars
+import logging
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from mcp import types
+from mcp.server.lowlevel.server import NotificationOptions
+from pydantic import AnyUrl
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+# Lists whose changes clients can be told about
+LIST_KINDS = ("resources", "tools", "prompts")
+
+
+class Subscriber:
+    """
+    A client session that change notifications are sent to.
+
+    The default implementation sends JSON-RPC notification messages through
+    a callable, as the stdio transport does.
+    """
+
+    def __init__(self, send: Callable[[Dict[str, Any]], Any]) -> None:
+        """
+        Initialize the subscriber.
+
+        Args:
+            send: Sends a notification message to the client (may return an
+                awaitable)
+        """
+        self._send = send
+
+    async def _notify(self, method: str, params: Optional[Dict[str, Any]]) -> None:
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        result = self._send(message)
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def resource_updated(self, uri: str) -> None:
+        """Tell the client that a subscribed resource changed."""
+        await self._notify("notifications/resources/updated", {"uri": uri})
+
+    async def list_changed(self, kind: str) -> None:
+        """Tell the client that the tool, prompt or resource list changed."""
+        await self._notify(f"notifications/{kind}/list_changed", None)
+
+
+class SessionSubscriber(Subscriber):
+    """A subscriber wrapping an MCP SDK ``ServerSession``."""
+
+    def __init__(self, session: Any) -> None:
+        """
+        Initialize the subscriber.
+
+        Args:
+            session: The session (HTTP or SSE) to notify
+        """
+        self.session = session
+
+    async def resource_updated(self, uri: str) -> None:
+        await self.session.send_resource_updated(AnyUrl(uri))
+
+    async def list_changed(self, kind: str) -> None:
+        if kind == "tools":
+            await self.session.send_tool_list_changed()
+        elif kind == "prompts":
+            await self.session.send_prompt_list_changed()
+        else:
+            await self.session.send_resource_list_changed()
+
+
+class SubscriptionHub:
+    """
+    Tracks subscriptions and fans coalesced change notifications out to them.
+
+    The first change after a quiet period opens a window of ``window``
+    seconds; every change reported until it closes is folded into one
+    notification per URI and subscriber. Notifications are sent to all
+    subscribers concurrently, and a subscriber that fails or does not
+    accept a notification within ``send_timeout`` is dropped.
+    """
+
+    def __init__(
+        self, window: Optional[float] = None, send_timeout: Optional[float] = None
+    ) -> None:
+        """
+        Initialize the hub.
+
+        Args:
+            window: Seconds changes are collected before notifying (defaults
+                to config.subscription_window)
+            send_timeout: Seconds a subscriber has to accept a notification
+                (defaults to config.subscription_send_timeout)
+        """
+        self.window = config.subscription_window if window is None else window
+        self.send_timeout = (
+            config.subscription_send_timeout if send_timeout is None else send_timeout
+        )
+        self._subscriptions: Dict[str, Set[Subscriber]] = {}
+        # Sessions that listed tools, prompts or resources
+        self._listeners: "weakref.WeakSet[Subscriber]" = weakref.WeakSet()
+        self._changed: Set[str] = set()
+        self._lists_changed: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.changes = 0
+        self.notifications = 0
+
+    def subscribe(self, uri: str, subscriber: Subscriber) -> None:
+        """Notify a subscriber when a resource changes."""
+        self._subscriptions.setdefault(uri, set()).add(subscriber)
+
+    def unsubscribe(self, uri: str, subscriber: Subscriber) -> None:
+        """Stop notifying a subscriber about a resource."""
+        subscribers = self._subscriptions.get(uri)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscriptions[uri]
+
+    def listen(self, subscriber: Subscriber) -> None:
+        """Tell a subscriber when the tool, prompt or resource lists change."""
+        self._listeners.add(subscriber)
+
+    def remove(self, subscriber: Subscriber) -> None:
+        """Drop every subscription of a subscriber (e.g. a closed session)."""
+        for uri in [
+            uri for uri, subs in self._subscriptions.items() if subscriber in subs
+        ]:
+            self.unsubscribe(uri, subscriber)
+        self._listeners.discard(subscriber)
+
+    def uris(self) -> List[str]:
+        """Get the URIs that have subscribers."""
+        return list(self._subscriptions)
+
+    def subscribed(self, uri: str) -> bool:
+        """Whether anyone is subscribed to a resource."""
+        return uri in self._subscriptions
+
+    def changed(self, uri: str) -> None:
+        """
+        Report that a resource changed.
+
+        Must be called from the event loop. Changes to resources nobody is
+        subscribed to are ignored.
+
+        Args:
+            uri: URI of the resource
+        """
+        self.changes += 1
+        if uri in self._subscriptions:
+            self._changed.add(uri)
+            self._schedule()
+
+    def list_changed(self, kind: str) -> None:
+        """
+        Report that the tool, prompt or resource list changed.
+
+        Args:
+            kind: One of ``resources``, ``tools`` or ``prompts``
+        """
+        if kind not in LIST_KINDS:
+            raise ValueError(f"Unknown list: {kind}")
+        self.changes += 1
+        self._lists_changed.add(kind)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_later()
+            )
+
+    async def _flush_later(self) -> None:
+        try:
+            await asyncio.sleep(self.window)
+        finally:
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send pending notifications now rather than at the end of the window."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        changed, self._changed = self._changed, set()
+        lists, self._lists_changed = self._lists_changed, set()
+
+        # Group by subscriber so each gets its notifications in order
+        batches: Dict[Subscriber, List[Callable[[], Awaitable[None]]]] = {}
+        for uri in changed:
+            for subscriber in self._subscriptions.get(uri, ()):
+                batches.setdefault(subscriber, []).append(
+                    lambda s=subscriber, u=uri: s.resource_updated(u)
+                )
+        for kind in lists:
+            for subscriber in list(self._listeners):
+                batches.setdefault(subscriber, []).append(
+                    lambda s=subscriber, k=kind: s.list_changed(k)
+                )
+        if batches:
+            await asyncio.gather(
+                *(self._deliver(s, sends) for s, sends in batches.items())
+            )
+
+    async def _deliver(
+        self, subscriber: Subscriber, sends: List[Callable[[], Awaitable[None]]]
+    ) -> None:
+        try:
+            for send in sends:
+                await asyncio.wait_for(send(), timeout=self.send_timeout)
+                self.notifications += 1
+        except Exception as e:
+            logger.info(f"Dropping subscriber after failed notification: {e!r}")
+            self.remove(subscriber)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get subscription and notification counters."""
+        return {
+            "resources": len(self._subscriptions),
+            "subscriptions": sum(len(s) for s in self._subscriptions.values()),
+            "listeners": len(self._listeners),
+            "changes": self.changes,
+            "notifications": self.notifications,
+        }
+
+
+_hub: Optional[SubscriptionHub] = None
+
+
+def get_hub() -> SubscriptionHub:
+    """Get the subscription hub, creating it on first use."""
+    global _hub
+    if _hub is None:
+        _hub = SubscriptionHub()
+    return _hub
+
+
+# The subscriber standing for each session that subscribed or listened
+_session_subscribers: "weakref.WeakKeyDictionary[Any, SessionSubscriber]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def close_session(session: Any) -> None:
+    """
+    Drop the subscriptions of a session whose connection closed.
+
+    Sessions run by the SDK's ``Server.run`` are cleaned up when it returns;
+    transports that handle requests themselves call this instead.
+
+    Args:
+        session: The session passed to request handlers
+    """
+    subscriber = _session_subscribers.pop(session, None)
+    if subscriber is not None:
+        get_hub().remove(subscriber)
+
+
+def enable_subscriptions(server: Any) -> None:
+    """
+    Handle resource subscriptions on a FastMCP server's own transports.
+
+    Registers ``resources/subscribe`` and ``resources/unsubscribe``
+    handlers, records sessions that list tools, prompts or resources so
+    they hear about list changes, and advertises both in the server's
+    capabilities. Stateless HTTP has no session to notify, so
+    subscriptions need the stateful Streamable HTTP or SSE transports.
+    A session's subscriptions are dropped when its connection closes.
+
+    Args:
+        server: The FastMCP server
+    """
+    lowlevel = server._mcp_server
+    if getattr(lowlevel, "_subscriptions_enabled", False):
+        return
+    lowlevel._subscriptions_enabled = True
+
+    # Subscribers created by each connection, removed from the hub when its
+    # ``run`` returns; request handlers run in tasks that inherit the list.
+    created: "contextvars.ContextVar[Optional[List[SessionSubscriber]]]" = (
+        contextvars.ContextVar("subscribers", default=None)
+    )
+
+    def current() -> SessionSubscriber:
+        session = lowlevel.request_context.session
+        subscriber = _session_subscribers.get(session)
+        if subscriber is None:
+            subscriber = _session_subscribers[session] = SessionSubscriber(session)
+            connection = created.get()
+            if connection is not None:
+                connection.append(subscriber)
+        return subscriber
+
+    run = lowlevel.run
+
+    async def run_session(*args: Any, **kwargs: Any) -> Any:
+        token = created.set([])
+        try:
+            return await run(*args, **kwargs)
+        finally:
+            for subscriber in created.get() or ():
+                get_hub().remove(subscriber)
+            created.reset(token)
+
+    lowlevel.run = run_session
+
+    @lowlevel.subscribe_resource()
+    async def subscribe(uri: AnyUrl) -> None:
+        get_hub().subscribe(str(uri), current())
+
+    @lowlevel.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl) -> None:
+        get_hub().unsubscribe(str(uri), current())
+
+    for request_type in (
+        types.ListToolsRequest,
+        types.ListPromptsRequest,
+        types.ListResourcesRequest,
+    ):
+        handler = lowlevel.request_handlers.get(request_type)
+        if handler is None:
+            continue
+
+        async def listing_handler(request: Any, handler: Any = handler) -> Any:
+            try:
+                get_hub().listen(current())
+            except LookupError:
+                # Called outside a request, e.g. to warm the tool cache
+                pass
+            return await handler(request)
+
+        lowlevel.request_handlers[request_type] = listing_handler
+
+    get_capabilities = lowlevel.get_capabilities
+
+    def capabilities(
+        notification_options: NotificationOptions,
+        experimental_capabilities: Dict[str, Dict[str, Any]],
+    ) -> types.ServerCapabilities:
+        result = get_capabilities(
+            NotificationOptions(
+                prompts_changed=True, resources_changed=True, tools_changed=True
+            ),
+            experimental_capabilities,
+        )
+        if result.resources is not None:
+            result.resources.subscribe = True
+        return result
+
+    lowlevel.get_capabilities = capabilities
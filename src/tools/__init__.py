@@ -1,5 +1,12 @@
 """MCP Tools Package."""
 
-from src.tools.calculator import calculator_tool
+from src.tools.calculator import calculate, calculator_tool
+from src.tools.multi_call import register_multi_call
+from src.tools.result_pages import register_result_pages
 
-__all__ = ["calculator_tool"]
+__all__ = [
+    "calculate",
+    "calculator_tool",
+    "register_multi_call",
+    "register_result_pages",
+]
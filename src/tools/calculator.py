@@ -1,11 +1,287 @@
-"""Calculator tool for MCP server."""
+"""Calculator tools for MCP server."""
 
+import ast
+import functools
 import math
-from typing import Any, Dict, List, Optional, Union
+import operator
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from src.utils.memo import TTLCache, get_cache
 
 # Remove ToolDef import as it doesn't exist
 # from mcp.server.fastmcp import ToolDef
 
+# Longest expression accepted, and most syntax nodes it may contain
+MAX_EXPRESSION_LENGTH = 1000
+MAX_EXPRESSION_NODES = 200
+# Most rows evaluated in one call
+MAX_ROWS = 100_000
+# Compiled expressions kept, keyed by their text
+EXPRESSION_CACHE_SIZE = 512
+
+_BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPERATORS: Dict[type, Callable[[Any], Any]] = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+_CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+# Scalar implementations, and the (min, max) number of arguments of each
+_MATH_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "abs": abs,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "log2": math.log2,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    # math.floor, math.ceil and round return ints, which ** would raise to
+    # unbounded powers; keep every intermediate a float
+    "floor": lambda x: float(math.floor(x)),
+    "ceil": lambda x: float(math.ceil(x)),
+    "round": lambda x, digits=None: float(round(x, digits)),
+    "min": min,
+    "max": max,
+}
+_ARITY = {name: (1, 1) for name in _MATH_FUNCTIONS}
+_ARITY.update({"round": (1, 2), "min": (2, 32), "max": (2, 32)})
+
+# Sentinel for a NumPy import that has not been attempted yet
+_UNSET = object()
+_np: Any = _UNSET
+_numpy_functions: Optional[Dict[str, Callable[..., Any]]] = None
+_expressions: Optional[TTLCache] = None
+
+Evaluator = Callable[[Mapping[str, Any], Mapping[str, Callable[..., Any]]], Any]
+
+
+def _numpy() -> Any:
+    """Import NumPy on first use, or return None when it is not installed."""
+    global _np, _numpy_functions
+    if _np is _UNSET:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        if numpy is not None:
+            _numpy_functions = {
+                "abs": numpy.abs,
+                "sqrt": numpy.sqrt,
+                "exp": numpy.exp,
+                "log": numpy.log,
+                "log10": numpy.log10,
+                "log2": numpy.log2,
+                "sin": numpy.sin,
+                "cos": numpy.cos,
+                "tan": numpy.tan,
+                "floor": numpy.floor,
+                "ceil": numpy.ceil,
+                "round": numpy.round,
+                "min": lambda *args: functools.reduce(numpy.minimum, args),
+                "max": lambda *args: functools.reduce(numpy.maximum, args),
+            }
+        _np = numpy
+    return _np
+
+
+def _compile_node(node: ast.AST, variables: List[str]) -> Evaluator:
+    """
+    Compile a syntax node into a closure over (variables, functions).
+
+    The same closure runs over floats with the ``math`` functions or over
+    arrays with their NumPy equivalents. Names that are not constants or
+    functions are collected into ``variables``.
+    """
+    if isinstance(node, ast.Constant):
+        if type(node.value) not in (int, float):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        # Floats overflow instead of growing without bound like ints
+        constant = float(node.value)
+        return lambda env, fns: constant
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in _CONSTANTS:
+            value = _CONSTANTS[name]
+            return lambda env, fns: value
+        if name in _ARITY:
+            raise ValueError(f"{name} is a function; call it as {name}(...)")
+        if name not in variables:
+            variables.append(name)
+        return lambda env, fns: env[name]
+    if isinstance(node, ast.BinOp):
+        binary = _BINARY_OPERATORS.get(type(node.op))
+        if binary is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        left = _compile_node(node.left, variables)
+        right = _compile_node(node.right, variables)
+        return lambda env, fns: binary(left(env, fns), right(env, fns))
+    if isinstance(node, ast.UnaryOp):
+        unary = _UNARY_OPERATORS.get(type(node.op))
+        if unary is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = _compile_node(node.operand, variables)
+        return lambda env, fns: unary(operand(env, fns))
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in _ARITY:
+            raise ValueError(f"Unsupported function: {ast.unparse(node.func)}")
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported")
+        name = node.func.id
+        low, high = _ARITY[name]
+        if not low <= len(node.args) <= high:
+            expected = str(low) if low == high else f"{low} to {high}"
+            raise ValueError(f"{name} takes {expected} arguments")
+        if name == "round" and len(node.args) == 2:
+            digits = node.args[1]
+            if not (isinstance(digits, ast.Constant) and type(digits.value) is int):
+                raise ValueError("round digits must be an integer literal")
+            value = _compile_node(node.args[0], variables)
+            places = digits.value
+            return lambda env, fns: fns["round"](value(env, fns), places)
+        args = [_compile_node(arg, variables) for arg in node.args]
+        if len(args) == 1:
+            arg = args[0]
+            return lambda env, fns: fns[name](arg(env, fns))
+        return lambda env, fns: fns[name](*[arg(env, fns) for arg in args])
+    raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def _finite(value: Any) -> Optional[float]:
+    """Return a result as a float, or None if it is undefined or infinite."""
+    if isinstance(value, complex):
+        return None
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+class CompiledExpression:
+    """An arithmetic expression compiled once for repeated evaluation."""
+
+    def __init__(self, expression: str) -> None:
+        """
+        Parse and compile an expression.
+
+        Only numbers, variables, ``+ - * / // % **``, parentheses, the
+        constants ``pi``, ``e`` and ``tau`` and a fixed set of math
+        functions are accepted, so no other code can be reached.
+
+        Args:
+            expression: Expression text, e.g. ``price * qty * (1 + tax)``
+
+        Raises:
+            ValueError: If the expression is too long or uses unsupported
+                syntax
+        """
+        if len(expression) > MAX_EXPRESSION_LENGTH:
+            raise ValueError(
+                f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters"
+            )
+        try:
+            tree = ast.parse(expression.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression: {e.msg}") from None
+        if sum(1 for _ in ast.walk(tree)) > MAX_EXPRESSION_NODES:
+            raise ValueError("Expression is too complex")
+        self.expression = expression
+        variables: List[str] = []
+        self._evaluate = _compile_node(tree.body, variables)
+        self.variables = tuple(variables)
+
+    def __call__(self, values: Mapping[str, float]) -> Optional[float]:
+        """
+        Evaluate the expression for one set of values.
+
+        Args:
+            values: A value for every variable
+
+        Returns:
+            The result, or None if it is undefined (e.g. division by zero)
+        """
+        self._check(values)
+        try:
+            return _finite(self._evaluate(values, _MATH_FUNCTIONS))
+        except (ArithmeticError, ValueError):
+            return None
+
+    def evaluate_many(
+        self, columns: Mapping[str, Union[float, List[float]]], rows: int
+    ) -> List[Optional[float]]:
+        """
+        Evaluate the expression over columns of values.
+
+        With NumPy installed the whole column set is evaluated in one
+        vectorized pass; otherwise each row is evaluated in turn.
+
+        Args:
+            columns: For every variable, a list of ``rows`` values or a
+                single value shared by every row
+            rows: Number of rows
+
+        Returns:
+            One result per row, None where it is undefined
+        """
+        self._check(columns)
+        np = _numpy()
+        if np is None:
+            return [
+                self(
+                    {
+                        name: value[row] if isinstance(value, list) else value
+                        for name, value in columns.items()
+                    }
+                )
+                for row in range(rows)
+            ]
+        arrays = {
+            name: np.asarray(value, dtype=np.float64) for name, value in columns.items()
+        }
+        with np.errstate(all="ignore"):
+            result = self._evaluate(arrays, _numpy_functions)
+            result = np.broadcast_to(np.asarray(result, dtype=np.float64), (rows,))
+        finite = np.isfinite(result)
+        values = result.tolist()
+        if finite.all():
+            return values
+        return [v if ok else None for v, ok in zip(values, finite.tolist())]
+
+    def _check(self, values: Mapping[str, Any]) -> None:
+        missing = [name for name in self.variables if name not in values]
+        if missing:
+            raise ValueError(f"No value for {', '.join(missing)}")
+
+
+def compile_expression(expression: str) -> CompiledExpression:
+    """
+    Get the compiled form of an expression, compiling it on first use.
+
+    Compiled expressions are kept in an LRU cache keyed by their text,
+    reported as ``calculator:expressions`` in the cache stats.
+
+    Args:
+        expression: Expression text
+
+    Returns:
+        The compiled expression
+    """
+    global _expressions
+    if _expressions is None:
+        _expressions = get_cache("calculator:expressions", EXPRESSION_CACHE_SIZE)
+    compiled = _expressions.get(expression)
+    if not isinstance(compiled, CompiledExpression):
+        compiled = CompiledExpression(expression)
+        _expressions.set(expression, compiled)
+    return compiled
+
 
 # Simple function-based tool to be registered with @server.tool() decorator
 def calculator_add(a: float, b: float) -> Dict[str, Any]:
@@ -26,5 +302,56 @@ def calculator_add(a: float, b: float) -> Dict[str, Any]:
     }
 
 
+def calculate(
+    expression: str,
+    variables: Optional[Dict[str, Union[float, List[float]]]] = None,
+    batch: Optional[List[Dict[str, float]]] = None,
+) -> Dict[str, Any]:
+    """Evaluate an arithmetic expression once, or over many rows in one call.
+
+    Supports + - * / // % **, parentheses, pi, e, tau and the functions abs,
+    sqrt, exp, log, log10, log2, sin, cos, tan, floor, ceil, round(x[, digits]),
+    min and max. Results that are undefined (division by zero, log of a
+    negative number) are null.
+
+    Args:
+        expression: Expression over named variables, e.g. "price * qty * 1.2"
+        variables: Variable values; a list gives one value per row
+        batch: Rows of variable values, evaluated together; values missing
+            from a row are taken from variables
+
+    Returns:
+        Dictionary with the result, or with one result per row and the count
+    """
+    compiled = compile_expression(expression)
+    variables = variables or {}
+    lengths = {len(v) for v in variables.values() if isinstance(v, list)}
+    if batch is None and not lengths:
+        return {"expression": expression, "result": compiled(variables)}
+
+    if batch is not None:
+        lengths.add(len(batch))
+    if len(lengths) > 1:
+        raise ValueError("Variable lists and batch must have the same length")
+    rows = lengths.pop()
+    if rows > MAX_ROWS:
+        raise ValueError(f"{rows} rows exceed the limit of {MAX_ROWS}")
+    columns: Dict[str, Union[float, List[float]]] = dict(variables)
+    if batch is not None:
+        for name in compiled.variables:
+            if all(name in row for row in batch):
+                columns[name] = [row[name] for row in batch]
+            elif any(name in row for row in batch):
+                if name not in variables:
+                    raise ValueError(f"Some rows have no value for {name}")
+                default = variables[name]
+                columns[name] = [
+                    row.get(name, default[i] if isinstance(default, list) else default)
+                    for i, row in enumerate(batch)
+                ]
+    results = compiled.evaluate_many(columns, rows)
+    return {"expression": expression, "results": results, "count": rows}
+
+
 # Export the calculator function for registration
 calculator_tool = calculator_add
@@ -0,0 +1,34 @@
+"""Bulk ingestion tools."""
+
+from typing import Any, Dict, List
+
+from mcp import tool
+
+
+@tool()
+async def ingest_documents(
+    context: Dict[str, Any],
+    collection: str,
+    documents: List[Dict[str, Any]],
+    mode: str = "upsert",
+    defer_indexes: bool = False,
+) -> Dict[str, Any]:
+    """
+    Bulk load documents into a searchable collection.
+
+    Documents are embedded in batches (when an embedding model is
+    registered) and written with binary COPY in large transactions.
+
+    Args:
+        context: The context containing ingestion capabilities
+        collection: Name of the collection to load into
+        documents: Documents mapping column names to values
+        mode: "upsert" to update existing keys, "copy" to append only
+        defer_indexes: Rebuild secondary indexes once at the end when the
+            collection starts out empty
+
+    Returns:
+        Dictionary containing rows written and throughput
+    """
+    ingest = context["database_search"]["ingest"]
+    return await ingest(collection, documents, mode=mode, defer_indexes=defer_indexes)
@@ -0,0 +1,125 @@
+"""A meta-tool that runs many tool calls concurrently in one request."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from mcp import types
+from mcp.shared.exceptions import McpError
+from pydantic import BaseModel, Field
+
+from src.config import config
+
+MULTI_CALL = "multi_call"
+
+
+class ToolCall(BaseModel):
+    """One tool invocation inside a ``multi_call``."""
+
+    name: str = Field(..., description="Name of the tool to call")
+    arguments: Dict[str, Any] = Field(
+        default_factory=dict, description="Arguments for the tool"
+    )
+
+
+class MultiCallResult(BaseModel):
+    """Outcome of a ``multi_call``."""
+
+    results: List[Dict[str, Any]] = Field(
+        ..., description="One result per call, in request order"
+    )
+    succeeded: int = Field(..., description="Calls that returned a result")
+    failed: int = Field(..., description="Calls that returned an error")
+
+
+def _dump(block: Any) -> Any:
+    if hasattr(block, "model_dump"):
+        return block.model_dump(mode="json", by_alias=True, exclude_none=True)
+    return block
+
+
+def _error(code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    error: Dict[str, Any] = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"ok": False, "error": error}
+
+
+async def _run(server: Any, call: ToolCall) -> Dict[str, Any]:
+    """Run one call, turning its outcome into a per-item result."""
+    if call.name == MULTI_CALL:
+        return _error(types.INVALID_PARAMS, f"{MULTI_CALL} cannot be nested")
+    if server._tool_manager.get_tool(call.name) is None:
+        return _error(types.INVALID_PARAMS, f"Unknown tool: {call.name}")
+    try:
+        result = await server.call_tool(call.name, call.arguments)
+    except McpError as e:
+        return _error(e.error.code, e.error.message, e.error.data)
+    except Exception as e:
+        if isinstance(e.__cause__, McpError):
+            # Protocol errors raised inside the tool, such as load shedding
+            error = e.__cause__.error
+            return _error(error.code, error.message, error.data)
+        return _error(types.INTERNAL_ERROR, str(e))
+    structured = None
+    if isinstance(result, tuple):
+        content, structured = result
+    elif isinstance(result, dict):
+        content, structured = [], result
+    else:
+        content = result
+    item: Dict[str, Any] = {"ok": True, "content": [_dump(block) for block in content]}
+    if structured is not None:
+        item["structuredContent"] = structured
+    return item
+
+
+def register_multi_call(
+    server: Any,
+    max_concurrency: Optional[int] = None,
+    max_items: Optional[int] = None,
+) -> None:
+    """
+    Register the ``multi_call`` tool on a server.
+
+    ``multi_call`` takes a list of tool calls and runs them concurrently,
+    returning one result per call in the same order. A failing call does
+    not fail the others: its result carries ``ok: false`` and a JSON-RPC
+    style error instead of content. Nested calls see the same request
+    context, priority and deadlines as ``multi_call`` itself.
+
+    Args:
+        server: The FastMCP server to register the tool with
+        max_concurrency: Most calls run at once, whatever a caller asks for
+            (defaults to config.batch_max_concurrency)
+        max_items: Most calls accepted in one invocation (defaults to
+            config.batch_max_items)
+    """
+    cap = max_concurrency or config.batch_max_concurrency
+    limit = max_items or config.batch_max_items
+
+    @server.tool(name=MULTI_CALL)
+    async def multi_call(
+        calls: List[ToolCall], max_concurrency: Optional[int] = None
+    ) -> MultiCallResult:
+        """Run several tool calls concurrently and return one result per call.
+
+        Args:
+            calls: Tool calls to run, each with a name and arguments
+            max_concurrency: Most calls to run at once (capped by the server)
+
+        Returns:
+            Per-call results in request order, with success and failure counts
+        """
+        if len(calls) > limit:
+            raise ValueError(f"{len(calls)} calls exceed the limit of {limit}")
+        slots = asyncio.Semaphore(max(1, min(max_concurrency or cap, cap)))
+
+        async def run(call: ToolCall) -> Dict[str, Any]:
+            async with slots:
+                return {"name": call.name, **await _run(server, call)}
+
+        results = await asyncio.gather(*(run(call) for call in calls))
+        succeeded = sum(1 for result in results if result["ok"])
+        return MultiCallResult(
+            results=results, succeeded=succeeded, failed=len(results) - succeeded
+        )
@@ -0,0 +1,61 @@
+"""A tool that serves further pages of large tool results."""
+
+from typing import Any, Optional
+
+from mcp import types
+
+from src.config import config
+from src.utils.codec import dumps
+from src.utils.spill import (
+    RESULT_PAGE,
+    SpillStore,
+    get_spill_store,
+    spill_large_results,
+)
+
+FETCH_RESULT_PAGE = "fetch_result_page"
+
+
+def register_result_pages(server: Any, store: Optional[SpillStore] = None) -> None:
+    """
+    Page large tool results and register the ``fetch_result_page`` tool.
+
+    Every tool result holding a long list is sent as its first page with a
+    ``result_page`` entry: the ``handle``, the ``field`` holding the list
+    (null when the result is the list), the ``total`` number of items and
+    the ``next_offset``. ``fetch_result_page`` returns the items from any
+    offset until the handle expires.
+
+    Args:
+        server: The FastMCP server
+        store: Where results are stored (defaults to the shared store)
+    """
+    spill_large_results(server, store)
+
+    @server.tool(name=FETCH_RESULT_PAGE, structured_output=False)
+    async def fetch_result_page(
+        handle: str, offset: int = 0, limit: Optional[int] = None
+    ) -> types.CallToolResult:
+        """Fetch more items of a large tool result.
+
+        Args:
+            handle: result_page.handle from the tool result
+            offset: Index of the first item (result_page.next_offset)
+            limit: Most items to return (capped by the server)
+
+        Returns:
+            The items and a result_page entry with the next_offset (null
+            after the last page)
+        """
+        page_items = config.result_page_items
+        limit = max(1, min(limit or page_items, page_items))
+        spill = store or get_spill_store()
+        items, total, next_offset = await spill.page(handle, offset, limit)
+        page = {"handle": handle, "total": total, "next_offset": next_offset}
+        # The stored items are already JSON; splice them in rather than
+        # decoding and encoding them again
+        text = b'{"items":' + items + b',"' + RESULT_PAGE.encode() + b'":'
+        text += dumps(page) + b"}"
+        return types.CallToolResult(
+            content=[types.TextContent(type="text", text=text.decode("utf-8"))]
+        )
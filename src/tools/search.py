@@ -1,15 +1,18 @@
 """Database search tools."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from mcp import tool
 
+from src.database.embeddings import get_embedding
+
 
 @tool()
 async def search_database(
     context: Dict[str, Any],
     collection: str,
     query: str,
-    limit: int = 10
+    limit: int = 10,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Search the database using text-based search.
@@ -18,14 +21,15 @@ async def search_database(
         context: The context containing search capabilities
         collection: Name of the collection to search
         query: Search query text
-        limit: Maximum number of results to return
+        limit: Maximum number of results per page (capped by the server)
+        cursor: next_cursor from a previous page to continue the search
         
     Returns:
-        Dictionary containing search results
+        Dictionary containing search results and the next_cursor for the
+        following page (null on the last page)
     """
     search = context["database_search"]["search"]
-    results = await search["text_search"](collection, query, limit)
-    return {"results": results}
+    return await search["text_search"](collection, query, limit, cursor)
 
 
 @tool()
@@ -33,7 +37,8 @@ async def semantic_search(
     context: Dict[str, Any],
     collection: str,
     query: str,
-    limit: int = 10
+    limit: int = 10,
+    cursor: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Search the database using semantic vector search.
@@ -42,16 +47,19 @@ async def semantic_search(
         context: The context containing search capabilities
         collection: Name of the collection to search
         query: Natural language query to convert to embedding
-        limit: Maximum number of results to return
+        limit: Maximum number of results per page (capped by the server)
+        cursor: next_cursor from a previous page to continue the search
         
     Returns:
-        Dictionary containing search results with similarity scores
+        Dictionary containing search results with similarity scores and the
+        next_cursor for the following page (null on the last page)
     """
     # This would require integration with an embedding model
-    embedding = await get_embedding(query)  # You'd need to implement this
+    embedding = await get_embedding(query)  # Uses the registered embedder
     search = context["database_search"]["search"]
-    results = await search["vector_search"](collection, embedding, limit)
-    return {"results": results}
+    return await search["vector_search"](
+        collection, embedding, limit, cursor=cursor
+    )
 
 
 @tool()
@@ -66,4 +74,17 @@ async def list_searchable_collections(
     """
     search = context["database_search"]["search"]
     collections = await search["metadata"]()
-    return {"collections": collections} 
\ No newline at end of file
+    return {"collections": collections} 
+
+@tool()
+async def database_pool_stats(
+    context: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Report connection pool usage for the primary and read replicas.
+    
+    Returns:
+        Dictionary containing checked-out, overflow and checkout wait
+        statistics per pool, plus replica health
+    """
+    return context["database_search"]["pool_stats"]()
@@ -0,0 +1,14 @@
+"""Transports for serving the MCP server."""
+
+from src.transport.dispatch import JSONRPCDispatcher
+from src.transport.http import build_http_app
+from src.transport.stdio import StdioTransport, serve_stdio
+from src.transport.workers import serve_workers
+
+__all__ = [
+    "JSONRPCDispatcher",
+    "StdioTransport",
+    "build_http_app",
+    "serve_stdio",
+    "serve_workers",
+]
@@ -0,0 +1,368 @@
+"""Session affinity across worker processes.
+
+An SSE session lives in the worker process that accepted its ``GET /sse``
+stream, and a stateful Streamable HTTP session in the worker that answered
+its ``initialize``, but later requests for the session (``POST
+/messages/?session_id=...``, or any request to ``/mcp`` carrying its
+``mcp-session-id`` header) can be accepted by any worker sharing the
+listening socket. Each worker records the sessions it owns in a registry
+directory shared by all workers and listens on a Unix socket; a worker that
+receives a request for a session it does not own forwards it to the owner
+over that socket and streams the response back.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs
+
+logger = logging.getLogger(__name__)
+
+_SESSION_ID = re.compile(rb"session_id=([0-9a-fA-F]+)")
+_SESSION_HEADER = b"mcp-session-id"
+# Session ids the SDK issues; anything else is left to the app to reject
+_VALID_SESSION_ID = re.compile(r"[0-9a-fA-F-]{1,64}")
+
+Scope = Dict[str, Any]
+
+
+class SessionRegistry:
+    """Maps session ids to the Unix socket of the worker that owns them."""
+
+    def __init__(self, directory: str, worker_id: str) -> None:
+        """
+        Initialize the registry for one worker.
+
+        Args:
+            directory: Directory shared by every worker process
+            worker_id: Unique id of this worker (usually its pid)
+        """
+        self.directory = directory
+        self.socket_path = os.path.join(directory, f"worker-{worker_id}.sock")
+
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self.directory, f"session-{session_id}")
+
+    def claim(self, session_id: str) -> None:
+        """Record this worker as the owner of a session."""
+        path = self._path(session_id)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as handle:
+            handle.write(self.socket_path)
+        os.replace(temporary, path)
+
+    def release(self, session_id: str) -> None:
+        """Forget a session owned by this worker."""
+        try:
+            os.unlink(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def owner(self, session_id: str) -> Optional[str]:
+        """
+        Return the socket path of the worker owning a session, if any.
+
+        An entry whose worker socket is gone was left by a worker that
+        exited without cleaning up; it is removed and None is returned.
+        """
+        try:
+            with open(self._path(session_id)) as handle:
+                socket_path = handle.read()
+        except FileNotFoundError:
+            return None
+        if not os.path.exists(socket_path):
+            self.release(session_id)
+            return None
+        return socket_path
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Tuple[Dict[str, Any], bytes]:
+    header = json.loads(await reader.readline())
+    body = await reader.readexactly(header.pop("length"))
+    return header, body
+
+
+def _write_frame(
+    writer: asyncio.StreamWriter, header: Dict[str, Any], body: bytes
+) -> None:
+    writer.write(json.dumps({**header, "length": len(body)}).encode() + b"\n" + body)
+
+
+def _session_header(headers: Any) -> Optional[str]:
+    """Get a valid ``mcp-session-id`` from ASGI headers, if there is one."""
+    for name, value in headers:
+        if name.lower() == _SESSION_HEADER:
+            session_id = value.decode("latin-1")
+            if _VALID_SESSION_ID.fullmatch(session_id):
+                return session_id
+    return None
+
+
+class SessionAffinityMiddleware:
+    """ASGI middleware that pins sessions to the worker that owns them."""
+
+    def __init__(
+        self,
+        app: Any,
+        registry: SessionRegistry,
+        sse_path: str = "/sse",
+        message_path: str = "/messages/",
+        streamable_path: str = "/mcp",
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped ASGI application
+            registry: Registry shared between the worker processes
+            sse_path: Path of the SSE stream endpoint
+            message_path: Path clients post session messages to
+            streamable_path: Path of the Streamable HTTP endpoint
+        """
+        self.app = app
+        self.registry = registry
+        self.sse_path = sse_path
+        self.message_path = message_path
+        self.streamable_path = streamable_path
+        self._local: Set[str] = set()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """Listen for requests forwarded by other workers."""
+        if os.path.exists(self.registry.socket_path):
+            os.unlink(self.registry.socket_path)
+        self._server = await asyncio.start_unix_server(
+            self._accept_forwarded, path=self.registry.socket_path
+        )
+
+    async def stop(self) -> None:
+        """Stop listening and release every session this worker owns."""
+        for session_id in list(self._local):
+            self.registry.release(session_id)
+        self._local.clear()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.registry.socket_path):
+            os.unlink(self.registry.socket_path)
+
+    async def __call__(self, scope: Scope, receive: Any, send: Any) -> None:
+        """Route a request, forwarding session requests to their owner."""
+        if scope["type"] == "http":
+            path = scope["path"]
+            if scope["method"] == "GET" and path == self.sse_path:
+                await self._serve_stream(scope, receive, send)
+                return
+            session_id: Optional[str] = None
+            if scope["method"] == "POST" and path == self.message_path:
+                session_id = parse_qs(scope["query_string"].decode()).get(
+                    "session_id", [""]
+                )[0]
+            elif path == self.streamable_path:
+                session_id = _session_header(scope["headers"])
+            if session_id and session_id not in self._local:
+                owner = self.registry.owner(session_id)
+                if owner is not None and owner != self.registry.socket_path:
+                    await self._forward(owner, session_id, scope, receive, send)
+                    return
+        await self._serve_local(scope, receive, send)
+
+    async def _serve_local(self, scope: Scope, receive: Any, send: Any) -> None:
+        """Serve a request in this worker."""
+        if scope["type"] == "http" and scope["path"] == self.streamable_path:
+            await self._serve_streamable(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _serve_stream(self, scope: Scope, receive: Any, send: Any) -> None:
+        """Serve an SSE stream, claiming its session id once announced."""
+        session_id: Optional[str] = None
+
+        async def send_and_claim(message: Dict[str, Any]) -> None:
+            nonlocal session_id
+            if session_id is None and message["type"] == "http.response.body":
+                match = _SESSION_ID.search(message.get("body", b""))
+                if match:
+                    session_id = match.group(1).decode()
+                    self._local.add(session_id)
+                    self.registry.claim(session_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_claim)
+        finally:
+            if session_id is not None:
+                self._local.discard(session_id)
+                self.registry.release(session_id)
+
+    async def _serve_streamable(self, scope: Scope, receive: Any, send: Any) -> None:
+        """
+        Serve a Streamable HTTP request, tracking the sessions it opens.
+
+        A response carrying a new ``mcp-session-id`` claims that session
+        for this worker; a successful ``DELETE`` releases it.
+        """
+        requested = _session_header(scope["headers"])
+
+        async def send_and_claim(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                session_id = _session_header(message.get("headers", []))
+                if session_id is not None and session_id not in self._local:
+                    self._local.add(session_id)
+                    self.registry.claim(session_id)
+                if (
+                    scope["method"] == "DELETE"
+                    and requested in self._local
+                    and message["status"] < 300
+                ):
+                    self._local.discard(requested)
+                    self.registry.release(requested)
+            await send(message)
+
+        await self.app(scope, receive, send_and_claim)
+
+    async def _forward(
+        self, owner: str, session_id: str, scope: Scope, receive: Any, send: Any
+    ) -> None:
+        """
+        Relay a session request to the worker that owns the session.
+
+        The response is streamed back as the owner sends it, so long-lived
+        streams (such as a Streamable HTTP ``GET``) work through a forward.
+        When the client goes away the connection to the owner is closed,
+        which the owner's app sees as a disconnect.
+        """
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        header = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "query_string": scope["query_string"].decode("latin-1"),
+            "headers": [
+                [name.decode("latin-1"), value.decode("latin-1")]
+                for name, value in scope["headers"]
+            ],
+        }
+        try:
+            reader, writer = await asyncio.open_unix_connection(owner)
+        except OSError:
+            # The owner exited without cleaning up; the session is gone
+            self.registry.release(session_id)
+            await self._respond(send, 404, b"Could not find session")
+            return
+
+        async def close_on_disconnect() -> None:
+            # Once the body is read, the next message is the disconnect
+            if (await receive())["type"] == "http.disconnect":
+                writer.close()
+
+        watcher = asyncio.create_task(close_on_disconnect())
+        started = finished = False
+        try:
+            _write_frame(writer, header, b"".join(chunks))
+            await writer.drain()
+            while not finished:
+                frame, body = await _read_frame(reader)
+                if "status" in frame:
+                    await send(
+                        {
+                            "type": "http.response.start",
+                            "status": frame["status"],
+                            "headers": [
+                                (name.encode("latin-1"), value.encode("latin-1"))
+                                for name, value in frame["headers"]
+                            ],
+                        }
+                    )
+                    started = True
+                else:
+                    finished = not frame["more_body"]
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": body,
+                            "more_body": not finished,
+                        }
+                    )
+        except (OSError, ValueError, asyncio.IncompleteReadError) as e:
+            # The owner closed the connection, or our client went away
+            logger.debug(f"Forwarding to {owner} ended: {e!r}")
+        finally:
+            watcher.cancel()
+            writer.close()
+        if not started:
+            await self._respond(send, 502, b"Session owner did not respond")
+        elif not finished:
+            await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def _respond(send: Any, status: int, body: bytes) -> None:
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _accept_forwarded(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve a session request forwarded by another worker."""
+        try:
+            header, body = await _read_frame(reader)
+            path = header["path"]
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": header["method"],
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "root_path": "",
+                "query_string": header["query_string"].encode("latin-1"),
+                "headers": [
+                    (name.encode("latin-1"), value.encode("latin-1"))
+                    for name, value in header["headers"]
+                ],
+                "client": None,
+                "server": None,
+            }
+            delivered = False
+
+            async def receive() -> Dict[str, Any]:
+                nonlocal delivered
+                if not delivered:
+                    delivered = True
+                    return {"type": "http.request", "body": body, "more_body": False}
+                # The forwarding worker closes the connection when its
+                # client disconnects
+                await reader.read()
+                return {"type": "http.disconnect"}
+
+            async def send(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    frame = {
+                        "status": message["status"],
+                        "headers": [
+                            [name.decode("latin-1"), value.decode("latin-1")]
+                            for name, value in message.get("headers", [])
+                        ],
+                    }
+                    _write_frame(writer, frame, b"")
+                elif message["type"] == "http.response.body":
+                    more_body = message.get("more_body", False)
+                    _write_frame(
+                        writer, {"more_body": more_body}, message.get("body", b"")
+                    )
+                await writer.drain()
+
+            await self._serve_local(scope, receive, send)
+        except Exception as e:
+            logger.error(f"Failed to handle forwarded session request: {e}")
+        finally:
+            writer.close()
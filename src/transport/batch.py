@@ -0,0 +1,230 @@
+"""JSON-RPC batch support for the Streamable HTTP endpoint.
+
+The SDK's Streamable HTTP transport accepts one JSON-RPC message per POST.
+``BatchMiddleware`` sits in front of it: a POST whose body is a JSON array
+is split into one sub-request per item, the sub-requests are replayed
+concurrently against the wrapped app (with the client's headers, so they
+share its session), and their responses are returned together as a JSON
+array.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from mcp import types
+
+from src.utils.codec import dumps, loads
+
+from .dispatch import error_response
+
+Scope = Dict[str, Any]
+Headers = List[Tuple[bytes, bytes]]
+
+
+def _parse_messages(content_type: bytes, body: bytes) -> List[Any]:
+    """Decode the JSON-RPC messages of a JSON or SSE sub-response."""
+    if content_type.startswith(b"text/event-stream"):
+        messages = []
+        for event in body.replace(b"\r\n", b"\n").split(b"\n\n"):
+            data = b"\n".join(
+                line[5:].lstrip(b" ")
+                for line in event.split(b"\n")
+                if line.startswith(b"data:")
+            )
+            if data:
+                messages.append(loads(data))
+        return messages
+    message = loads(body)
+    return message if isinstance(message, list) else [message]
+
+
+class BatchMiddleware:
+    """
+    ASGI middleware answering JSON-RPC batch arrays on one endpoint.
+
+    Only the final response to each item is returned; progress and log
+    notifications the server streams while an item runs are dropped, since
+    a batch is answered with a single JSON document. Non-array bodies and
+    other routes pass straight through.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        path: str = "/mcp",
+        max_concurrency: int = 8,
+        max_items: int = 100,
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The ASGI app serving Streamable HTTP
+            path: Path of the Streamable HTTP endpoint
+            max_concurrency: Items of one batch handled at the same time
+            max_items: Largest batch accepted
+        """
+        self.app = app
+        self.path = path
+        self.max_concurrency = max_concurrency
+        self.max_items = max_items
+
+    async def __call__(self, scope: Scope, receive: Any, send: Any) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] != self.path
+        ):
+            await self.app(scope, receive, send)
+            return
+        body = await self._read_body(receive)
+        messages = None
+        if body.lstrip()[:1] == b"[":
+            try:
+                messages = loads(body)
+            except ValueError:
+                pass
+        if not isinstance(messages, list):
+            await self.app(scope, self._replay(body, receive), send)
+            return
+        if not messages or len(messages) > self.max_items:
+            message = (
+                "Invalid Request"
+                if not messages
+                else f"Batch of {len(messages)} exceeds the limit of "
+                f"{self.max_items} messages"
+            )
+            await self._respond(
+                send,
+                400,
+                dumps(error_response(None, types.INVALID_REQUEST, message)),
+                [],
+            )
+            return
+
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def handle(item: Any) -> Tuple[List[Any], Headers]:
+            async with slots:
+                return await self._call(scope, item)
+
+        results = await asyncio.gather(*(handle(item) for item in messages))
+        responses = [response for items, _ in results for response in items]
+        # Pass on the session id when the batch opened a session
+        extra = next((headers for _, headers in results if headers), [])
+        if not responses:
+            await self._respond(send, 202, b"", extra)
+        else:
+            await self._respond(send, 200, dumps(responses), extra)
+
+    @staticmethod
+    async def _read_body(receive: Any) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes, receive: Any) -> Any:
+        """Build a receive callable that yields an already read body."""
+        sent = False
+
+        async def replay() -> Dict[str, Any]:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    async def _call(self, scope: Scope, item: Any) -> Tuple[List[Any], Headers]:
+        """
+        Replay one batch item as its own request.
+
+        Returns:
+            The item's JSON-RPC responses and any session id header
+        """
+        body = dumps(item)
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name != b"content-length"
+        ]
+        headers.append((b"content-length", str(len(body)).encode("ascii")))
+        request_id = item.get("id") if isinstance(item, dict) else None
+        response: Dict[str, Any] = {"status": 500, "headers": [], "body": []}
+        done = asyncio.Event()
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal body
+            if body is not None:
+                chunk, body = body, None
+                return {"type": "http.request", "body": chunk, "more_body": False}
+            # The batch answers in one piece, so the sub-request's client
+            # only disconnects once its response is complete
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        try:
+            await self.app(dict(scope, headers=headers), receive, send)
+        finally:
+            done.set()
+
+        content_type = b""
+        extra: Headers = []
+        for name, value in response["headers"]:
+            name = name.lower()
+            if name == b"content-type":
+                content_type = value
+            elif name == b"mcp-session-id":
+                extra.append((name, value))
+        payload = b"".join(response["body"])
+        if not payload.strip():
+            if request_id is not None and response["status"] != 202:
+                error = f"HTTP {response['status']} with no response"
+                return [error_response(request_id, types.INTERNAL_ERROR, error)], extra
+            return [], extra
+        try:
+            received = _parse_messages(content_type, payload)
+        except ValueError:
+            received = None
+        if received is None or (response["status"] >= 400 and not received):
+            # A plain-text transport error, e.g. a missing session
+            text = payload.decode("utf-8", "replace")
+            return [error_response(request_id, types.INTERNAL_ERROR, text)], extra
+        return [
+            message
+            for message in received
+            if isinstance(message, dict)
+            and "method" not in message
+            and ("result" in message or "error" in message)
+        ], extra
+
+    @staticmethod
+    async def _respond(send: Any, status: int, body: bytes, headers: Headers) -> None:
+        response_headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            *headers,
+        ]
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": response_headers,
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
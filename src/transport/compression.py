@@ -0,0 +1,262 @@
+"""Response compression negotiated from the client's Accept-Encoding.
+
+gzip is always available; brotli (``br``) and zstd are offered when the
+``brotli`` and ``zstandard`` packages are installed (the ``compression``
+extra). Streamed responses such as SSE are compressed message by message
+with a flush after each, so events reach the client as soon as they are
+sent.
+"""
+
+import asyncio
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.execution import get_thread_pool
+
+Headers = List[Tuple[bytes, bytes]]
+
+# Content types worth compressing
+_COMPRESSIBLE = (b"application/json", b"text/", b"application/x-ndjson")
+# Chunks larger than this are compressed in the thread pool
+_OFFLOAD_SIZE = 64 * 1024
+
+
+class _Gzip:
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        mode = zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+class _Brotli:
+    def __init__(self) -> None:
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=4)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class _Zstd:
+    def __init__(self) -> None:
+        import zstandard
+
+        self._zstd = zstandard
+        self._compressor = zstandard.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        mode = (
+            self._zstd.COMPRESSOBJ_FLUSH_FINISH
+            if final
+            else self._zstd.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        return self._compressor.compress(data) + self._compressor.flush(mode)
+
+
+def available_encodings() -> Dict[str, Callable[[], Any]]:
+    """Get the installed encodings, most preferred first."""
+    encodings: Dict[str, Callable[[], Any]] = {}
+    try:
+        import zstandard  # noqa: F401
+
+        encodings["zstd"] = _Zstd
+    except ImportError:
+        pass
+    try:
+        import brotli  # noqa: F401
+
+        encodings["br"] = _Brotli
+    except ImportError:
+        pass
+    encodings["gzip"] = _Gzip
+    return encodings
+
+
+def _with_vary(headers: Headers) -> Headers:
+    """Add Accept-Encoding to a response's Vary header."""
+    for index, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            fields = [field.strip().lower() for field in value.split(b",")]
+            if b"*" in fields or b"accept-encoding" in fields:
+                return headers
+            headers = list(headers)
+            headers[index] = (name, value + b", Accept-Encoding")
+            return headers
+    return [*headers, (b"vary", b"Accept-Encoding")]
+
+
+def negotiate(accept_encoding: str, encodings: List[str]) -> Optional[str]:
+    """
+    Pick the encoding to use for a response.
+
+    Args:
+        accept_encoding: The request's Accept-Encoding header
+        encodings: Encodings the server offers, most preferred first
+
+    Returns:
+        The server's most preferred encoding the client accepts with a
+        non-zero quality, or None
+    """
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    for encoding in encodings:
+        if accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing JSON, text and SSE responses.
+
+    Complete responses smaller than ``minimum_size`` are sent as they are.
+    Responses that already have a Content-Encoding pass through. Responses
+    of compressible types carry ``Vary: Accept-Encoding`` whether or not
+    they were compressed, so caches never serve one client's encoding to
+    another.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        minimum_size: int = 1024,
+        encodings: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The ASGI app whose responses are compressed
+            minimum_size: Smallest complete response body compressed
+            encodings: Encodings to offer, most preferred first (defaults to
+                every installed one)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        installed = available_encodings()
+        self.encodings = {
+            name: installed[name]
+            for name in (encodings or list(installed))
+            if name in installed
+        }
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = b""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value
+                break
+        encoding = negotiate(accept.decode("latin-1"), list(self.encodings))
+        responder = _CompressingSend(
+            send,
+            encoding,
+            None if encoding is None else self.encodings[encoding],
+            self.minimum_size,
+        )
+        await self.app(scope, receive, responder)
+
+
+class _CompressingSend:
+    """Compresses the response passed through one ``send`` callable."""
+
+    def __init__(
+        self,
+        send: Any,
+        encoding: Optional[str],
+        factory: Optional[Callable[[], Any]],
+        minimum_size: int,
+    ) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.factory = factory
+        self.minimum_size = minimum_size
+        self.start: Optional[Dict[str, Any]] = None
+        self.compressor: Any = None
+        self.passthrough = False
+        self.compressible = False
+
+    async def __call__(self, message: Dict[str, Any]) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            headers: Headers = message.get("headers", [])
+            content_type = b""
+            for name, value in headers:
+                if name.lower() == b"content-encoding":
+                    self.passthrough = True
+                elif name.lower() == b"content-type":
+                    content_type = value
+            self.compressible = not self.passthrough and content_type.startswith(
+                _COMPRESSIBLE
+            )
+            # Without an encoding the client accepts, nothing is compressed
+            self.passthrough = not self.compressible or self.factory is None
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._flush_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._flush_start()
+                await self.send(message)
+                return
+            self.compressor = self.factory()
+            data = await self._compress(body, final=not more_body)
+            await self._flush_start(
+                compressed=True, length=None if more_body else len(data)
+            )
+        else:
+            data = await self._compress(body, final=not more_body)
+        await self.send(
+            {"type": "http.response.body", "body": data, "more_body": more_body}
+        )
+
+    async def _compress(self, data: bytes, final: bool) -> bytes:
+        if len(data) < _OFFLOAD_SIZE:
+            return self.compressor.compress(data, final)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_thread_pool(), self.compressor.compress, data, final
+        )
+
+    async def _flush_start(
+        self, compressed: bool = False, length: Optional[int] = None
+    ) -> None:
+        if self.start is None:
+            return
+        start, self.start = self.start, None
+        headers: Headers = start.get("headers", [])
+        if compressed:
+            headers = [
+                (name, value)
+                for name, value in headers
+                if name.lower() != b"content-length"
+            ]
+            if length is not None:
+                headers.append((b"content-length", str(length).encode()))
+            headers.append((b"content-encoding", self.encoding.encode()))
+        if self.compressible:
+            start = {**start, "headers": _with_vary(headers)}
+        await self.send(start)
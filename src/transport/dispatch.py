@@ -0,0 +1,299 @@
+"""JSON-RPC request dispatch onto a FastMCP server.
+
+Requests are validated into the MCP SDK's request types and handled by the
+server's own low-level handlers, so they behave as they do on the SDK's
+transports (subscriptions, error handling and any handler a wrapper
+installs), while the transport decides how they are read, run and written.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union, get_args
+
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel.server import NotificationOptions, request_ctx
+from mcp.server.session import ServerSession
+from mcp.shared.context import RequestContext
+from mcp.shared.exceptions import McpError
+from mcp.shared.version import SUPPORTED_PROTOCOL_VERSIONS
+from pydantic import ValidationError
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+# MCP request and notification types by method name
+_REQUEST_TYPES: Dict[str, Any] = {
+    request_type.model_fields["method"].default: request_type
+    for request_type in get_args(types.ClientRequestType)
+}
+_NOTIFICATION_TYPES: Dict[str, Any] = {
+    notification_type.model_fields["method"].default: notification_type
+    for notification_type in get_args(types.ClientNotificationType)
+}
+
+
+def _dump(model: Any) -> Any:
+    """Convert a result model to plain JSON-compatible data."""
+    if hasattr(model, "model_dump"):
+        return model.model_dump(mode="json", by_alias=True, exclude_none=True)
+    return model
+
+
+def error_response(
+    request_id: Any, code: int, message: str, data: Any = None
+) -> Dict[str, Any]:
+    """Build a JSON-RPC error response."""
+    error: Dict[str, Any] = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+def valid_request_id(request_id: Any) -> bool:
+    """Whether a request id is a string or an integer, as MCP requires."""
+    return isinstance(request_id, str) or (
+        isinstance(request_id, int) and not isinstance(request_id, bool)
+    )
+
+
+class DispatchSession:
+    """
+    The session that handlers run by a dispatcher see.
+
+    Handlers reach the session through the request context, as they do the
+    SDK's ``ServerSession``: to read the client's initialize parameters and
+    to send notifications, such as resource updates, progress and log
+    messages. Notifications go to ``send``; without one they are dropped.
+    """
+
+    def __init__(self, send: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        """
+        Initialize the session.
+
+        Args:
+            send: Queues a JSON-RPC message for the client
+        """
+        self.send = send
+        self._client_params: Optional[types.InitializeRequestParams] = None
+
+    @property
+    def client_params(self) -> Optional[types.InitializeRequestParams]:
+        return self._client_params
+
+    async def send_notification(
+        self, notification: types.ServerNotification, related_request_id: Any = None
+    ) -> None:
+        """Send a notification to the client."""
+        if self.send is None:
+            return
+        result = self.send({"jsonrpc": "2.0", **_dump(notification)})
+        if asyncio.iscoroutine(result):
+            await result
+
+    # These only read the client's parameters or build a notification and
+    # pass it to send_notification
+    check_client_capability = ServerSession.check_client_capability
+    send_log_message = ServerSession.send_log_message
+    send_progress_notification = ServerSession.send_progress_notification
+    send_resource_updated = ServerSession.send_resource_updated
+    send_resource_list_changed = ServerSession.send_resource_list_changed
+    send_tool_list_changed = ServerSession.send_tool_list_changed
+    send_prompt_list_changed = ServerSession.send_prompt_list_changed
+
+
+class JSONRPCDispatcher:
+    """
+    Maps MCP JSON-RPC requests onto a FastMCP server's handlers.
+
+    The dispatcher is transport-agnostic: it takes one decoded message (or
+    a JSON-RPC batch array) and returns the decoded response (or None for
+    notifications), so transports are free to run many dispatches
+    concurrently. ``initialize`` is answered here, as the SDK's session
+    does; every other request and notification goes to the low-level
+    server's handlers, which see ``session`` in their request context.
+    """
+
+    def __init__(
+        self,
+        server: FastMCP,
+        version: Optional[str] = None,
+        batch_max_concurrency: int = 8,
+        batch_max_items: int = 100,
+    ) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            server: The FastMCP server whose tools, prompts and resources
+                are exposed
+            version: Server version reported during initialization
+            batch_max_concurrency: Items of one batch handled at the same time
+            batch_max_items: Largest batch accepted
+        """
+        self.server = server
+        self.version = version
+        self.batch_max_concurrency = batch_max_concurrency
+        self.batch_max_items = batch_max_items
+        # Transports that can push messages to the client set session.send
+        self.session = DispatchSession()
+        self._handlers: Dict[str, Handler] = {"initialize": self._initialize}
+
+    def register(self, method: str, handler: Handler) -> None:
+        """Register (or replace) the handler for a JSON-RPC method."""
+        self._handlers[method] = handler
+
+    async def dispatch(
+        self, message: Any
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+        """
+        Handle a decoded JSON-RPC message or batch.
+
+        Args:
+            message: The decoded message, or a list of messages
+
+        Returns:
+            The response message (a list of them for a batch), or None for
+            notifications
+        """
+        if isinstance(message, list):
+            return await self.dispatch_batch(message)
+        if not isinstance(message, dict) or message.get("jsonrpc") != "2.0":
+            return error_response(None, types.INVALID_REQUEST, "Invalid Request")
+        method = message.get("method")
+        if method is None:
+            # A response from the client (e.g. to a ping); nothing to do
+            return None
+        if "id" not in message:
+            await self._notify(method, message)
+            return None
+        request_id = message["id"]
+        if not valid_request_id(request_id):
+            return error_response(None, types.INVALID_REQUEST, "Invalid request id")
+        try:
+            result = await self._request(request_id, method, message)
+        except McpError as e:
+            return error_response(
+                request_id, e.error.code, e.error.message, e.error.data
+            )
+        except Exception as e:
+            logger.exception(f"Error handling {method}")
+            return error_response(request_id, types.INTERNAL_ERROR, str(e))
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    async def _request(
+        self, request_id: Any, method: str, message: Dict[str, Any]
+    ) -> Any:
+        """Handle a request the way the SDK's ``Server.run`` does."""
+        handler = self._handlers.get(method)
+        if handler is not None:
+            return await handler(message.get("params") or {})
+        lowlevel = self.server._mcp_server
+        request_type = _REQUEST_TYPES.get(method)
+        request_handler = lowlevel.request_handlers.get(request_type)
+        if request_handler is None:
+            raise McpError(
+                types.ErrorData(
+                    code=types.METHOD_NOT_FOUND, message=f"Method not found: {method}"
+                )
+            )
+        try:
+            request = request_type.model_validate(
+                {"method": method, "params": message.get("params")}
+            )
+        except ValidationError as e:
+            raise McpError(
+                types.ErrorData(code=types.INVALID_PARAMS, message=str(e))
+            ) from None
+        token = request_ctx.set(
+            RequestContext(
+                request_id,
+                getattr(request.params, "meta", None),
+                self.session,
+                None,
+            )
+        )
+        try:
+            result = await request_handler(request)
+        finally:
+            request_ctx.reset(token)
+        return _dump(result)
+
+    async def _notify(self, method: str, message: Dict[str, Any]) -> None:
+        """Pass a notification to the server's handler for it, if any."""
+        notification_type = _NOTIFICATION_TYPES.get(method)
+        handler = self.server._mcp_server.notification_handlers.get(notification_type)
+        if handler is None:
+            return
+        try:
+            await handler(
+                notification_type.model_validate(
+                    {"method": method, "params": message.get("params")}
+                )
+            )
+        except Exception:
+            logger.exception(f"Error handling {method}")
+
+    async def dispatch_batch(
+        self, messages: List[Any]
+    ) -> Union[Dict[str, Any], List[Dict[str, Any]], None]:
+        """
+        Handle a JSON-RPC batch, running its items concurrently.
+
+        At most ``batch_max_concurrency`` items are handled at once.
+        Responses are returned in the order of the requests, without entries
+        for notifications; each item fails or succeeds on its own.
+
+        Args:
+            messages: The decoded batch array
+
+        Returns:
+            The list of responses, None if the batch held only
+            notifications, or a single error response for an empty or
+            oversized batch
+        """
+        if not messages:
+            return error_response(None, types.INVALID_REQUEST, "Invalid Request")
+        if len(messages) > self.batch_max_items:
+            return error_response(
+                None,
+                types.INVALID_REQUEST,
+                f"Batch of {len(messages)} exceeds the limit of "
+                f"{self.batch_max_items} messages",
+            )
+        slots = asyncio.Semaphore(self.batch_max_concurrency)
+
+        async def handle(message: Any) -> Optional[Dict[str, Any]]:
+            if isinstance(message, list):
+                # Batches do not nest
+                return error_response(None, types.INVALID_REQUEST, "Invalid Request")
+            async with slots:
+                return await self.dispatch(message)
+
+        responses = await asyncio.gather(*(handle(message) for message in messages))
+        return [response for response in responses if response is not None] or None
+
+    async def _initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            client_params = types.InitializeRequestParams.model_validate(params)
+        except ValidationError as e:
+            raise McpError(
+                types.ErrorData(code=types.INVALID_PARAMS, message=str(e))
+            ) from None
+        self.session._client_params = client_params
+        requested = client_params.protocolVersion
+        lowlevel = self.server._mcp_server
+        capabilities = lowlevel.get_capabilities(NotificationOptions(), {})
+        return {
+            "protocolVersion": (
+                requested
+                if requested in SUPPORTED_PROTOCOL_VERSIONS
+                else types.LATEST_PROTOCOL_VERSION
+            ),
+            "capabilities": _dump(capabilities),
+            "serverInfo": {
+                "name": self.server.name,
+                "version": self.version or lowlevel.version or "",
+            },
+        }
@@ -0,0 +1,118 @@
+"""HTTP app serving Streamable HTTP and SSE side by side."""
+
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from mcp.server.fastmcp import FastMCP
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+from src.utils.metrics import metrics_endpoint
+from src.utils.profiler import profile_endpoint
+from src.utils.warmup import readiness_endpoint
+
+from .affinity import SessionAffinityMiddleware, SessionRegistry
+from .batch import BatchMiddleware
+from .compression import CompressionMiddleware
+
+
+def build_http_app(
+    server: FastMCP,
+    stateless: bool = False,
+    registry: Optional[SessionRegistry] = None,
+    on_startup: Optional[Callable[[], Awaitable[Any]]] = None,
+    on_shutdown: Optional[Callable[[], Awaitable[Any]]] = None,
+    metrics_path: Optional[str] = "/metrics",
+    readiness_path: Optional[str] = "/ready",
+    admin_token: Optional[str] = None,
+    batch_max_concurrency: int = 8,
+    batch_max_items: int = 100,
+    compression_min_size: Optional[int] = 1024,
+) -> Any:
+    """
+    Build the ASGI app for the HTTP transports.
+
+    Streamable HTTP is served at ``server.settings.streamable_http_path``
+    (``/mcp``) next to the SSE endpoints, so plain request/response calls
+    do not need a long-lived SSE connection. JSON-RPC batch arrays posted
+    there are split and answered together (see ``BatchMiddleware``).
+    Responses are compressed when the client accepts it (see
+    ``CompressionMiddleware``).
+
+    Args:
+        server: The FastMCP server to expose
+        stateless: Serve Streamable HTTP without sessions (JSON responses);
+            subscriptions then have no session to notify
+        registry: Session registry shared between worker processes; SSE and
+            Streamable HTTP requests for sessions owned by another worker
+            are forwarded to it
+        on_startup: Coroutine to run once the app starts
+        on_shutdown: Coroutine to run when the app stops
+        metrics_path: Path serving Prometheus metrics (None disables it)
+        readiness_path: Path answering 200 once startup and warm-up have
+            finished and 503 otherwise (None disables it)
+        admin_token: Bearer token for the admin endpoints, which are only
+            served when it is set
+        batch_max_concurrency: Items of one batch handled at the same time
+        batch_max_items: Largest batch accepted
+        compression_min_size: Smallest response body compressed (None
+            disables compression)
+
+    Returns:
+        The ASGI application
+    """
+    if stateless:
+        server.settings.stateless_http = True
+        server.settings.json_response = True
+    streamable = server.streamable_http_app()
+    sse = server.sse_app()
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with server.session_manager.run():
+            if on_startup is not None:
+                await on_startup()
+            if registry is not None:
+                await affinity.start()
+            try:
+                yield
+            finally:
+                if registry is not None:
+                    await affinity.stop()
+                if on_shutdown is not None:
+                    await on_shutdown()
+
+    routes = [*streamable.routes, *sse.routes]
+    if metrics_path:
+        routes.append(Route(metrics_path, metrics_endpoint, methods=["GET"]))
+    if readiness_path:
+        routes.append(Route(readiness_path, readiness_endpoint, methods=["GET"]))
+    if admin_token:
+        routes.append(
+            Route("/admin/profile", profile_endpoint(admin_token), methods=["GET"])
+        )
+    app = Starlette(
+        debug=server.settings.debug,
+        routes=routes,
+        middleware=streamable.user_middleware,
+        lifespan=lifespan,
+    )
+    batched = BatchMiddleware(
+        app,
+        path=server.settings.streamable_http_path,
+        max_concurrency=batch_max_concurrency,
+        max_items=batch_max_items,
+    )
+    if compression_min_size is not None:
+        # Outside the batch middleware, which reads its sub-responses
+        batched = CompressionMiddleware(batched, minimum_size=compression_min_size)
+    if registry is None:
+        return batched
+    affinity = SessionAffinityMiddleware(
+        batched,
+        registry,
+        sse_path=server.settings.sse_path,
+        message_path=server.settings.message_path,
+        streamable_path=server.settings.streamable_http_path,
+    )
+    return affinity
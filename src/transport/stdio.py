@@ -0,0 +1,207 @@
+"""Newline-delimited JSON-RPC over stdin/stdout."""
+
+import asyncio
+import logging
+import sys
+from typing import Any, BinaryIO, Dict, List, Optional, Set
+
+from mcp import types
+
+from src.resources.subscriptions import close_session
+from src.utils.codec import dumps, loads
+
+from .dispatch import JSONRPCDispatcher, error_response, valid_request_id
+
+logger = logging.getLogger(__name__)
+
+# Largest single message accepted on stdin
+MAX_LINE_BYTES = 64 * 1024 * 1024
+# Most responses coalesced into one write
+MAX_WRITE_BATCH = 256
+
+
+class StdioTransport:
+    """
+    Serves MCP over stdin/stdout with concurrent request handling.
+
+    Each request line is dispatched as its own task (up to
+    ``max_concurrency`` at once), so a slow tool does not hold up the
+    requests behind it. While every slot is taken, stdin is not read, so a
+    client that sends faster than the server answers is held back instead
+    of queueing unbounded work. A JSON-RPC batch array takes a single slot and is
+    answered with a single line once all of its items are done; its items
+    run concurrently under the dispatcher's batch limit. Responses are
+    funnelled through a single writer task that coalesces whatever is queued
+    into one write and one flush, as are resource update and list change
+    notifications for the session.
+    """
+
+    def __init__(
+        self,
+        dispatcher: JSONRPCDispatcher,
+        max_concurrency: int = 64,
+        stdin: Optional[BinaryIO] = None,
+        stdout: Optional[BinaryIO] = None,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            dispatcher: Dispatcher that handles decoded messages
+            max_concurrency: Maximum requests handled at the same time
+            stdin: Binary input stream (defaults to the process stdin)
+            stdout: Binary output stream (defaults to the process stdout)
+        """
+        self.dispatcher = dispatcher
+        self.stdin = stdin or sys.stdin.buffer
+        self.stdout = stdout or sys.stdout.buffer
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._outbox: asyncio.Queue = asyncio.Queue()
+        self._in_flight: Dict[Any, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # Notifications for the session, such as resource updates, are
+        # pushed down stdout
+        self.dispatcher.session.send = self.send
+
+    async def _open_reader(self) -> asyncio.StreamReader:
+        """Attach a non-blocking stream reader to stdin."""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=MAX_LINE_BYTES)
+        try:
+            # In-memory streams have no descriptor to register
+            self.stdin.fileno()
+            await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader), self.stdin
+            )
+        except (OSError, ValueError):
+            # Regular files cannot be registered with the event loop; read
+            # them in a worker thread instead
+            asyncio.create_task(self._pump_blocking(reader))
+        return reader
+
+    async def _pump_blocking(self, reader: asyncio.StreamReader) -> None:
+        while True:
+            chunk = await asyncio.to_thread(self.stdin.read1, 1 << 16)
+            if not chunk:
+                reader.feed_eof()
+                return
+            reader.feed_data(chunk)
+
+    async def _open_writer(self) -> None:
+        """Attach a non-blocking stream writer to stdout when possible."""
+        loop = asyncio.get_running_loop()
+        try:
+            self.stdout.fileno()
+            transport, protocol = await loop.connect_write_pipe(
+                asyncio.streams.FlowControlMixin, self.stdout
+            )
+        except (OSError, ValueError):
+            self._writer = None
+            return
+        self._writer = asyncio.StreamWriter(transport, protocol, None, loop)
+
+    async def _write_loop(self) -> None:
+        """Write queued responses, coalescing bursts into a single flush."""
+        while True:
+            first = await self._outbox.get()
+            if first is None:
+                return
+            batch: List[bytes] = [first]
+            done = False
+            while len(batch) < MAX_WRITE_BATCH and not self._outbox.empty():
+                item = self._outbox.get_nowait()
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+            data = b"".join(batch)
+            if self._writer is not None:
+                self._writer.write(data)
+                await self._writer.drain()
+            else:
+                self.stdout.write(data)
+                self.stdout.flush()
+            if done:
+                return
+
+    def send(self, message: Dict[str, Any]) -> None:
+        """Queue a message for the writer."""
+        self._outbox.put_nowait(dumps(message) + b"\n")
+
+    async def _handle(self, message: Any) -> None:
+        try:
+            response = await self.dispatcher.dispatch(message)
+        except asyncio.CancelledError:
+            return
+        if response is not None:
+            self.send(response)
+
+    def _cancel(self, params: Any) -> None:
+        request_id = params.get("requestId") if isinstance(params, dict) else None
+        if not valid_request_id(request_id):
+            return
+        task = self._in_flight.get(request_id)
+        if task is not None:
+            task.cancel()
+
+    async def _submit(self, line: bytes) -> None:
+        """Decode a line and start handling it once a slot is free."""
+        try:
+            message = loads(line)
+        except ValueError:
+            self.send(error_response(None, types.PARSE_ERROR, "Parse error"))
+            return
+        is_request = isinstance(message, dict)
+        if is_request and message.get("method") == "notifications/cancelled":
+            self._cancel(message.get("params"))
+            return
+        request_id = message.get("id") if is_request else None
+        if is_request and "id" in message and not valid_request_id(request_id):
+            self.send(error_response(None, types.INVALID_REQUEST, "Invalid request id"))
+            return
+        await self._slots.acquire()
+        task = asyncio.create_task(self._handle(message))
+        self._tasks.add(task)
+        if request_id is not None:
+            self._in_flight[request_id] = task
+
+        def _done(finished: asyncio.Task) -> None:
+            # Released here rather than in _handle, which never runs for a
+            # task cancelled before it started
+            self._slots.release()
+            self._tasks.discard(finished)
+            if request_id is not None and self._in_flight.get(request_id) is finished:
+                del self._in_flight[request_id]
+
+        task.add_done_callback(_done)
+
+    async def serve(self) -> None:
+        """Serve until stdin is closed and every request has been answered."""
+        reader = await self._open_reader()
+        await self._open_writer()
+        writer_task = asyncio.create_task(self._write_loop())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    await self._submit(line)
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            close_session(self.dispatcher.session)
+            self._outbox.put_nowait(None)
+            await writer_task
+
+
+async def serve_stdio(dispatcher: JSONRPCDispatcher, max_concurrency: int = 64) -> None:
+    """
+    Serve a dispatcher over the process's stdin and stdout.
+
+    Args:
+        dispatcher: Dispatcher that handles decoded messages
+        max_concurrency: Maximum requests handled at the same time
+    """
+    await StdioTransport(dispatcher, max_concurrency=max_concurrency).serve()
@@ -0,0 +1,75 @@
+"""Multi-process HTTP serving."""
+
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from .affinity import SessionRegistry
+
+REGISTRY_ENV = "MCP_WORKER_REGISTRY"
+LOG_LEVEL_ENV = "MCP_WORKER_LOG_LEVEL"
+
+
+def worker_registry() -> Optional[SessionRegistry]:
+    """
+    Get the session registry for this worker process.
+
+    Returns:
+        The registry when running under ``serve_workers``, otherwise None
+    """
+    directory = os.environ.get(REGISTRY_ENV)
+    if not directory:
+        return None
+    return SessionRegistry(directory, str(os.getpid()))
+
+
+def worker_log_level() -> Optional[str]:
+    """Get the log level the parent process passed to its workers, if any."""
+    return os.environ.get(LOG_LEVEL_ENV)
+
+
+def serve_workers(
+    app_factory: str,
+    host: str,
+    port: int,
+    workers: int,
+    log_level: str = "info",
+    app_log_level: Optional[str] = None,
+) -> None:
+    """
+    Serve an app from several worker processes sharing one listening socket.
+
+    Each worker builds its own app from ``app_factory``. SSE and Streamable
+    HTTP sessions stay pinned to the worker that opened them through a
+    session registry in a temporary directory shared by the workers.
+
+    Args:
+        app_factory: Import string of a zero-argument app factory
+            (``module:function``)
+        host: The host to bind to
+        port: The port to listen on
+        workers: Number of worker processes
+        log_level: Uvicorn log level
+        app_log_level: Server log level, set up by each worker through
+            ``worker_log_level``
+    """
+    import uvicorn
+
+    registry_dir = tempfile.mkdtemp(prefix="mcp-workers-")
+    os.environ[REGISTRY_ENV] = registry_dir
+    if app_log_level is not None:
+        os.environ[LOG_LEVEL_ENV] = app_log_level
+    try:
+        uvicorn.run(
+            app_factory,
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+            log_level=log_level,
+        )
+    finally:
+        os.environ.pop(REGISTRY_ENV, None)
+        os.environ.pop(LOG_LEVEL_ENV, None)
+        shutil.rmtree(registry_dir, ignore_errors=True)
@@ -0,0 +1,262 @@
+"""Pluggable JSON codec for MCP messages and tool results.
+
+The fastest installed backend is used: orjson, then msgspec, then the
+standard library. All of them encode the values database rows and API
+responses tend to contain: datetimes, dates and times as ISO 8601 strings,
+Decimals as numbers, UUIDs as strings, and NumPy arrays and scalars, sets,
+dataclasses and Pydantic models as their JSON equivalents. Anything else is
+encoded as its ``str()``, like FastMCP does.
+
+Set ``MCP_JSON_CODEC`` (orjson, msgspec or json) to force a backend.
+"""
+
+import base64
+import dataclasses
+import datetime
+import json
+import logging
+from decimal import Decimal
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    get_args,
+)
+from uuid import UUID
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _default(obj: Any) -> Any:
+    """Convert a value the backend cannot encode natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, bytes):
+        return base64.b64encode(obj).decode("ascii")
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json", by_alias=True)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    # NumPy arrays and scalars
+    tolist = getattr(obj, "tolist", None)
+    if callable(tolist):
+        return tolist()
+    return str(obj)
+
+
+class JSONCodec:
+    """Encodes to and decodes from compact UTF-8 JSON."""
+
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[Union[bytes, str]], Any],
+    ) -> None:
+        """
+        Initialize the codec.
+
+        Args:
+            name: Backend name
+            dumps: Encodes a value to JSON bytes
+            loads: Decodes JSON bytes or text, raising ValueError on
+                invalid input
+        """
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+
+def _orjson_codec() -> JSONCodec:
+    import orjson
+
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=_default, option=options)
+
+    return JSONCodec("orjson", dumps, orjson.loads)
+
+
+def _msgspec_codec() -> JSONCodec:
+    import msgspec
+
+    encoder = msgspec.json.Encoder(enc_hook=_default, decimal_format="number")
+    decoder = msgspec.json.Decoder()
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return JSONCodec("msgspec", encoder.encode, loads)
+
+
+def _stdlib_codec() -> JSONCodec:
+    encoder = json.JSONEncoder(
+        default=_default, ensure_ascii=False, separators=(",", ":")
+    )
+
+    def dumps(obj: Any) -> bytes:
+        return encoder.encode(obj).encode("utf-8")
+
+    return JSONCodec("json", dumps, json.loads)
+
+
+_FACTORIES: Dict[str, Callable[[], JSONCodec]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+
+def create_codec(backend: Optional[str] = None) -> JSONCodec:
+    """
+    Create a codec.
+
+    Args:
+        backend: "orjson", "msgspec" or "json"; None picks the first one
+            that is installed
+
+    Returns:
+        The codec
+
+    Raises:
+        ValueError: If the backend is unknown
+        ImportError: If the requested backend is not installed
+    """
+    if backend is not None:
+        if backend not in _FACTORIES:
+            raise ValueError(f"Unknown JSON codec: {backend}")
+        return _FACTORIES[backend]()
+    for name in BACKENDS:
+        try:
+            return _FACTORIES[name]()
+        except ImportError:
+            continue
+    return _stdlib_codec()
+
+
+_codec: Optional[JSONCodec] = None
+
+
+def get_codec() -> JSONCodec:
+    """Get the configured codec, creating it on first use."""
+    global _codec
+    if _codec is None:
+        _codec = create_codec(config.json_codec)
+        logger.debug(f"Using the {_codec.name} JSON codec")
+    return _codec
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode a value as compact UTF-8 JSON."""
+    return get_codec().dumps(obj)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON."""
+    return get_codec().loads(data)
+
+
+def _is_content(value: Any) -> bool:
+    """Whether FastMCP converts a value to content blocks on its own."""
+    from mcp.server.fastmcp.utilities.types import Audio, Image
+    from mcp.types import ContentBlock
+
+    if isinstance(value, (list, tuple)):
+        return any(_is_content(item) for item in value)
+    return value is None or isinstance(
+        value, (str, Image, Audio, *get_args(ContentBlock))
+    )
+
+
+def convert_tool_result(
+    tool: Any, result: Any
+) -> Union[List[Any], Tuple[List[Any], Any]]:
+    """
+    Convert a tool's return value to content with the codec.
+
+    Produces what FastMCP's own conversion does: a text block per value
+    (per item for lists), plus structured content when the tool has an
+    output schema. The text is compact JSON, and the structured content is
+    decoded from the same bytes, so the value is encoded only once.
+    Validating structured content against the output schema is left to the
+    protocol layer. Strings, images and content blocks go through FastMCP.
+
+    Args:
+        tool: The FastMCP tool that returned the value
+        result: The return value
+
+    Returns:
+        Content blocks, or a (content blocks, structured content) pair
+    """
+    from mcp.types import CallToolResult, TextContent
+
+    metadata = tool.fn_metadata
+    if isinstance(result, CallToolResult) or _is_content(result):
+        return metadata.convert_result(result)
+
+    items: Sequence[Any] = result if isinstance(result, (list, tuple)) else [result]
+    encoded: List[bytes] = [dumps(item) for item in items]
+    content = [TextContent(type="text", text=data.decode("utf-8")) for data in encoded]
+    if metadata.output_schema is None:
+        return content
+
+    if isinstance(result, (list, tuple)):
+        structured: Any = [loads(data) for data in encoded]
+    else:
+        structured = loads(encoded[0])
+    if metadata.wrap_output:
+        structured = {"result": structured}
+    return content, structured
+
+
+def encode_tool_results(server: Any) -> None:
+    """
+    Convert every tool result on a server with the codec.
+
+    Replaces FastMCP's result conversion, which pretty-prints each result
+    and validates it against the output model before the transport encodes
+    it again.
+
+    Args:
+        server: The FastMCP server
+    """
+    manager = server._tool_manager
+    if getattr(manager, "_codec", False):
+        return
+    call_tool = manager.call_tool
+
+    async def encoded_call_tool(
+        name: str,
+        arguments: Dict[str, Any],
+        context: Any = None,
+        convert_result: bool = False,
+    ) -> Any:
+        result = await call_tool(name, arguments, context=context, convert_result=False)
+        if not convert_result:
+            return result
+        return convert_tool_result(manager.get_tool(name), result)
+
+    manager.call_tool = encoded_call_tool
+    manager._codec = True
@@ -0,0 +1,188 @@
+"""Per-request deadlines carried through tool calls to their I/O.
+
+Each tool call runs under a deadline: the server's ``config.tool_timeout``,
+or the ``_meta.timeout`` (in seconds) the client sends with the call if that
+is shorter. The deadline lives in a context variable, so everything the call
+does sees it. Database sessions turn it into a Postgres
+``statement_timeout`` and upstream HTTP requests into their timeout. When
+it passes, the call is cancelled, which also cancels the query or request
+in flight.
+"""
+
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from mcp import types
+from mcp.shared.exceptions import McpError
+
+from src.config import config
+
+# JSON-RPC implementation-defined server error used when a deadline passes
+DEADLINE_EXCEEDED = -32001
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+def parse_timeout(value: Any) -> Optional[float]:
+    """Parse a timeout in seconds, if it is a positive number."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value) if value > 0 else None
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[None]:
+    """
+    Run the enclosed code with a deadline ``timeout`` seconds from now.
+
+    A deadline never extends an enclosing one, so nested calls finish by
+    the time their caller has to.
+
+    Args:
+        timeout: Seconds until the deadline (None keeps the current one)
+    """
+    current = _deadline.get()
+    deadline = current
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        if current is not None:
+            deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left until the current deadline.
+
+    Returns:
+        The seconds left (0 once it has passed), or None without a deadline
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def deadline_exceeded_error(name: str, timeout: Optional[float]) -> McpError:
+    """
+    Build the error returned when a call runs out of time.
+
+    Args:
+        name: Name of the tool
+        timeout: The call's timeout in seconds
+
+    Returns:
+        The error to raise
+    """
+    data: Dict[str, Any] = {"reason": "deadline_exceeded"}
+    if timeout is not None:
+        data["timeout"] = timeout
+    return McpError(
+        types.ErrorData(
+            code=DEADLINE_EXCEEDED,
+            message=f"Tool {name} did not finish before its deadline",
+            data=data,
+        )
+    )
+
+
+def check_deadline(name: str) -> None:
+    """
+    Fail fast if the deadline has already passed.
+
+    Args:
+        name: What is about to run, for the error message
+
+    Raises:
+        McpError: If no time is left
+    """
+    if remaining() == 0:
+        raise deadline_exceeded_error(name, None)
+
+
+def request_timeout(requested: Any = None) -> Optional[float]:
+    """
+    Resolve the timeout of the current tool call.
+
+    The client's requested timeout is used when it is shorter than
+    ``config.tool_timeout``. For requests handled by the MCP session layer
+    it is read from ``_meta.timeout`` on the request unless given.
+
+    Args:
+        requested: Timeout the client asked for, in seconds
+
+    Returns:
+        Seconds the call may take, or None for no limit
+    """
+    timeout = config.tool_timeout
+    if requested is None:
+        from mcp.server.lowlevel.server import request_ctx
+
+        try:
+            requested = getattr(request_ctx.get().meta, "timeout", None)
+        except LookupError:
+            pass
+    requested = parse_timeout(requested)
+    if requested is not None and (timeout is None or requested < timeout):
+        return requested
+    return timeout
+
+
+class _ToolTimeout(Exception):
+    """Carries a TimeoutError raised inside a tool past ``wait_for``."""
+
+    def __init__(self, error: BaseException) -> None:
+        super().__init__(error)
+        self.error = error
+
+
+def enforce_deadlines(server: Any) -> None:
+    """
+    Cancel every tool call on a server that outlives its deadline.
+
+    Wraps the server's tool manager, so tools registered before or after
+    this call are covered. Calls made inside a call (such as through
+    ``multi_call``) share its deadline.
+
+    Args:
+        server: The FastMCP server
+    """
+    manager = server._tool_manager
+    if getattr(manager, "_deadlines", False):
+        return
+    call_tool = manager.call_tool
+
+    async def deadline_call_tool(
+        name: str, arguments: Dict[str, Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        timeout = request_timeout() if _deadline.get() is None else None
+        with deadline_scope(timeout):
+            left = remaining()
+            if left is None:
+                return await call_tool(name, arguments, *args, **kwargs)
+
+            async def call() -> Any:
+                try:
+                    return await call_tool(name, arguments, *args, **kwargs)
+                except asyncio.TimeoutError as e:
+                    # The tool's own timeout, not the deadline
+                    raise _ToolTimeout(e) from None
+
+            try:
+                return await asyncio.wait_for(call(), left)
+            except asyncio.TimeoutError:
+                raise deadline_exceeded_error(name, timeout) from None
+            except _ToolTimeout as e:
+                raise e.error
+
+    manager.call_tool = deadline_call_tool
+    manager._deadlines = True
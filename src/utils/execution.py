@@ -0,0 +1,122 @@
+"""Execution policies for running tools off the event loop."""
+
+import asyncio
+import contextvars
+import functools
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from src.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionPolicy(Enum):
+    """Where a tool's function runs."""
+
+    # On the event loop; for cheap functions and coroutines
+    INLINE = "inline"
+    # In a thread pool; for blocking I/O and code that releases the GIL
+    THREAD = "thread"
+    # In a process pool; for CPU-bound pure Python
+    PROCESS = "process"
+
+
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """Get the tool thread pool, creating it on first use."""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = ThreadPoolExecutor(
+            max_workers=config.tool_thread_workers, thread_name_prefix="mcp-tool"
+        )
+    return _thread_pool
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the tool process pool, creating it on first use."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=config.tool_process_workers)
+    return _process_pool
+
+
+def shutdown_pools() -> None:
+    """Shut down the tool pools, waiting for running calls to finish."""
+    global _thread_pool, _process_pool
+    if _thread_pool is not None:
+        _thread_pool.shutdown()
+        _thread_pool = None
+    if _process_pool is not None:
+        _process_pool.shutdown()
+        _process_pool = None
+
+
+def offload(func: Callable[..., Any], policy: ExecutionPolicy) -> Callable[..., Any]:
+    """
+    Wrap a synchronous function so it runs according to an execution policy.
+
+    The wrapper is a coroutine function with the same signature, so FastMCP
+    derives the same tool schema from it. Thread calls keep the caller's
+    context variables; process calls pickle ``func`` and its arguments, so
+    ``func`` must be importable at module level and cannot take a
+    ``Context`` argument.
+
+    Args:
+        func: The synchronous function to run
+        policy: Where to run it
+
+    Returns:
+        ``func`` itself for INLINE, otherwise an async wrapper
+    """
+    if policy is ExecutionPolicy.INLINE:
+        return func
+    if asyncio.iscoroutinefunction(func):
+        raise ValueError(f"{func.__name__} is a coroutine; it can only run inline")
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        executor: Executor
+        if policy is ExecutionPolicy.THREAD:
+            context = contextvars.copy_context()
+            call = functools.partial(context.run, func, *args, **kwargs)
+            executor = get_thread_pool()
+        else:
+            call = functools.partial(func, *args, **kwargs)
+            executor = get_process_pool()
+        return await loop.run_in_executor(executor, call)
+
+    return wrapper
+
+
+def offloaded_tool(
+    server: Any,
+    execution: ExecutionPolicy = ExecutionPolicy.THREAD,
+    **tool_kwargs: Any,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Register a tool that runs in a thread or process pool.
+
+    Use in place of ``@server.tool()``. The module-level name stays bound to
+    the original function so the process pool can pickle it by reference.
+
+    Args:
+        server: The FastMCP server to register the tool with
+        execution: Where the tool runs
+        **tool_kwargs: Passed on to ``server.tool()`` (name, description, ...)
+
+    Returns:
+        A decorator that registers the tool and returns the function unchanged
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        server.tool(**tool_kwargs)(offload(func, execution))
+        return func
+
+    return decorator
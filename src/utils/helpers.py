@@ -4,7 +4,7 @@ import importlib.metadata
 import logging
 import os
 import sys
-from typing import Optional
+from typing import Optional, TextIO
 
 
 def get_version() -> str:
@@ -15,12 +15,16 @@ def get_version() -> str:
         return "0.1.0"  # Default version if package not installed
 
 
-def setup_logging(log_level: Optional[str] = None) -> None:
+def setup_logging(
+    log_level: Optional[str] = None, stream: Optional[TextIO] = None
+) -> None:
     """Set up logging configuration.
 
     Args:
         log_level: The log level to use (debug, info, warning, error, critical).
             If None, uses the LOG_LEVEL environment variable or defaults to 'info'.
+        stream: Stream to log to. Defaults to stdout; the stdio transport
+            passes stderr so logs never mix with protocol messages.
     """
     if log_level is None:
         log_level = os.environ.get("LOG_LEVEL", "info").lower()
@@ -32,7 +36,7 @@ def setup_logging(log_level: Optional[str] = None) -> None:
     logging.basicConfig(
         level=numeric_level,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
+        handlers=[logging.StreamHandler(stream or sys.stdout)],
     )
 
     # Adjust third-party library logging levels
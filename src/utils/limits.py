@@ -0,0 +1,423 @@
+"""Per-tool concurrency limits with bounded, prioritized queues."""
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import logging
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mcp import types
+from mcp.shared.exceptions import McpError
+
+from src.config import config
+
+from .execution import ExecutionPolicy, offload
+from .metrics import MetricFamily, registry
+
+logger = logging.getLogger(__name__)
+
+# JSON-RPC implementation-defined server error used when a call is shed
+OVERLOADED = -32000
+
+
+class Priority(IntEnum):
+    """Scheduling class of a tool call; lower values are served first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_priority: contextvars.ContextVar[Optional[Priority]] = contextvars.ContextVar(
+    "tool_priority", default=None
+)
+
+# Protocol errors raised by the tool call the current request is handling
+_tool_errors: contextvars.ContextVar[Optional[List[McpError]]] = contextvars.ContextVar(
+    "tool_errors", default=None
+)
+
+
+def parse_priority(value: Any) -> Optional[Priority]:
+    """Parse a priority class name ("interactive" or "batch"), if valid."""
+    if isinstance(value, Priority):
+        return value
+    if isinstance(value, str):
+        try:
+            return Priority[value.upper()]
+        except KeyError:
+            return None
+    return None
+
+
+@contextmanager
+def priority_scope(priority: Optional[Priority]) -> Iterator[None]:
+    """Run the enclosed tool calls with the given priority class."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """
+    Resolve the priority class of the current tool call.
+
+    An explicit ``priority_scope`` wins. Otherwise, for requests handled by
+    the MCP session layer, ``_meta.priority`` on the request is used, then
+    the session's class declared in ``initialize`` as
+    ``capabilities.experimental.priority.class`` (experimental capabilities
+    are objects). Calls default to interactive.
+
+    Returns:
+        The priority class
+    """
+    explicit = _priority.get()
+    if explicit is not None:
+        return explicit
+    from mcp.server.lowlevel.server import request_ctx
+
+    try:
+        context = request_ctx.get()
+    except LookupError:
+        return Priority.INTERACTIVE
+    priority = parse_priority(getattr(context.meta, "priority", None))
+    if priority is not None:
+        return priority
+    client_params = getattr(context.session, "client_params", None)
+    experimental = client_params.capabilities.experimental if client_params else None
+    declared = (experimental or {}).get("priority") or {}
+    priority = parse_priority(declared.get("class"))
+    return priority if priority is not None else Priority.INTERACTIVE
+
+
+def overloaded_error(name: str, reason: str, retry_after: float) -> McpError:
+    """
+    Build the retryable error returned when a call is shed.
+
+    Args:
+        name: Name of the limited tool
+        reason: "queue_full" or "queue_timeout"
+        retry_after: Suggested delay in seconds before retrying
+
+    Returns:
+        The error to raise
+    """
+    return McpError(
+        types.ErrorData(
+            code=OVERLOADED,
+            message=f"Tool {name} is overloaded ({reason}); retry later",
+            data={"retryable": True, "reason": reason, "retryAfter": retry_after},
+        )
+    )
+
+
+def protocol_error(error: BaseException) -> Optional[McpError]:
+    """
+    Find the protocol error a failed tool call should be answered with.
+
+    FastMCP wraps exceptions raised inside a tool in a ``ToolError``, so an
+    ``McpError`` raised there (such as load shedding) is its cause.
+
+    Args:
+        error: What the tool call raised
+
+    Returns:
+        The McpError, or None for ordinary tool failures
+    """
+    if isinstance(error, McpError):
+        return error
+    if isinstance(error.__cause__, McpError):
+        return error.__cause__
+    return None
+
+
+def propagate_tool_errors(server: Any) -> None:
+    """
+    Answer tool calls that fail with an McpError with that JSON-RPC error.
+
+    The SDK's ``tools/call`` handler reports every exception as an
+    ``isError`` result, which loses the error code and data (such as
+    ``retryAfter``) clients need to retry a shed call. This records the
+    McpError a call raised and re-raises it from the request handler, so
+    the session sends it as a JSON-RPC error on every transport. Other
+    failures are still reported as ``isError`` results.
+
+    Args:
+        server: The FastMCP server
+    """
+    lowlevel = server._mcp_server
+    if getattr(lowlevel, "_tool_errors_propagated", False):
+        return
+    lowlevel._tool_errors_propagated = True
+    call_tool = server.call_tool
+
+    async def recording_call_tool(name: str, arguments: Dict[str, Any]) -> Any:
+        try:
+            return await call_tool(name, arguments)
+        except Exception as e:
+            errors = _tool_errors.get()
+            error = protocol_error(e)
+            if errors is not None and error is not None:
+                errors.append(error)
+            raise
+
+    # Same registration as FastMCP's, which validates arguments itself
+    lowlevel.call_tool(validate_input=False)(recording_call_tool)
+    handler = lowlevel.request_handlers[types.CallToolRequest]
+
+    async def call_tool_handler(request: types.CallToolRequest) -> Any:
+        errors: List[McpError] = []
+        token = _tool_errors.set(errors)
+        try:
+            result = await handler(request)
+        finally:
+            _tool_errors.reset(token)
+        if errors:
+            raise errors[0]
+        return result
+
+    lowlevel.request_handlers[types.CallToolRequest] = call_tool_handler
+
+
+class ConcurrencyLimiter:
+    """
+    Caps concurrent calls to a tool, queueing a bounded number of waiters.
+
+    Waiters are served by priority class, then in arrival order. A call
+    that finds the queue full, or waits longer than ``queue_timeout``, is
+    rejected with a retryable ``McpError`` instead of waiting indefinitely.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        queue_depth: int = 0,
+        queue_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Name reported in errors and stats
+            max_concurrency: Calls allowed to run at the same time
+            queue_depth: Calls allowed to wait for a slot (0 rejects at once)
+            queue_timeout: Seconds a call may wait before it is rejected
+                (None waits until a slot frees up)
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.queue_depth = queue_depth
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._queued = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def retry_after(self) -> float:
+        """Suggested retry delay in seconds for rejected callers."""
+        return self.queue_timeout or 1.0
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            priority: Scheduling class of the caller
+
+        Raises:
+            McpError: If the queue is full or the wait timed out
+        """
+        if self._active < self.max_concurrency and not self._queued:
+            self._active += 1
+            return
+        if self._queued >= self.queue_depth:
+            self.rejected += 1
+            raise overloaded_error(self.name, "queue_full", self.retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._sequence), waiter))
+        self._queued += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait was abandoned
+                self.release()
+            else:
+                waiter.cancel()
+                self._queued -= 1
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise overloaded_error(
+                    self.name, "queue_timeout", self.retry_after
+                ) from None
+            raise
+
+    def release(self) -> None:
+        """Free a slot, handing it to the highest-priority waiter if any."""
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                # Abandoned waiter, already removed from the count
+                continue
+            self._queued -= 1
+            waiter.set_result(None)
+            return
+        self._active -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get current load and rejection counters."""
+        return {
+            "active": self._active,
+            "queued": self._queued,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+_limiters: Dict[str, ConcurrencyLimiter] = {}
+
+
+def get_limiter(
+    name: str,
+    max_concurrency: int,
+    queue_depth: Optional[int] = None,
+    queue_timeout: Optional[float] = None,
+) -> ConcurrencyLimiter:
+    """
+    Create the limiter for a tool and record it for stats.
+
+    Args:
+        name: Tool name; generated API tools use ``<api>/<operationId>``,
+            since operation ids are only unique within one API
+        max_concurrency: Calls allowed to run at the same time
+        queue_depth: Calls allowed to wait (defaults to config.tool_queue_depth)
+        queue_timeout: Seconds a call may wait (defaults to
+            config.tool_queue_timeout)
+
+    Returns:
+        The limiter
+    """
+    limiter = ConcurrencyLimiter(
+        name,
+        max_concurrency,
+        queue_depth=config.tool_queue_depth if queue_depth is None else queue_depth,
+        queue_timeout=(
+            config.tool_queue_timeout if queue_timeout is None else queue_timeout
+        ),
+    )
+    _limiters[name] = limiter
+    return limiter
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Get stats for every limited tool, keyed by limiter name."""
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
+
+
+def _collect_metrics() -> Iterable[MetricFamily]:
+    """Produce queue and shedding metrics for every limited tool."""
+    if not _limiters:
+        return
+    stats = limiter_stats()
+    yield MetricFamily(
+        "mcp_tool_queued",
+        "gauge",
+        "Tool calls waiting for a concurrency slot.",
+        [({"tool": name}, s["queued"]) for name, s in stats.items()],
+    )
+    yield MetricFamily(
+        "mcp_tool_rejected_total",
+        "counter",
+        "Tool calls shed by concurrency limits.",
+        [
+            ({"tool": name, "reason": reason}, s[key])
+            for name, s in stats.items()
+            for reason, key in (
+                ("queue_full", "rejected"),
+                ("queue_timeout", "timed_out"),
+            )
+        ],
+    )
+
+
+registry.register_collector(_collect_metrics)
+
+
+def limit(func: Callable[..., Any], limiter: ConcurrencyLimiter) -> Callable[..., Any]:
+    """
+    Wrap a tool function so each call holds one of the limiter's slots.
+
+    Args:
+        func: The tool function (sync or async)
+        limiter: Limiter guarding the function
+
+    Returns:
+        An async wrapper with the same signature
+    """
+    is_coroutine = asyncio.iscoroutinefunction(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        await limiter.acquire(current_priority())
+        try:
+            if is_coroutine:
+                return await func(*args, **kwargs)
+            return func(*args, **kwargs)
+        finally:
+            limiter.completed += 1
+            limiter.release()
+
+    return wrapper
+
+
+def limited_tool(
+    server: Any,
+    max_concurrency: int,
+    queue_depth: Optional[int] = None,
+    queue_timeout: Optional[float] = None,
+    execution: ExecutionPolicy = ExecutionPolicy.INLINE,
+    **tool_kwargs: Any,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Register a tool with a concurrency limit and a bounded wait queue.
+
+    Use in place of ``@server.tool()``. Calls beyond ``max_concurrency``
+    wait in a queue of at most ``queue_depth`` entries, interactive callers
+    ahead of batch ones; anything beyond that is rejected straight away.
+
+    Args:
+        server: The FastMCP server to register the tool with
+        max_concurrency: Calls allowed to run at the same time
+        queue_depth: Calls allowed to wait (defaults to config.tool_queue_depth)
+        queue_timeout: Seconds a call may wait (defaults to
+            config.tool_queue_timeout)
+        execution: Where the tool runs
+        **tool_kwargs: Passed on to ``server.tool()`` (name, description, ...)
+
+    Returns:
+        A decorator that registers the tool and returns the function unchanged
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        name = tool_kwargs.get("name") or func.__name__
+        limiter = get_limiter(name, max_concurrency, queue_depth, queue_timeout)
+        server.tool(**tool_kwargs)(limit(offload(func, execution), limiter))
+        return func
+
+    return decorator
@@ -0,0 +1,363 @@
+"""Memoization of pure tools and prompts, and precompiled prompt templates."""
+
+import asyncio
+import functools
+import inspect
+import string
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from src.config import config
+
+from .execution import ExecutionPolicy, offload
+from .metrics import registry
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose entries also expire after a time to live.
+
+    Lookups refresh an entry's recency but not its age, so a popular entry
+    is still recomputed once per ``ttl``.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Entries kept before the least recently used is evicted
+            ttl: Seconds an entry stays valid (None keeps it until evicted)
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Get a cached value, or ``_MISSING`` (counting a hit or a miss)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if self.ttl is None or expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return _MISSING
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class _Uncacheable(Exception):
+    """Raised for an argument that cannot be turned into a key."""
+
+
+def _canonical(value: Any) -> Hashable:
+    """
+    Turn an argument value into a hashable key that ignores dict order.
+
+    Raises:
+        _Uncacheable: For unhashable values other than JSON containers, sets
+            and pydantic models. Their ``repr`` is not a safe key: NumPy
+            elides large arrays, so different arrays would share an entry.
+    """
+    if isinstance(value, dict):
+        return (
+            "dict",
+            tuple(sorted((str(k), _canonical(v)) for k, v in value.items())),
+        )
+    if isinstance(value, (list, tuple)):
+        return ("list", tuple(_canonical(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(_canonical(v) for v in value))
+    if hasattr(value, "model_dump"):
+        return _canonical(value.model_dump())
+    try:
+        hash(value)
+    except TypeError:
+        raise _Uncacheable(type(value).__name__) from None
+    # Keep 1 and 1.0 (and True) apart, since a function may tell them apart
+    return (type(value).__name__, value)
+
+
+def make_key(
+    signature: inspect.Signature, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> Optional[Hashable]:
+    """
+    Build the cache key for a call.
+
+    Arguments are bound to the signature with defaults applied, so
+    positional, keyword and omitted-default spellings of a call share an
+    entry. MCP ``Context`` arguments are left out.
+
+    Args:
+        signature: Signature of the memoized function
+        args: Positional arguments
+        kwargs: Keyword arguments
+
+    Returns:
+        A hashable key, or None when an argument (such as a NumPy array)
+        cannot be part of one and the call should not be cached
+    """
+    from mcp.server.fastmcp import Context
+
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    try:
+        return tuple(
+            (name, _canonical(value))
+            for name, value in bound.arguments.items()
+            if not isinstance(value, Context)
+        )
+    except _Uncacheable:
+        return None
+
+
+def memoize(func: Callable[..., Any], cache: TTLCache) -> Callable[..., Any]:
+    """
+    Wrap a pure function so repeated calls are served from a cache.
+
+    Exceptions are not cached. For coroutine functions, concurrent calls
+    with the same arguments share a single execution, which completes (and
+    is cached) even if its callers are cancelled. Cached values are
+    returned as is, so callers must not mutate them. Calls with arguments
+    that cannot be keyed are run without the cache.
+
+    Args:
+        func: The function (sync or async)
+        cache: Cache holding its results
+
+    Returns:
+        A wrapper of the same kind, with the same signature
+    """
+    signature = inspect.signature(func)
+
+    if not asyncio.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = make_key(signature, args, kwargs)
+            if key is None:
+                return func(*args, **kwargs)
+            value = cache.get(key)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        return wrapper
+
+    in_flight: Dict[Hashable, asyncio.Future] = {}
+
+    @functools.wraps(func)
+    async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+        key = make_key(signature, args, kwargs)
+        if key is None:
+            return await func(*args, **kwargs)
+        value = cache.get(key)
+        if value is not _MISSING:
+            return value
+        task = in_flight.get(key)
+        if task is None:
+            # Run the call as its own task so that a cancelled caller does
+            # not cancel it for the others waiting on the same result
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            in_flight[key] = task
+
+            def done(finished: asyncio.Future) -> None:
+                del in_flight[key]
+                if not finished.cancelled() and finished.exception() is None:
+                    cache.set(key, finished.result())
+
+            task.add_done_callback(done)
+        return await asyncio.shield(task)
+
+    return async_wrapper
+
+
+_caches: Dict[str, TTLCache] = {}
+
+
+def get_cache(
+    name: str, maxsize: Optional[int] = None, ttl: Optional[float] = None
+) -> TTLCache:
+    """
+    Create a named cache and report it in stats and metrics.
+
+    Args:
+        name: Cache name, e.g. ``tool:add``
+        maxsize: Entries kept (defaults to config.memo_cache_size)
+        ttl: Seconds an entry stays valid (defaults to config.memo_cache_ttl)
+
+    Returns:
+        The cache
+    """
+    cache = TTLCache(
+        maxsize=config.memo_cache_size if maxsize is None else maxsize,
+        ttl=config.memo_cache_ttl if ttl is None else ttl,
+    )
+    _caches[name] = cache
+    registry.register_cache(name, cache)
+    return cache
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get stats for every memoized tool and prompt, keyed by cache name."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def cached_tool(
+    server: Any,
+    maxsize: Optional[int] = None,
+    ttl: Optional[float] = None,
+    execution: ExecutionPolicy = ExecutionPolicy.INLINE,
+    **tool_kwargs: Any,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Register a pure tool whose results are cached by argument.
+
+    Use in place of ``@server.tool()`` for deterministic tools that are
+    expensive and called with repeated arguments. Cache hits skip
+    ``execution`` entirely, so an offloaded tool only reaches its pool on
+    a miss.
+
+    Args:
+        server: The FastMCP server to register the tool with
+        maxsize: Results kept (defaults to config.memo_cache_size)
+        ttl: Seconds a result stays valid (defaults to config.memo_cache_ttl)
+        execution: Where the tool runs on a cache miss
+        **tool_kwargs: Passed on to ``server.tool()`` (name, description, ...)
+
+    Returns:
+        A decorator that registers the tool and returns the function unchanged
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        name = tool_kwargs.get("name") or func.__name__
+        cache = get_cache(f"tool:{name}", maxsize, ttl)
+        server.tool(**tool_kwargs)(memoize(offload(func, execution), cache))
+        return func
+
+    return decorator
+
+
+def cached_prompt(
+    server: Any,
+    maxsize: Optional[int] = None,
+    ttl: Optional[float] = None,
+    **prompt_kwargs: Any,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Register a prompt whose rendered output is cached by argument.
+
+    Use in place of ``@server.prompt()``.
+
+    Args:
+        server: The FastMCP server to register the prompt with
+        maxsize: Renders kept (defaults to config.memo_cache_size)
+        ttl: Seconds a render stays valid (defaults to config.memo_cache_ttl)
+        **prompt_kwargs: Passed on to ``server.prompt()`` (name, description, ...)
+
+    Returns:
+        A decorator that registers the prompt and returns the function unchanged
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        name = prompt_kwargs.get("name") or func.__name__
+        cache = get_cache(f"prompt:{name}", maxsize, ttl)
+        server.prompt(**prompt_kwargs)(memoize(func, cache))
+        return func
+
+    return decorator
+
+
+class PromptTemplate:
+    """
+    A ``str.format``-style template compiled once into static segments.
+
+    Rendering joins the precomputed segments with the argument values
+    instead of re-parsing the template on every call. Only plain
+    ``{name}`` fields are supported; use ``{{`` and ``}}`` for braces.
+    """
+
+    def __init__(self, template: str) -> None:
+        """
+        Compile the template.
+
+        Args:
+            template: Template text with ``{name}`` fields
+
+        Raises:
+            ValueError: If a field is positional or uses a conversion or
+                format spec
+        """
+        self.template = template
+        self._segments: List[str] = []
+        # (index into segments, field name) for each placeholder
+        self._slots: List[Tuple[int, str]] = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(
+            template
+        ):
+            if literal:
+                self._segments.append(literal)
+            if field is None:
+                continue
+            if not field.isidentifier() or format_spec or conversion:
+                raise ValueError(f"Unsupported template field: {{{field}}}")
+            self._slots.append((len(self._segments), field))
+            self._segments.append("")
+        self.fields = frozenset(field for _, field in self._slots)
+
+    def render(self, **values: Any) -> str:
+        """
+        Render the template.
+
+        Args:
+            **values: A value for every field
+
+        Returns:
+            The rendered text
+
+        Raises:
+            KeyError: If a field has no value
+        """
+        segments = self._segments[:]
+        for index, field in self._slots:
+            segments[index] = str(values[field])
+        return "".join(segments)
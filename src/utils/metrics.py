@@ -0,0 +1,425 @@
+"""In-process metrics exposed in the Prometheus text format.
+
+Counters, gauges and histograms are updated from the event loop with plain
+attribute arithmetic, so recording a sample costs well under a
+microsecond. Values that other components already track (pool usage,
+cache hits, queue lengths) are not mirrored on the hot path; they are read
+by collectors when ``/metrics`` is scraped.
+"""
+
+import time
+from bisect import bisect_left
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from sub-millisecond tool calls to slow upstreams
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+Labels = Dict[str, str]
+
+
+class MetricFamily(NamedTuple):
+    """A metric and its samples, as produced by a collector."""
+
+    name: str
+    type: str
+    help: str
+    samples: List[Tuple[Labels, float]]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the counter."""
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the gauge."""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrease the gauge."""
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Set the gauge."""
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric:
+    """Base class for metrics with optional labels."""
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def labels(self, *values: str) -> Any:
+        """
+        Get the child for a combination of label values.
+
+        Callers on hot paths should keep the returned child rather than
+        looking it up on every update.
+        """
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def _label_dict(self, key: Tuple[str, ...]) -> Labels:
+        return dict(zip(self.labelnames, key))
+
+    def collect(self) -> Iterable[MetricFamily]:
+        """Produce the metric's current samples."""
+        yield MetricFamily(
+            self.name,
+            self.type,
+            self.help,
+            [
+                (self._label_dict(key), child.value)
+                for key, child in self._children.items()
+            ],
+        )
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    type = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increase the unlabelled counter."""
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """A value that can go up and down."""
+
+    type = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        """Set the unlabelled gauge."""
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Counts observations into cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record one observation in the unlabelled histogram."""
+        self.labels().observe(value)
+
+    def collect(self) -> Iterable[MetricFamily]:
+        """Produce bucket, sum and count samples."""
+        samples: List[Tuple[Labels, float]] = []
+        for key, child in self._children.items():
+            labels = self._label_dict(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                samples.append(({**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(({**labels, "__suffix__": "_sum"}, child.sum))
+            samples.append(({**labels, "__suffix__": "_count"}, cumulative))
+        yield MetricFamily(self.name, self.type, self.help, samples)
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class MetricsRegistry:
+    """Holds metrics and scrape-time collectors, and renders them."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+        self._caches: Dict[str, Any] = {}
+
+    def _get_or_create(self, cls: type, name: str, *args: Any, **kwargs: Any) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, *args, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already registered as a {metric.type}")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def register_collector(self, collector: Collector) -> None:
+        """Add a callable that produces metric families at scrape time."""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def register_cache(self, name: str, cache: Any) -> None:
+        """
+        Report a cache's hit ratio.
+
+        Args:
+            name: Value of the ``cache`` label
+            cache: Object with integer ``hits`` and ``misses`` attributes
+        """
+        self._caches[name] = cache
+
+    def _collect_caches(self) -> Iterable[MetricFamily]:
+        if not self._caches:
+            return
+        hits, misses, ratios = [], [], []
+        for name, cache in self._caches.items():
+            labels = {"cache": name}
+            total = cache.hits + cache.misses
+            hits.append((labels, cache.hits))
+            misses.append((labels, cache.misses))
+            ratios.append((labels, cache.hits / total if total else 0.0))
+        yield MetricFamily("mcp_cache_hits_total", "counter", "Cache hits.", hits)
+        yield MetricFamily("mcp_cache_misses_total", "counter", "Cache misses.", misses)
+        yield MetricFamily(
+            "mcp_cache_hit_ratio", "gauge", "Cache hits over lookups.", ratios
+        )
+
+    def collect(self) -> Iterable[MetricFamily]:
+        """Produce every metric family, skipping collectors that fail."""
+        for metric in self._metrics.values():
+            yield from metric.collect()
+        yield from self._collect_caches()
+        for collector in self._collectors:
+            try:
+                yield from list(collector())
+            except Exception:
+                # A broken collector must not take the whole scrape down
+                continue
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for labels, value in family.samples:
+                suffix = ""
+                if family.type == "histogram":
+                    labels = dict(labels)
+                    suffix = labels.pop("__suffix__", "_bucket")
+                lines.append(
+                    f"{family.name}{suffix}{_format_labels(labels)} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+registry = MetricsRegistry()
+
+TOOL_CALLS = registry.counter("mcp_tool_calls_total", "Tool calls.", ["tool"])
+TOOL_ERRORS = registry.counter(
+    "mcp_tool_errors_total", "Tool calls that raised an error.", ["tool"]
+)
+TOOL_DURATION = registry.histogram(
+    "mcp_tool_duration_seconds", "Tool call latency.", ["tool"]
+)
+TOOL_IN_FLIGHT = registry.gauge(
+    "mcp_tool_in_flight", "Tool calls currently running.", ["tool"]
+)
+UPSTREAM_REQUESTS = registry.counter(
+    "mcp_upstream_requests_total",
+    "Requests to upstream APIs by response status.",
+    ["upstream", "method", "status"],
+)
+UPSTREAM_DURATION = registry.histogram(
+    "mcp_upstream_request_duration_seconds",
+    "Upstream API request latency.",
+    ["upstream", "method"],
+)
+
+# Label used for calls to tools that do not exist, to bound cardinality
+UNKNOWN_TOOL = "_unknown"
+
+
+def instrument_tools(server: Any) -> None:
+    """
+    Record call counts, errors, latency and in-flight calls for every tool.
+
+    Wraps the server's tool manager, so tools registered before or after
+    this call and calls arriving over any transport are all covered.
+
+    Args:
+        server: The FastMCP server to instrument
+    """
+    manager = server._tool_manager
+    if getattr(manager, "_instrumented", False):
+        return
+    call_tool = manager.call_tool
+    children: Dict[str, Tuple[Any, Any, Any, Any]] = {}
+
+    async def instrumented_call_tool(
+        name: str, arguments: Dict[str, Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        metrics = children.get(name)
+        if metrics is None:
+            label = name if manager.get_tool(name) is not None else UNKNOWN_TOOL
+            metrics = children.setdefault(
+                label,
+                (
+                    TOOL_CALLS.labels(label),
+                    TOOL_ERRORS.labels(label),
+                    TOOL_DURATION.labels(label),
+                    TOOL_IN_FLIGHT.labels(label),
+                ),
+            )
+        calls, errors, duration, in_flight = metrics
+        calls.value += 1
+        in_flight.value += 1
+        start = time.perf_counter()
+        try:
+            return await call_tool(name, arguments, *args, **kwargs)
+        except BaseException:
+            errors.value += 1
+            raise
+        finally:
+            duration.observe(time.perf_counter() - start)
+            in_flight.value -= 1
+
+    manager.call_tool = instrumented_call_tool
+    manager._instrumented = True
+
+
+def record_upstream(
+    upstream: str, method: str, status: Optional[int], seconds: float
+) -> None:
+    """
+    Record one upstream API request.
+
+    Args:
+        upstream: Upstream host
+        method: HTTP method
+        status: Response status code, or None if no response was received
+        seconds: Request duration
+    """
+    UPSTREAM_REQUESTS.labels(
+        upstream, method, str(status) if status is not None else "error"
+    ).inc()
+    UPSTREAM_DURATION.labels(upstream, method).observe(seconds)
+
+
+async def metrics_endpoint(request: Any) -> Any:
+    """Starlette endpoint serving the registry in the Prometheus text format."""
+    from starlette.responses import Response
+
+    return Response(registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,144 @@
+"""On-demand sampling profiler producing collapsed stacks.
+
+The sampler runs in its own thread and periodically snapshots the Python
+stack of every other thread with ``sys._current_frames()``, so the event
+loop is profiled while it keeps serving requests and nothing has to be
+installed or redeployed. The output is the "collapsed" format consumed by
+flamegraph.pl, speedscope and similar tools: one line per unique stack,
+frames separated by ``;`` from the thread down to the leaf, followed by
+the number of samples.
+"""
+
+import asyncio
+import hmac
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Longest profile a single request may ask for
+MAX_PROFILE_SECONDS = 120.0
+
+_busy = threading.Lock()
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{code.co_name}:{code.co_firstlineno}"
+
+
+def sample_stacks(seconds: float, interval: float = 0.005) -> Dict[str, int]:
+    """
+    Sample the stacks of every thread for a while.
+
+    Args:
+        seconds: How long to sample
+        interval: Seconds between samples
+
+    Returns:
+        Sample counts keyed by collapsed stack
+    """
+    own = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.append(names.get(ident) or f"thread-{ident}")
+            counts[";".join(reversed(stack))] += 1
+        time.sleep(interval)
+    return dict(counts)
+
+
+def collapsed(counts: Dict[str, int]) -> str:
+    """Render sample counts in the collapsed-stack format."""
+    lines = [
+        f"{stack} {count}"
+        for stack, count in sorted(counts.items(), key=lambda item: -item[1])
+    ]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def profile(seconds: float, interval: float = 0.005) -> Optional[str]:
+    """
+    Run a profile, unless another one is already running.
+
+    Blocks for ``seconds``; call it from a worker thread when serving.
+
+    Args:
+        seconds: How long to sample (capped at MAX_PROFILE_SECONDS)
+        interval: Seconds between samples
+
+    Returns:
+        Collapsed stacks, or None if a profile is already in progress
+    """
+    if not _busy.acquire(blocking=False):
+        return None
+    try:
+        return collapsed(sample_stacks(min(seconds, MAX_PROFILE_SECONDS), interval))
+    finally:
+        _busy.release()
+
+
+def profile_endpoint(token: str) -> Callable[[Any], Awaitable[Any]]:
+    """
+    Build the admin endpoint that runs a profile and returns collapsed stacks.
+
+    ``GET <path>?seconds=30&interval=0.005`` with ``Authorization: Bearer
+    <token>``. Answers 401 without the token and 409 while another profile
+    is running.
+
+    Args:
+        token: Shared secret required in the Authorization header
+
+    Returns:
+        A Starlette endpoint
+    """
+    from starlette.responses import PlainTextResponse
+
+    expected = f"Bearer {token}".encode()
+
+    async def endpoint(request: Any) -> Any:
+        supplied = request.headers.get("authorization", "").encode()
+        if not hmac.compare_digest(supplied, expected):
+            return PlainTextResponse("Unauthorized\n", status_code=401)
+        try:
+            seconds = float(request.query_params.get("seconds", "10"))
+            interval = float(request.query_params.get("interval", "0.005"))
+        except ValueError:
+            return PlainTextResponse("Invalid seconds or interval\n", status_code=400)
+        if seconds <= 0 or interval <= 0:
+            return PlainTextResponse("Invalid seconds or interval\n", status_code=400)
+        stacks = await asyncio.to_thread(profile, seconds, interval)
+        if stacks is None:
+            return PlainTextResponse("A profile is already running\n", status_code=409)
+        return PlainTextResponse(stacks)
+
+    return endpoint
+
+
+def profile_to_file(seconds: float, path: str, interval: float = 0.005) -> None:
+    """
+    Profile in a background thread and write the collapsed stacks to a file.
+
+    Args:
+        seconds: How long to sample
+        path: File to write when done
+        interval: Seconds between samples
+    """
+
+    def run() -> None:
+        stacks = profile(seconds, interval) or ""
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(stacks)
+
+    threading.Thread(target=run, name="mcp-profiler", daemon=True).start()
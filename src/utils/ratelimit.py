@@ -0,0 +1,118 @@
+"""Rate limits shared by every server replica."""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from mcp import types
+from mcp.shared.exceptions import McpError
+
+from src.config import config
+
+from .deadline import remaining
+from .limits import OVERLOADED
+from .state import Bucket, StateBackend, get_state_backend
+
+# RateLimitConfig fields and the window each one covers, in seconds
+WINDOWS = (
+    ("requests_per_minute", 60.0),
+    ("requests_per_hour", 3600.0),
+    ("requests_per_day", 86400.0),
+)
+
+
+class RateLimiter:
+    """
+    Token buckets for each configured window, taken from together.
+
+    A request takes a token from every window's bucket in one atomic step
+    on the state backend, so replicas sharing a backend share the limit. A
+    request that would exceed it waits for a token when that takes at most
+    ``max_wait`` seconds (and fits the request deadline), and is otherwise
+    rejected with a retryable error.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limits: Any,
+        backend: Optional[StateBackend] = None,
+        max_wait: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Name of what is limited, e.g. an upstream host
+            limits: A ``RateLimitConfig`` (or any object with its fields)
+            backend: Where the buckets live (defaults to the configured
+                state backend)
+            max_wait: Longest wait for a token before rejecting (defaults to
+                config.rate_limit_max_wait)
+        """
+        self.name = name
+        self.buckets: List[Bucket] = []
+        for field, seconds in WINDOWS:
+            count = getattr(limits, field, None)
+            if count:
+                # A hash tag keeps a limiter's keys on one Redis Cluster slot
+                key = f"ratelimit:{{{name}}}:{int(seconds)}"
+                self.buckets.append((key, count / seconds, float(count)))
+        self._backend = backend
+        self.max_wait = config.rate_limit_max_wait if max_wait is None else max_wait
+        self.allowed = 0
+        self.rejected = 0
+
+    @property
+    def backend(self) -> StateBackend:
+        if self._backend is None:
+            self._backend = get_state_backend()
+        return self._backend
+
+    async def acquire(self) -> None:
+        """
+        Take a token, waiting briefly if one is about to be available.
+
+        Raises:
+            McpError: If the limit is exceeded for longer than the caller
+                can wait
+        """
+        if not self.buckets:
+            return
+        while True:
+            wait = await self.backend.take(self.buckets)
+            if wait <= 0:
+                self.allowed += 1
+                return
+            left = remaining()
+            if wait > self.max_wait or (left is not None and wait >= left):
+                self.rejected += 1
+                raise rate_limited_error(self.name, wait)
+            await asyncio.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get allowed and rejected counts."""
+        return {"allowed": self.allowed, "rejected": self.rejected}
+
+
+def rate_limited_error(name: str, retry_after: float) -> McpError:
+    """
+    Build the retryable error returned when a rate limit is exceeded.
+
+    Args:
+        name: Name of the limiter
+        retry_after: Seconds until a request would be allowed
+
+    Returns:
+        The error to raise
+    """
+    return McpError(
+        types.ErrorData(
+            code=OVERLOADED,
+            message=f"Rate limit for {name} exceeded; retry later",
+            data={
+                "retryable": True,
+                "reason": "rate_limited",
+                "retryAfter": round(retry_after, 3),
+            },
+        )
+    )
@@ -0,0 +1,375 @@
+"""Bounded storage for large tool results, read back one page at a time.
+
+A tool result holding a long list is not sent whole. The list's items are
+serialized once and stored under an unguessable handle, and the tool
+returns the first page of items with a ``result_page`` entry describing the
+handle. Further pages are sliced out of the stored bytes by item offset,
+so serving a page never decodes or re-encodes the result.
+
+Stored results live in memory up to a budget; older ones overflow to files
+and the oldest are dropped once the disk budget is used up. Every result
+expires after a TTL.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import secrets
+import shutil
+import tempfile
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.config import config
+from src.utils.codec import convert_tool_result, dumps
+from src.utils.execution import get_thread_pool
+
+logger = logging.getLogger(__name__)
+
+# Key added to paged results
+RESULT_PAGE = "result_page"
+
+
+@dataclass
+class _Entry:
+    """A stored result: its items joined by commas, and where each starts."""
+
+    offsets: array
+    size: int
+    expires: float
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets) - 1
+
+
+class SpillStore:
+    """
+    Keeps serialized results in memory, overflowing to files.
+
+    Results are stored as their items' JSON joined by commas, with the
+    offset each item starts at, so any run of items is one slice. When the
+    memory budget is exceeded the oldest results are written to files in
+    ``directory``; when the disk budget is exceeded the oldest files are
+    deleted. Handles are random tokens and are the only key to a result.
+    """
+
+    def __init__(
+        self,
+        memory_limit: Optional[int] = None,
+        disk_limit: Optional[int] = None,
+        ttl: Optional[float] = None,
+        directory: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            memory_limit: Bytes of results kept in memory (defaults to
+                config.result_spill_memory)
+            disk_limit: Bytes of results kept in overflow files (defaults to
+                config.result_spill_disk; 0 disables overflow)
+            ttl: Seconds a result can be read for (defaults to
+                config.result_spill_ttl)
+            directory: Where overflow files are written (defaults to
+                config.result_spill_dir, or a temporary directory)
+        """
+        self.memory_limit = (
+            config.result_spill_memory if memory_limit is None else memory_limit
+        )
+        self.disk_limit = config.result_spill_disk if disk_limit is None else disk_limit
+        self.ttl = config.result_spill_ttl if ttl is None else ttl
+        self._directory = directory or config.result_spill_dir
+        self._own_directory = False
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = asyncio.Lock()
+        self.memory_used = 0
+        self.disk_used = 0
+        self.spilled = 0
+        self.evicted = 0
+
+    def _directory_path(self) -> str:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="mcp-spill-")
+            self._own_directory = True
+        os.makedirs(self._directory, exist_ok=True)
+        return self._directory
+
+    def _drop(self, handle: str) -> None:
+        entry = self._entries.pop(handle)
+        if entry.data is not None:
+            self.memory_used -= entry.size
+        if entry.path is not None:
+            self.disk_used -= entry.size
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        expired = [h for h, entry in self._entries.items() if entry.expires <= now]
+        for handle in expired:
+            self._drop(handle)
+
+    async def put(self, items: Sequence[bytes]) -> Optional[str]:
+        """
+        Store a result's serialized items.
+
+        Args:
+            items: Each item's JSON
+
+        Returns:
+            The handle to read pages with, or None if the result fits
+            neither budget
+        """
+        offsets = array("Q", [0])
+        for item in items:
+            offsets.append(offsets[-1] + len(item) + 1)
+        size = offsets[-1]
+        if size > max(self.memory_limit, self.disk_limit):
+            return None
+        handle = secrets.token_urlsafe(16)
+        async with self._lock:
+            self._expire()
+            self._entries[handle] = _Entry(
+                offsets, size, time.monotonic() + self.ttl, data=b",".join(items)
+            )
+            self.memory_used += size
+            await self._overflow()
+        return handle
+
+    async def _overflow(self) -> None:
+        """Move the oldest results to disk until memory is within budget."""
+        loop = asyncio.get_running_loop()
+        for handle, entry in list(self._entries.items()):
+            if self.memory_used <= self.memory_limit:
+                break
+            if entry.data is None:
+                continue
+            if entry.size > self.disk_limit:
+                self._drop(handle)
+                self.evicted += 1
+                continue
+            while self.disk_used + entry.size > self.disk_limit:
+                oldest = next(h for h, e in self._entries.items() if e.path is not None)
+                self._drop(oldest)
+                self.evicted += 1
+            path = os.path.join(self._directory_path(), handle)
+            await loop.run_in_executor(
+                get_thread_pool(), functools.partial(_write_file, path, entry.data)
+            )
+            if handle not in self._entries:
+                # Expired while it was being written
+                os.unlink(path)
+                continue
+            entry.path, entry.data = path, None
+            self.memory_used -= entry.size
+            self.disk_used += entry.size
+            self.spilled += 1
+
+    async def page(
+        self, handle: str, offset: int, limit: int
+    ) -> Tuple[bytes, int, Optional[int]]:
+        """
+        Read a run of items from a stored result.
+
+        Args:
+            handle: Handle returned by ``put``
+            offset: Index of the first item
+            limit: Most items returned
+
+        Returns:
+            (JSON array of the items, total items, offset of the next page
+            or None after the last one)
+
+        Raises:
+            ValueError: If the handle is unknown or expired, or the offset
+                is out of range
+        """
+        self._expire()
+        entry = self._entries.get(handle)
+        if entry is None:
+            raise ValueError("Unknown or expired result handle")
+        if offset < 0 or offset > entry.count or limit < 1:
+            raise ValueError(f"Offset must be between 0 and {entry.count}")
+        end = min(offset + limit, entry.count)
+        start, stop = entry.offsets[offset], entry.offsets[end] - 1
+        if end == offset:
+            data = b""
+        elif entry.data is not None:
+            data = entry.data[start:stop]
+        else:
+            loop = asyncio.get_running_loop()
+            try:
+                data = await loop.run_in_executor(
+                    get_thread_pool(),
+                    functools.partial(_read_file, entry.path, start, stop - start),
+                )
+            except FileNotFoundError:
+                raise ValueError("Unknown or expired result handle") from None
+        return b"[" + data + b"]", entry.count, end if end < entry.count else None
+
+    def close(self) -> None:
+        """Drop every result and remove the overflow directory if it was created."""
+        for handle in list(self._entries):
+            self._drop(handle)
+        if self._own_directory and self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+            self._own_directory = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the store's usage counters."""
+        return {
+            "results": len(self._entries),
+            "memory_bytes": self.memory_used,
+            "disk_bytes": self.disk_used,
+            "spilled": self.spilled,
+            "evicted": self.evicted,
+        }
+
+
+def _write_file(path: str, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read_file(path: str, start: int, length: int) -> bytes:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.pread(fd, length, start)
+    finally:
+        os.close(fd)
+
+
+_spill_store: Optional[SpillStore] = None
+
+
+def get_spill_store() -> SpillStore:
+    """Get the result spill store, creating it on first use."""
+    global _spill_store
+    if _spill_store is None:
+        _spill_store = SpillStore()
+    return _spill_store
+
+
+def close_spill_store() -> None:
+    """Drop stored results and their overflow files."""
+    global _spill_store
+    if _spill_store is not None:
+        _spill_store.close()
+        _spill_store = None
+
+
+def _pageable(result: Any) -> Tuple[Optional[str], Optional[List[Any]]]:
+    """Find the list a result is paged by: itself, or its longest list value."""
+    if isinstance(result, list):
+        return None, result
+    if isinstance(result, dict):
+        lists = [(k, v) for k, v in result.items() if isinstance(v, list)]
+        if lists:
+            return max(lists, key=lambda kv: len(kv[1]))
+    return None, None
+
+
+async def page_result(
+    result: Any,
+    store: SpillStore,
+    page_items: Optional[int] = None,
+    threshold: Optional[int] = None,
+) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """
+    Replace a large result's list with its first page.
+
+    A result is paged when it is a list, or a dict holding a list, with
+    more than ``page_items`` items whose JSON adds up to ``threshold``
+    bytes or more.
+
+    Args:
+        result: A tool's return value
+        store: Where the full list is stored
+        page_items: Items on the first page (defaults to
+            config.result_page_items)
+        threshold: Smallest serialized list that is paged (defaults to
+            config.result_spill_threshold)
+
+    Returns:
+        (the result, possibly with its list cut to the first page, the
+        ``result_page`` description or None if the result was not paged)
+    """
+    page_items = page_items or config.result_page_items
+    threshold = config.result_spill_threshold if threshold is None else threshold
+    field, items = _pageable(result)
+    if items is None or len(items) <= page_items:
+        return result, None
+    encoded = [dumps(item) for item in items]
+    if sum(len(data) for data in encoded) < threshold:
+        return result, None
+    handle = await store.put(encoded)
+    if handle is None:
+        logger.warning(f"Result of {len(items)} items is too large to page")
+        return result, None
+    page = {
+        "handle": handle,
+        "field": field,
+        "total": len(items),
+        "next_offset": page_items,
+        "expires_in": store.ttl,
+    }
+    first = items[:page_items]
+    if field is None:
+        return first, page
+    return {**result, field: first, RESULT_PAGE: page}, page
+
+
+def spill_large_results(server: Any, store: Optional[SpillStore] = None) -> None:
+    """
+    Page the large results of every tool on a server.
+
+    Results that ``page_result`` pages are sent as their first page, with a
+    ``result_page`` entry (in the result itself for dicts, next to it for
+    lists) holding the handle further pages are fetched with.
+
+    Args:
+        server: The FastMCP server
+        store: Where results are stored (defaults to the shared store)
+    """
+    from mcp.types import TextContent
+
+    manager = server._tool_manager
+    if getattr(manager, "_spill", False):
+        return
+    call_tool = manager.call_tool
+
+    async def spilling_call_tool(
+        name: str,
+        arguments: Dict[str, Any],
+        context: Any = None,
+        convert_result: bool = False,
+    ) -> Any:
+        result = await call_tool(name, arguments, context=context, convert_result=False)
+        result, page = await page_result(result, store or get_spill_store())
+        if not convert_result:
+            return result
+        converted = convert_tool_result(manager.get_tool(name), result)
+        if page is None or isinstance(result, dict):
+            return converted
+        # A paged list has nowhere to hold the handle; send it alongside
+        description = {RESULT_PAGE: page}
+        text = TextContent(type="text", text=dumps(description).decode("utf-8"))
+        if isinstance(converted, tuple):
+            content, structured = converted
+            if isinstance(structured, dict):
+                structured = {**structured, **description}
+            return [*content, text], structured
+        return [*converted, text]
+
+    manager.call_tool = spilling_call_tool
+    manager._spill = True
@@ -0,0 +1,142 @@
+"""Startup profiling for the MCP server."""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+# "import time:       123 |        456 |   package.module"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    """Run a snippet in a fresh interpreter rooted at the current directory."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [os.getcwd(), env.get("PYTHONPATH")])
+    )
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def measure_imports(module: str = "src.main") -> List[Tuple[str, float, float, int]]:
+    """
+    Measure per-module import times in a fresh interpreter.
+
+    Args:
+        module: The module to import
+
+    Returns:
+        List of (module, self ms, cumulative ms, nesting depth) tuples in
+        import order
+    """
+    result = _run_python(f"import {module}", "-X", "importtime")
+    timings = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            depth = max(len(indent) - 1, 0) // 2
+            timings.append(
+                (name, int(self_us) / 1000, int(cumulative_us) / 1000, depth)
+            )
+    return timings
+
+
+def measure_import_time(module: str = "src.main") -> float:
+    """
+    Measure the wall-clock time to import a module in a fresh interpreter.
+
+    Args:
+        module: The module to import
+
+    Returns:
+        Import time in milliseconds
+    """
+    result = _run_python(
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print((time.perf_counter() - start) * 1000)"
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+class StartupProfile:
+    """Collects import and initialization timings for a startup report."""
+
+    def __init__(self) -> None:
+        """Initialize an empty profile."""
+        self.imports: List[Tuple[str, float, float, int]] = []
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time an initialization phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (time.perf_counter() - start) * 1000
+
+    def report(self, top: int = 25, budget_ms: Optional[float] = None) -> str:
+        """
+        Format the profile as a plain-text report.
+
+        Args:
+            top: Number of slowest top-level imports to list
+            budget_ms: Optional startup budget to compare against
+
+        Returns:
+            The report text
+        """
+        lines = ["Imports (top-level, by cumulative time):"]
+        top_level = [entry for entry in self.imports if entry[3] == 0]
+        import_total = sum(entry[2] for entry in top_level)
+        for name, self_ms, cumulative_ms, _ in sorted(
+            top_level, key=lambda entry: entry[2], reverse=True
+        )[:top]:
+            lines.append(f"  {cumulative_ms:9.1f} ms  (self {self_ms:7.1f} ms)  {name}")
+        lines.append(f"  {import_total:9.1f} ms  total")
+        lines.append("Initialization:")
+        for name, elapsed in self.phases.items():
+            lines.append(f"  {elapsed:9.1f} ms  {name}")
+        total = import_total + sum(self.phases.values())
+        lines.append(f"Startup total: {total:.1f} ms")
+        if budget_ms is not None:
+            verdict = "within" if total <= budget_ms else "OVER"
+            lines.append(f"Budget: {budget_ms:.1f} ms ({verdict} budget)")
+        return "\n".join(lines)
+
+
+def profile_startup(
+    phases: Mapping[str, Callable[[], object]],
+    module: str = "src.main",
+) -> StartupProfile:
+    """
+    Profile server startup.
+
+    Imports are measured in a fresh interpreter so modules already loaded in
+    this process do not hide their cost; initialization phases run here.
+
+    Args:
+        phases: Named initialization steps to time, in order
+        module: The entry-point module to import
+
+    Returns:
+        The collected profile
+    """
+    profile = StartupProfile()
+    profile.imports = measure_imports(module)
+    for name, initialize in phases.items():
+        with profile.phase(name):
+            initialize()
+    return profile
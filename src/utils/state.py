@@ -0,0 +1,373 @@
+"""Shared state for rate limits and caches across server replicas.
+
+Token buckets and cached values live in a ``StateBackend``. The in-process
+``MemoryBackend`` is the default; with ``MCP_STATE_URL`` set, every replica
+uses the same Redis (or Redis-protocol) server through ``RedisBackend``,
+so a rate limit holds for the whole deployment and a value cached by one
+replica is served by all of them.
+
+The shared store is never a single point of failure: while it cannot be
+reached, ``RedisBackend`` falls back to a local backend, enforcing
+``config.state_local_share`` of each rate limit in every process.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from src.config import config
+
+from .codec import dumps, loads
+from .memo import TTLCache, get_cache
+
+logger = logging.getLogger(__name__)
+
+# (key, tokens added per second, capacity)
+Bucket = Tuple[str, float, float]
+
+# Refills and takes from every bucket in KEYS atomically, using the server's
+# clock so replicas with skewed clocks agree. Tokens are only taken when all
+# buckets have enough; otherwise the wait until they do is returned.
+_TOKEN_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local cost = tonumber(ARGV[1])
+local wait = 0
+local levels = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i])
+    local capacity = tonumber(ARGV[2 * i + 1])
+    local bucket = redis.call('HMGET', key, 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    levels[i] = tokens
+    if tokens < cost then
+        wait = math.max(wait, (cost - tokens) / rate)
+    end
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[2 * i])
+    local capacity = tonumber(ARGV[2 * i + 1])
+    local tokens = levels[i]
+    if wait == 0 then
+        tokens = tokens - cost
+    end
+    redis.call('HSET', key, 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000) + 1000)
+end
+return tostring(wait)
+"""
+
+
+class StateBackend:
+    """Storage for token buckets and cached values."""
+
+    name = "base"
+
+    async def take(self, buckets: Sequence[Bucket], cost: float = 1.0) -> float:
+        """
+        Take ``cost`` tokens from every bucket, or from none of them.
+
+        Args:
+            buckets: The buckets, as (key, refill rate per second, capacity)
+            cost: Tokens to take from each
+
+        Returns:
+            0 if the tokens were taken, otherwise the seconds until they
+            can be
+        """
+        raise NotImplementedError
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a cached value, or None."""
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Cache a value for ``ttl`` seconds."""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release connections."""
+
+
+class MemoryBackend(StateBackend):
+    """Token buckets and a bounded cache kept in this process."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = 10000) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            maxsize: Cached values kept before the least recently used is
+                evicted
+        """
+        self.maxsize = maxsize
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._values: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    async def take(self, buckets: Sequence[Bucket], cost: float = 1.0) -> float:
+        now = time.monotonic()
+        wait = 0.0
+        levels: List[float] = []
+        for key, rate, capacity in buckets:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+            levels.append(tokens)
+            if tokens < cost:
+                wait = max(wait, (cost - tokens) / rate)
+        for (key, _, _), tokens in zip(buckets, levels):
+            self._buckets[key] = (tokens - cost if wait == 0 else tokens, now)
+        return wait
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._values[key]
+            return None
+        self._values.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._values[key] = (time.monotonic() + ttl, value)
+        self._values.move_to_end(key)
+        if len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+
+
+class RedisBackend(StateBackend):
+    """
+    Token buckets and cached values in a Redis-protocol server.
+
+    A take is one ``EVALSHA`` of a Lua script that refills and debits every
+    bucket atomically on the server; a cache read or write is one command.
+    When the server cannot be reached, operations go to ``fallback`` for
+    ``retry_interval`` seconds before the server is tried again, with rate
+    limits scaled by ``local_share``.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client: Any = None,
+        prefix: str = "mcp:",
+        fallback: Optional[StateBackend] = None,
+        local_share: Optional[float] = None,
+        retry_interval: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            url: Server URL, e.g. ``redis://cache:6379/0`` (ignored when
+                ``client`` is given)
+            client: An existing ``redis.asyncio`` compatible client
+            prefix: Prefix of every key, so deployments can share a server
+            fallback: Backend used while the server is unavailable
+                (defaults to a new ``MemoryBackend``)
+            local_share: Fraction of each rate limit enforced by the fallback
+                (defaults to config.state_local_share)
+            retry_interval: Seconds before an unavailable server is tried
+                again (defaults to config.state_retry_interval)
+            timeout: Seconds before a command counts as failed (defaults to
+                config.state_timeout)
+        """
+        self.timeout = config.state_timeout if timeout is None else timeout
+        if client is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError as e:
+                raise ImportError(
+                    "MCP_STATE_URL needs the redis package; "
+                    'install it with pip install -e ".[redis]"'
+                ) from e
+            client = redis.from_url(
+                url,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout,
+            )
+        self.client = client
+        self.prefix = prefix
+        self.fallback = fallback or MemoryBackend()
+        self.local_share = (
+            config.state_local_share if local_share is None else local_share
+        )
+        self.retry_interval = (
+            config.state_retry_interval if retry_interval is None else retry_interval
+        )
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+        self._down_until = 0.0
+        self.failures = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether the server is currently used (rather than the fallback)."""
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, error: BaseException) -> None:
+        self.failures += 1
+        if self.available:
+            logger.warning(
+                f"Shared state unavailable, using local state for "
+                f"{self.retry_interval}s: {error!r}"
+            )
+        self._down_until = time.monotonic() + self.retry_interval
+
+    async def _call(self, command: Any) -> Any:
+        return await asyncio.wait_for(command, self.timeout)
+
+    async def take(self, buckets: Sequence[Bucket], cost: float = 1.0) -> float:
+        if self.available:
+            keys = [self.prefix + key for key, _, _ in buckets]
+            args: List[Any] = [cost]
+            for _, rate, capacity in buckets:
+                args += [rate, capacity]
+            try:
+                return float(await self._call(self._script(keys=keys, args=args)))
+            except Exception as e:
+                self._failed(e)
+        share = self.local_share
+        return await self.fallback.take(
+            [
+                (key, rate * share, max(1.0, capacity * share))
+                for key, rate, capacity in buckets
+            ],
+            cost,
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if not self.available:
+            return await self.fallback.get(key)
+        try:
+            return await self._call(self.client.get(self.prefix + key))
+        except Exception as e:
+            self._failed(e)
+            return await self.fallback.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        if not self.available:
+            await self.fallback.set(key, value, ttl)
+            return
+        try:
+            await self._call(
+                self.client.set(self.prefix + key, value, px=max(1, int(ttl * 1000)))
+            )
+        except Exception as e:
+            self._failed(e)
+            await self.fallback.set(key, value, ttl)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+_backend: Optional[StateBackend] = None
+
+
+def get_state_backend() -> StateBackend:
+    """Get the shared state backend, creating it on first use."""
+    global _backend
+    if _backend is None:
+        if config.state_url:
+            _backend = RedisBackend(config.state_url)
+        else:
+            _backend = MemoryBackend()
+        logger.debug(f"Using the {_backend.name} state backend")
+    return _backend
+
+
+async def close_state_backend() -> None:
+    """Close the shared state backend if it was created."""
+    global _backend
+    if _backend is not None:
+        await _backend.close()
+        _backend = None
+
+
+class SharedCache:
+    """
+    Two-level cache: a local LRU in front of the shared backend.
+
+    Values are JSON-encoded once and stored under a digest of their key, so
+    any replica can serve a value another one computed. Local hits never
+    touch the backend. Both levels keep the encoded value and every get
+    decodes a fresh copy, so callers may modify what they are given.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        maxsize: Optional[int] = None,
+        backend: Optional[StateBackend] = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            name: Namespace of the cache's keys, also its name in /metrics
+            ttl: Seconds a value is served for
+            maxsize: Values kept locally (defaults to config.memo_cache_size)
+            backend: Shared backend (defaults to the configured one)
+        """
+        self.name = name
+        self.ttl = ttl
+        self.local: TTLCache = get_cache(
+            f"shared:{name}", maxsize or config.memo_cache_size, ttl
+        )
+        self._backend = backend
+        self.shared_hits = 0
+
+    @property
+    def backend(self) -> StateBackend:
+        if self._backend is None:
+            self._backend = get_state_backend()
+        return self._backend
+
+    def _key(self, key: Hashable) -> Tuple[str, str]:
+        digest = hashlib.blake2b(dumps(key), digest_size=16).hexdigest()
+        return digest, f"cache:{self.name}:{digest}"
+
+    async def get(self, key: Any) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: JSON-serializable key
+
+        Returns:
+            The value, or None on a miss
+        """
+        digest, shared_key = self._key(key)
+        data = self.local.get(digest)
+        if isinstance(data, bytes):
+            return loads(data)
+        data = await self.backend.get(shared_key)
+        if data is None:
+            return None
+        self.shared_hits += 1
+        self.local.set(digest, data)
+        return loads(data)
+
+    async def set(self, key: Any, value: Any) -> None:
+        """
+        Cache a value locally and in the shared backend.
+
+        Args:
+            key: JSON-serializable key
+            value: JSON-serializable value
+        """
+        digest, shared_key = self._key(key)
+        data = dumps(value)
+        self.local.set(digest, data)
+        await self.backend.set(shared_key, data, self.ttl)
@@ -0,0 +1,425 @@
+"""Lightweight request tracing with OTLP JSON export.
+
+Each tool call starts a trace; database statements, row conversion and
+upstream HTTP calls made while serving it are recorded as child spans.
+Spans are batched and exported as OTLP/JSON ``ExportTraceServiceRequest``
+payloads, either appended to a local JSON Lines file or posted to a
+collector's ``/v1/traces`` endpoint.
+
+Outside a sampled trace, ``span()`` returns a shared no-op context
+manager after at most one context variable lookup, so instrumented code
+paths stay cheap when tracing is off.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import random
+import time
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SpanKind(IntEnum):
+    """OTLP span kinds."""
+
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "kind",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str],
+        kind: SpanKind,
+        attributes: Optional[Dict[str, Any]],
+    ) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = dict(attributes) if attributes else {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+
+# Marks an unsampled trace so that its child spans are skipped too
+_NOT_SAMPLED = object()
+
+_current: contextvars.ContextVar[Any] = contextvars.ContextVar(
+    "trace_span", default=None
+)
+# The open ``tool.validate`` span of the current tool call
+_validation: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "trace_validation", default=None
+)
+
+
+def _finish(span: Span, error: Optional[BaseException] = None) -> None:
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+    _tracer.exporter.export(span)
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def encode_spans(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """
+    Encode spans as an OTLP/JSON ``ExportTraceServiceRequest``.
+
+    Args:
+        spans: Finished spans
+        service_name: Value of the ``service.name`` resource attribute
+
+    Returns:
+        The JSON-compatible request body
+    """
+    encoded = []
+    for span in spans:
+        item: Dict[str, Any] = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": int(span.kind),
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [
+                {"key": key, "value": _attribute_value(value)}
+                for key, value in span.attributes.items()
+            ],
+            "status": (
+                {"code": 2, "message": span.error}
+                if span.error is not None
+                else {"code": 1}
+            ),
+        }
+        if span.parent_id:
+            item["parentSpanId"] = span.parent_id
+        encoded.append(item)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": service_name}}
+                    ]
+                },
+                "scopeSpans": [
+                    {"scope": {"name": "src.utils.tracing"}, "spans": encoded}
+                ],
+            }
+        ]
+    }
+
+
+class OTLPJsonExporter:
+    """Batches finished spans and exports them as OTLP/JSON."""
+
+    def __init__(
+        self,
+        target: str,
+        service_name: str,
+        batch_size: int = 512,
+        flush_interval: float = 5.0,
+        max_pending: int = 10000,
+    ) -> None:
+        """
+        Initialize the exporter.
+
+        Args:
+            target: JSON Lines file path, or collector URL (``http(s)://...``;
+                ``/v1/traces`` is appended when the URL has no path)
+            service_name: Value of the ``service.name`` resource attribute
+            batch_size: Spans per export request
+            flush_interval: Seconds between background flushes
+            max_pending: Spans buffered before new ones are dropped
+        """
+        self.target = target
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.is_http = target.startswith(("http://", "https://"))
+        if self.is_http and target.rstrip("/").count("/") == 2:
+            self.target = target.rstrip("/") + "/v1/traces"
+        self._pending: List[Span] = []
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def export(self, span: Span) -> None:
+        """Queue a finished span for export."""
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._pending.append(span)
+
+    def _write_file(self, payload: str) -> None:
+        with open(self.target, "a", encoding="utf-8") as handle:
+            handle.write(payload)
+
+    async def flush(self) -> None:
+        """Export every queued span."""
+        while self._pending:
+            batch = self._pending[: self.batch_size]
+            del self._pending[: self.batch_size]
+            body = encode_spans(batch, self.service_name)
+            try:
+                if self.is_http:
+                    import httpx
+
+                    async with httpx.AsyncClient(timeout=10.0) as client:
+                        response = await client.post(self.target, json=body)
+                        response.raise_for_status()
+                else:
+                    await asyncio.to_thread(self._write_file, json.dumps(body) + "\n")
+            except Exception as e:
+                logger.warning(f"Failed to export {len(batch)} spans: {e}")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start flushing in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the background flush and export what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+class Tracer:
+    """Starts traces, samples them and hands finished spans to an exporter."""
+
+    def __init__(self, exporter: Any, sample_rate: float = 1.0) -> None:
+        """
+        Initialize the tracer.
+
+        Args:
+            exporter: Object with an ``export(span)`` method
+            sample_rate: Fraction of traces recorded (0-1)
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+
+_tracer: Optional[Tracer] = None
+
+
+def configure_tracing(
+    target: str, service_name: str, sample_rate: float = 1.0
+) -> Tracer:
+    """
+    Enable tracing.
+
+    Args:
+        target: JSON Lines file path or OTLP/HTTP collector URL
+        service_name: Value of the ``service.name`` resource attribute
+        sample_rate: Fraction of traces recorded (0-1)
+
+    Returns:
+        The tracer
+    """
+    global _tracer
+    _tracer = Tracer(OTLPJsonExporter(target, service_name), sample_rate)
+    return _tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the tracer, or None when tracing is off."""
+    return _tracer
+
+
+class _NoopScope:
+    """Context manager used when a span is not recorded."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+_NOOP = _NoopScope()
+
+
+class _SpanScope:
+    """Makes a span current for the enclosed block and finishes it."""
+
+    __slots__ = ("span", "token")
+
+    def __init__(self, span: Any) -> None:
+        self.span = span
+        self.token: Any = None
+
+    def __enter__(self) -> Optional[Span]:
+        self.token = _current.set(self.span)
+        return self.span if self.span is not _NOT_SAMPLED else None
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> bool:
+        _current.reset(self.token)
+        if self.span is not _NOT_SAMPLED:
+            _finish(self.span, exc)
+        return False
+
+
+def span(
+    name: str,
+    kind: SpanKind = SpanKind.INTERNAL,
+    attributes: Optional[Dict[str, Any]] = None,
+    root: bool = False,
+) -> Any:
+    """
+    Record a block as a span: ``with span("db.execute") as current: ...``.
+
+    Child spans (the default) are only recorded inside a sampled trace.
+    A root span starts a new trace, subject to the sample rate. The
+    ``with`` target is the span, or None when it is not being recorded.
+
+    Args:
+        name: Span name
+        kind: Span kind
+        attributes: Initial span attributes
+        root: Start a new trace instead of joining the current one
+
+    Returns:
+        A context manager
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP
+    if root:
+        if random.random() >= tracer.sample_rate:
+            return _SpanScope(_NOT_SAMPLED)
+        return _SpanScope(Span(name, os.urandom(16).hex(), None, kind, attributes))
+    parent = _current.get()
+    if parent is None or parent is _NOT_SAMPLED:
+        return _NOOP
+    return _SpanScope(Span(name, parent.trace_id, parent.span_id, kind, attributes))
+
+
+def _traced_function(fn: Callable[..., Any], is_async: bool) -> Callable[..., Any]:
+    """Wrap a tool function so its body is recorded as ``tool.execute``."""
+
+    def enter() -> Any:
+        # Everything since the request span started was argument validation
+        validation = _validation.get()
+        if validation is not None:
+            _validation.set(None)
+            _finish(validation)
+        return span("tool.execute")
+
+    if is_async:
+
+        async def traced(**kwargs: Any) -> Any:
+            with enter():
+                return await fn(**kwargs)
+
+    else:
+
+        def traced(**kwargs: Any) -> Any:
+            with enter():
+                return fn(**kwargs)
+
+    traced._traced = True  # type: ignore[attr-defined]
+    return traced
+
+
+def trace_tools(server: Any) -> None:
+    """
+    Start a trace for every tool call on a server.
+
+    The trace's root span covers the whole call, with ``tool.validate`` for
+    argument parsing and validation and ``tool.execute`` for the tool body.
+
+    Args:
+        server: The FastMCP server to trace
+    """
+    manager = server._tool_manager
+    if getattr(manager, "_traced", False):
+        return
+    call_tool = manager.call_tool
+
+    async def traced_call_tool(
+        name: str, arguments: Dict[str, Any], *args: Any, **kwargs: Any
+    ) -> Any:
+        tool = manager.get_tool(name)
+        if tool is not None and not getattr(tool.fn, "_traced", False):
+            tool.fn = _traced_function(tool.fn, tool.is_async)
+        with span(
+            f"tools/call {name}",
+            SpanKind.SERVER,
+            {"mcp.method.name": "tools/call", "mcp.tool.name": name},
+            root=True,
+        ) as request:
+            if request is None:
+                return await call_tool(name, arguments, *args, **kwargs)
+            token = _validation.set(
+                Span(
+                    "tool.validate",
+                    request.trace_id,
+                    request.span_id,
+                    SpanKind.INTERNAL,
+                    None,
+                )
+            )
+            try:
+                return await call_tool(name, arguments, *args, **kwargs)
+            except BaseException as e:
+                # Validation failed before the tool body was entered
+                validation = _validation.get()
+                if validation is not None:
+                    _finish(validation, e)
+                raise
+            finally:
+                _validation.reset(token)
+
+    manager.call_tool = traced_call_tool
+    manager._traced = True
@@ -0,0 +1,123 @@
+"""Startup warm-up and readiness.
+
+Without a warm-up the first requests after a deploy pay for opening database
+connections, upstream TLS handshakes, preparing statements and building
+validators. ``warm_up`` does that work during startup, and the readiness
+endpoint only reports ready once it is done, so load balancers hold traffic
+back until then.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_ready = False
+_report: Dict[str, Any] = {}
+
+
+async def warm_up(
+    steps: Mapping[str, Callable[[], Awaitable[Any]]],
+    timeout: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Run warm-up steps concurrently.
+
+    A step that fails or is still running after ``timeout`` seconds is
+    logged and skipped; warm-up never stops the server from starting.
+
+    Args:
+        steps: Coroutine functions by name
+        timeout: Seconds to wait for all steps (None waits for them all)
+
+    Returns:
+        Each step's seconds taken and result, or its error
+    """
+    start = time.perf_counter()
+    report: Dict[str, Any] = {}
+
+    async def run(name: str, step: Callable[[], Awaitable[Any]]) -> None:
+        began = time.perf_counter()
+        try:
+            result = await step()
+        except Exception as e:
+            logger.warning(f"Warm-up step {name} failed: {e!r}")
+            report[name] = {"error": repr(e)}
+            return
+        report[name] = {
+            "seconds": round(time.perf_counter() - began, 3),
+            "result": result,
+        }
+
+    tasks = [asyncio.create_task(run(name, step)) for name, step in steps.items()]
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    for name in steps:
+        if name not in report:
+            logger.warning(f"Warm-up step {name} did not finish within {timeout}s")
+            report[name] = {"error": "timed out"}
+    logger.info(f"Warm-up finished in {time.perf_counter() - start:.2f}s: {report}")
+    return report
+
+
+async def warm_tool_validators(server: Any) -> int:
+    """
+    Build the schemas and validators every tool call goes through.
+
+    Lists the tools through the MCP request handler, which caches the tool
+    definitions that calls are validated against, and runs each input and
+    output schema's JSON Schema validator once.
+
+    Args:
+        server: The FastMCP server
+
+    Returns:
+        Tools warmed
+    """
+    import jsonschema
+    from mcp import types
+
+    handler = server._mcp_server.request_handlers.get(types.ListToolsRequest)
+    if handler is not None:
+        await handler(None)
+    tools = await server.list_tools()
+    for tool in tools:
+        for schema in (tool.inputSchema, tool.outputSchema):
+            if schema:
+                validator = jsonschema.validators.validator_for(schema)
+                validator.check_schema(schema)
+                validator(schema).is_valid({})
+    return len(tools)
+
+
+def set_ready(ready: bool, report: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Set whether the server is ready to take traffic.
+
+    Args:
+        ready: Whether it is ready
+        report: Warm-up report served by the readiness endpoint
+    """
+    global _ready, _report
+    _ready = ready
+    if report is not None:
+        _report = report
+
+
+def is_ready() -> bool:
+    """Whether startup and warm-up have finished (and shutdown has not begun)."""
+    return _ready
+
+
+async def readiness_endpoint(request: Any) -> Any:
+    """Starlette endpoint answering 200 when ready and 503 otherwise."""
+    from starlette.responses import JSONResponse
+
+    return JSONResponse(
+        {"ready": _ready, "warmup": _report}, status_code=200 if _ready else 503
+    )
@@ -0,0 +1,174 @@
+"""Tests for SSE session affinity across worker processes."""
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from src.transport.affinity import SessionAffinityMiddleware, SessionRegistry
+
+
+@pytest.fixture
+def directory():
+    # Unix socket paths are limited to about 100 bytes, so keep them short
+    with tempfile.TemporaryDirectory(prefix="aff-") as path:
+        yield path
+
+
+def test_registry_records_and_forgets_owners(directory):
+    """Test that a claimed session is found by every worker until released."""
+    first = SessionRegistry(directory, "1")
+    second = SessionRegistry(directory, "2")
+    open(first.socket_path, "w").close()
+
+    first.claim("abc")
+    assert second.owner("abc") == first.socket_path
+    first.release("abc")
+    assert second.owner("abc") is None
+    first.release("abc")
+
+
+def test_registry_drops_sessions_of_exited_workers(directory):
+    """Test that an entry pointing at a missing socket is cleaned up."""
+    gone = SessionRegistry(directory, "1")
+    gone.claim("abc")
+    assert SessionRegistry(directory, "2").owner("abc") is None
+    assert not os.path.exists(os.path.join(directory, "session-abc"))
+
+
+async def call(app, method, path, query=b"", body=b"", headers=()):
+    """Call an ASGI app and return the status and body it sent."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": [(b"content-type", b"application/json"), *headers],
+    }
+    await app(scope, receive, send)
+    return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def worker(directory, worker_id, closed=None):
+    """Build a worker whose app echoes which worker answered."""
+
+    async def app(scope, receive, send):
+        if scope["method"] == "GET":
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": b"data: /messages/?session_id=abc123\n\n",
+                }
+            )
+            if closed is not None:
+                await closed.wait()
+            return
+        message = await receive()
+        await send({"type": "http.response.start", "status": 202, "headers": []})
+        await send(
+            {
+                "type": "http.response.body",
+                "body": worker_id.encode() + b":" + message["body"],
+            }
+        )
+
+    return SessionAffinityMiddleware(app, SessionRegistry(directory, worker_id))
+
+
+@pytest.mark.asyncio
+async def test_messages_are_forwarded_to_the_owning_worker(directory):
+    """Test that a message posted to another worker reaches the owner."""
+    closed = asyncio.Event()
+    owner, other = worker(directory, "1", closed), worker(directory, "2")
+    await owner.start()
+    await other.start()
+    stream = asyncio.create_task(call(owner, "GET", "/sse"))
+    try:
+        for _ in range(100):
+            if other.registry.owner("abc123") is not None:
+                break
+            await asyncio.sleep(0.01)
+        status, body = await call(
+            other, "POST", "/messages/", b"session_id=abc123", b"ping"
+        )
+        assert (status, body) == (202, b"1:ping")
+
+        status, body = await call(other, "POST", "/messages/", b"session_id=ff")
+        assert (status, body) == (202, b"2:")
+
+        # Closing the stream releases the session
+        closed.set()
+        await stream
+        assert other.registry.owner("abc123") is None
+    finally:
+        closed.set()
+        await owner.stop()
+        await other.stop()
+
+
+@pytest.mark.asyncio
+async def test_messages_for_a_dead_owner_are_rejected(directory):
+    """Test that a session whose worker is unreachable answers 404."""
+    other = worker(directory, "2")
+    dead = SessionRegistry(directory, "1")
+    # A file nothing listens on, as a crashed worker leaves behind
+    open(dead.socket_path, "w").close()
+    dead.claim("abc123")
+
+    status, _ = await call(other, "POST", "/messages/", b"session_id=abc123")
+    assert status == 404
+    assert other.registry.owner("abc123") is None
+
+
+def streamable_worker(directory, worker_id):
+    """Build a worker whose /mcp endpoint opens and serves sessions."""
+
+    async def app(scope, receive, send):
+        session = dict(scope["headers"]).get(b"mcp-session-id")
+        headers = [] if session else [(b"mcp-session-id", b"abc123")]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        # Streamed in parts, as an SSE response is
+        for part in (worker_id.encode(), b":", session or b"new"):
+            await send({"type": "http.response.body", "body": part, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+
+    return SessionAffinityMiddleware(app, SessionRegistry(directory, worker_id))
+
+
+@pytest.mark.asyncio
+async def test_streamable_sessions_stay_with_their_worker(directory):
+    """Test that requests for a Streamable HTTP session reach its owner."""
+    owner, other = streamable_worker(directory, "1"), streamable_worker(directory, "2")
+    await owner.start()
+    await other.start()
+    session = [(b"mcp-session-id", b"abc123")]
+    try:
+        assert await call(owner, "POST", "/mcp") == (200, b"1:new")
+        assert other.registry.owner("abc123") == owner.registry.socket_path
+
+        assert await call(other, "POST", "/mcp", headers=session) == (
+            200,
+            b"1:abc123",
+        )
+        assert await call(other, "GET", "/mcp", headers=session) == (200, b"1:abc123")
+
+        # Deleting the session, even through another worker, releases it
+        await call(other, "DELETE", "/mcp", headers=session)
+        assert other.registry.owner("abc123") is None
+        assert await call(other, "POST", "/mcp", headers=session) == (
+            200,
+            b"2:abc123",
+        )
+    finally:
+        await owner.stop()
+        await other.stop()
@@ -0,0 +1,106 @@
+"""Tests for JSON-RPC batches and the multi_call tool."""
+
+import asyncio
+
+import httpx
+import pytest
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+from src.tools.multi_call import register_multi_call
+from src.transport.dispatch import JSONRPCDispatcher
+from src.transport.http import build_http_app
+
+
+def make_server() -> FastMCP:
+    """Build a server with a slow tool and a failing tool."""
+    server = FastMCP("batch-test")
+    running = {"now": 0, "peak": 0}
+
+    @server.tool()
+    async def slow(x: int) -> int:
+        """Return x after a short wait."""
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return x
+
+    @server.tool()
+    def fail() -> str:
+        """Always fail."""
+        raise RuntimeError("boom")
+
+    server.running = running
+    return server
+
+
+def call(request_id, name, **arguments):
+    """Build a tools/call request."""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": name, "arguments": arguments},
+    }
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_batch():
+    """Test that batch items run concurrently under the cap, in order."""
+    server = make_server()
+    dispatcher = JSONRPCDispatcher(server, batch_max_concurrency=2)
+    batch = [call(i, "slow", x=i) for i in range(5)]
+    batch += [{"jsonrpc": "2.0", "method": "notifications/initialized"}, 42]
+
+    responses = await dispatcher.dispatch(batch)
+
+    assert [r["id"] for r in responses] == [0, 1, 2, 3, 4, None]
+    assert responses[3]["result"]["structuredContent"] == {"result": 3}
+    assert responses[5]["error"]["code"] == types.INVALID_REQUEST
+    assert server.running["peak"] == 2
+    assert (await dispatcher.dispatch([]))["error"]["code"] == types.INVALID_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_multi_call_reports_each_item():
+    """Test that failing items do not fail the rest of a multi_call."""
+    server = make_server()
+    register_multi_call(server, max_concurrency=3)
+    calls = [{"name": "slow", "arguments": {"x": i}} for i in range(6)]
+    calls += [{"name": "fail"}, {"name": "missing"}, {"name": "multi_call"}]
+
+    _, result = await server.call_tool(
+        "multi_call", {"calls": calls, "max_concurrency": 10}
+    )
+
+    results = result["results"]
+    assert [r["structuredContent"]["result"] for r in results[:6]] == list(range(6))
+    assert [r["ok"] for r in results[6:]] == [False] * 3
+    assert "boom" in results[6]["error"]["message"]
+    assert (result["succeeded"], result["failed"]) == (6, 3)
+    assert server.running["peak"] == 3
+
+
+@pytest.mark.asyncio
+async def test_http_batch():
+    """Test that a batch posted to /mcp is answered with a JSON array."""
+    server = make_server()
+    app = build_http_app(server, stateless=True, metrics_path=None)
+    batch = [call(1, "slow", x=1), call(2, "fail")]
+    batch.append({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+    async with server.session_manager.run():
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://localhost:8080"
+        ) as client:
+            response = await client.post(
+                "/mcp",
+                json=batch,
+                headers={"accept": "application/json, text/event-stream"},
+            )
+
+    assert response.status_code == 200
+    first, second = response.json()
+    assert first["result"]["structuredContent"] == {"result": 1}
+    assert second["id"] == 2 and second["result"]["isError"]
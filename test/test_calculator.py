@@ -0,0 +1,65 @@
+"""Tests for the expression calculator."""
+
+import importlib.util
+
+import pytest
+
+from src.tools import calculator
+from src.tools.calculator import calculate, compile_expression
+
+BACKENDS = ["python"] + (["numpy"] if importlib.util.find_spec("numpy") else [])
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["__import__('os')", "x.real", "lambda: 1", "[x]", "'a' * 3", "log(x, 2)", "sqrt"],
+)
+def test_rejects_unsafe_or_unsupported_syntax(expression):
+    """Test that anything beyond arithmetic and whitelisted calls is rejected."""
+    with pytest.raises(ValueError):
+        calculate(expression, {"x": 1.0})
+
+
+def test_compiled_expressions_are_cached():
+    """Test that an expression is parsed once and reused by its text."""
+    first = compile_expression("a * b + c")
+    assert compile_expression("a * b + c") is first
+    assert first.variables == ("a", "b", "c")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_batch_matches_scalar_evaluation(backend, monkeypatch):
+    """Test that batch rows give the same results as one call per row."""
+    if backend == "python":
+        monkeypatch.setattr(calculator, "_numpy", lambda: None)
+    expression = "round(total / count, 2) + max(sqrt(total), floor(tax))"
+    rows = [{"total": t, "count": c} for t, c in [(10, 4), (9, 0), (-4, 2), (7, 3)]]
+
+    batched = calculate(expression, {"tax": 1.5}, batch=rows)
+    single = [calculate(expression, {"tax": 1.5, **row})["result"] for row in rows]
+
+    assert batched["count"] == 4
+    assert batched["results"] == single
+    assert single[1] is None and single[2] is None
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_variable_lists_broadcast_scalars(backend, monkeypatch):
+    """Test that list variables are evaluated per row alongside scalars."""
+    if backend == "python":
+        monkeypatch.setattr(calculator, "_numpy", lambda: None)
+
+    result = calculate("c * 9 / 5 + offset", {"c": [0, 100, -40], "offset": 32})
+
+    assert result["results"] == [32.0, 212.0, -40.0]
+    with pytest.raises(ValueError):
+        calculate("a + b", {"a": [1, 2], "b": [1, 2, 3]})
+
+
+@pytest.mark.parametrize(
+    "expression", ["floor(1000000) ** floor(1000000)", "round(1e7) ** round(1e6)"]
+)
+def test_integer_functions_do_not_enable_big_int_powers(expression):
+    """Test that floor, ceil and round results overflow like floats."""
+    assert calculate(expression)["result"] is None
+    assert isinstance(calculate("ceil(2.5) ** 2")["result"], float)
@@ -0,0 +1,151 @@
+"""Tests for the collection catalog cache, with the database stubbed out."""
+
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.config import config
+from src.database import catalog as catalog_module
+from src.database.catalog import CollectionCatalog
+from src.database.changes import ChangeListener, collection_uri
+from src.resources import Subscriber, SubscriptionHub
+
+
+class StubDatabase:
+    """Answers the catalog queries from in-memory rows."""
+
+    def __init__(self):
+        self.loads = 0
+        self.tables = [
+            {"collection": "articles", "description": "News", "row_estimate": 10},
+            {"collection": "vectors", "description": None, "row_estimate": -1},
+        ]
+        self.columns = [
+            {"collection": "articles", "name": "id", "type": "int", "nullable": False},
+            {
+                "collection": "articles",
+                "name": "searchable_content",
+                "type": "text",
+                "nullable": True,
+            },
+            {
+                "collection": "vectors",
+                "name": "embedding",
+                "type": "vector(3)",
+                "nullable": True,
+            },
+        ]
+        self.indexes = [
+            {"collection": "articles", "name": "articles_pkey", "definition": "..."}
+        ]
+
+    @asynccontextmanager
+    async def session(self):
+        self.loads += 1
+        yield self
+
+    async def execute(self, statement):
+        rows = {
+            catalog_module._TABLES_SQL: self.tables,
+            catalog_module._COLUMNS_SQL: self.columns,
+            catalog_module._INDEXES_SQL: self.indexes,
+        }[statement]
+
+        class Result:
+            def mappings(self):
+                return self
+
+            def all(self):
+                return [dict(row) for row in rows]
+
+        return Result()
+
+
+@pytest.fixture
+def database(monkeypatch):
+    stub = StubDatabase()
+    monkeypatch.setattr(catalog_module, "get_read_session", stub.session)
+    monkeypatch.setattr(config.db, "SEARCHABLE_COLLECTIONS", [])
+    monkeypatch.setattr(config.db, "ENABLE_VECTOR_SEARCH", True)
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_lookups_load_once_and_validate_capabilities(database):
+    """Test that lookups are served from memory and check search support."""
+    catalog = CollectionCatalog()
+    entry = await catalog.require("articles", "text_search")
+    assert entry["row_estimate"] == 10
+    assert [c["name"] for c in entry["columns"]] == ["id", "searchable_content"]
+    assert (await catalog.get("vectors"))["row_estimate"] is None
+    await catalog.require("vectors", "vector_search")
+
+    with pytest.raises(ValueError, match="does not support vector search"):
+        await catalog.require("articles", "vector_search")
+    with pytest.raises(ValueError, match="Unknown or non-searchable"):
+        await catalog.require("missing", "text_search")
+    assert database.loads == 1
+    assert (catalog.refreshes, catalog.refresh_failures) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_searchable_collections_limit_the_catalog(database, monkeypatch):
+    """Test that collections outside SEARCHABLE_COLLECTIONS are rejected."""
+    monkeypatch.setattr(config.db, "SEARCHABLE_COLLECTIONS", ["vectors", "gone"])
+    catalog = CollectionCatalog()
+    names = [entry["collection"] for entry in await catalog.list_collections()]
+    assert names == ["vectors"]
+    with pytest.raises(ValueError, match="Unknown or non-searchable"):
+        await catalog.require("articles", "text_search")
+
+
+@pytest.mark.asyncio
+async def test_refresh_reports_changed_collections(database, monkeypatch):
+    """Test that listeners and subscribers hear what a refresh changed."""
+    catalog = CollectionCatalog()
+    monkeypatch.setattr(catalog_module, "_catalog", catalog)
+    changes = []
+    catalog.add_change_listener(changes.append)
+    catalog.add_change_listener(changes.append)
+    hub = SubscriptionHub(window=0)
+    updated = []
+    hub.subscribe(collection_uri("authors"), Subscriber(updated.append))
+    await ChangeListener(hub).start()
+    await catalog.refresh()
+    assert changes == []
+
+    await catalog.refresh()
+    assert changes == []
+
+    database.tables[0]["row_estimate"] = 20
+    database.tables.append(
+        {"collection": "authors", "description": None, "row_estimate": 0}
+    )
+    await catalog.refresh()
+    assert changes == [{"articles", "authors"}]
+    assert (await catalog.get("articles"))["row_estimate"] == 20
+    await hub.flush()
+    assert [message["params"]["uri"] for message in updated] == [
+        "db://collections/authors"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_refreshes_and_age(database, monkeypatch):
+    """Test that the catalog reports its loads rather than lookups."""
+    catalog = CollectionCatalog()
+    families = {family.name: family for family in catalog.collect_metrics()}
+    assert "mcp_catalog_age_seconds" not in families
+    await catalog.refresh()
+
+    async def fail():
+        raise OSError("connection refused")
+
+    monkeypatch.setattr(catalog, "_load", fail)
+    with pytest.raises(OSError):
+        await catalog.refresh()
+    families = {family.name: family for family in catalog.collect_metrics()}
+    assert families["mcp_catalog_refreshes_total"].samples == [({}, 1)]
+    assert families["mcp_catalog_refresh_failures_total"].samples == [({}, 1)]
+    assert families["mcp_catalog_collections"].samples == [({}, 2)]
+    assert 0 <= families["mcp_catalog_age_seconds"].samples[0][1] < 1
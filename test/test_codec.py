@@ -0,0 +1,57 @@
+"""Tests for the JSON codec and codec-based tool result conversion."""
+
+import datetime
+import importlib.util
+import uuid
+from decimal import Decimal
+from typing import Any, Dict
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.utils.codec import BACKENDS, create_codec, encode_tool_results
+
+INSTALLED = [
+    name for name in BACKENDS if name == "json" or importlib.util.find_spec(name)
+]
+
+
+@pytest.mark.parametrize("backend", INSTALLED)
+def test_encodes_database_values(backend):
+    """Test that every backend encodes the same values the same way."""
+    codec = create_codec(backend)
+    row = {
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "price": Decimal("9.5"),
+        "created": datetime.datetime(2024, 1, 2, 3, 4, 5),
+        "day": datetime.date(2024, 1, 2),
+        "tags": {"a"},
+    }
+
+    assert codec.loads(codec.dumps(row)) == {
+        "id": "12345678-1234-5678-1234-567812345678",
+        "price": 9.5,
+        "created": "2024-01-02T03:04:05",
+        "day": "2024-01-02",
+        "tags": ["a"],
+    }
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+@pytest.mark.asyncio
+async def test_tool_results_match_fastmcp():
+    """Test that codec conversion yields FastMCP's structured content."""
+    server = FastMCP("codec-test")
+
+    @server.tool()
+    def lookup(key: str) -> Dict[str, Any]:
+        """Look up a record."""
+        return {"key": key, "values": [1, 2.5, None]}
+
+    expected = await server.call_tool("lookup", {"key": "k"})
+    encode_tool_results(server)
+    content, structured = await server.call_tool("lookup", {"key": "k"})
+
+    assert structured == expected[1]
+    assert content[0].text == '{"key":"k","values":[1,2.5,null]}'
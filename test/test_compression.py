@@ -0,0 +1,51 @@
+"""Tests for HTTP response compression."""
+
+import gzip
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.transport.compression import CompressionMiddleware, negotiate
+
+
+def client():
+    """A client for an app returning a small or a large JSON body."""
+
+    async def endpoint(request):
+        size = int(request.query_params["size"])
+        return JSONResponse({"data": "a" * size})
+
+    app = Starlette(routes=[Route("/", endpoint)])
+    return TestClient(CompressionMiddleware(app, minimum_size=1024))
+
+
+def test_large_responses_are_compressed():
+    """Test that gzip is used for large bodies and small ones pass through."""
+    with client() as http:
+        large = http.get("/?size=100000", headers={"Accept-Encoding": "gzip"})
+        small = http.get("/?size=10", headers={"Accept-Encoding": "gzip"})
+    assert large.headers["content-encoding"] == "gzip"
+    assert int(large.headers["content-length"]) < 1000
+    assert large.json() == {"data": "a" * 100000}
+    assert "content-encoding" not in small.headers
+
+
+def test_negotiation_respects_quality():
+    """Test that refused encodings are skipped."""
+    assert negotiate("br;q=0, gzip;q=0.5", ["zstd", "br", "gzip"]) == "gzip"
+    assert negotiate("identity", ["gzip"]) is None
+    assert negotiate("*", ["zstd", "gzip"]) == "zstd"
+    # q may follow other parameters
+    assert negotiate("br;level=1;q=0, gzip ; Q=0.5", ["br", "gzip"]) == "gzip"
+
+
+def test_uncompressed_responses_vary_on_accept_encoding():
+    """Test that compressible responses sent as they are still carry Vary."""
+    with client() as http:
+        small = http.get("/?size=10", headers={"Accept-Encoding": "gzip"})
+        refused = http.get("/?size=100000", headers={"Accept-Encoding": "identity"})
+    for response in (small, refused):
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
@@ -0,0 +1,109 @@
+"""Tests for request deadlines."""
+
+import asyncio
+
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.api.factory import APIToolFactory
+from src.utils.deadline import (
+    DEADLINE_EXCEEDED,
+    deadline_scope,
+    enforce_deadlines,
+    remaining,
+)
+from src.utils.limits import propagate_tool_errors
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_are_cancelled_at_the_deadline():
+    """Test that a call past its deadline is cancelled with a deadline error."""
+    server = FastMCP("deadline-test")
+    cancelled = asyncio.Event()
+
+    @server.tool()
+    async def slow() -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return "done"
+
+    enforce_deadlines(server)
+    with deadline_scope(0.05):
+        with pytest.raises(McpError) as error:
+            await server.call_tool("slow", {})
+    assert error.value.error.code == DEADLINE_EXCEEDED
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_clients_see_deadline_errors():
+    """Test that a client session gets the deadline error, not a tool result."""
+    server = FastMCP("deadline-test")
+
+    @server.tool()
+    async def slow() -> str:
+        await asyncio.sleep(10)
+        return "done"
+
+    enforce_deadlines(server)
+    propagate_tool_errors(server)
+    async with create_connected_server_and_client_session(server) as client:
+        with pytest.raises(McpError) as error:
+            await client.call_tool("slow", {}, meta={"timeout": 0.05})
+    assert error.value.error.code == DEADLINE_EXCEEDED
+    assert error.value.error.data == {
+        "reason": "deadline_exceeded",
+        "timeout": 0.05,
+    }
+
+
+@pytest.mark.asyncio
+async def test_timeouts_inside_a_call_are_not_deadline_errors():
+    """Test that only the deadline's own timeout becomes a deadline error."""
+    server = FastMCP("deadline-test")
+
+    async def call_tool(name, arguments, *args, **kwargs):
+        raise asyncio.TimeoutError("upstream timed out")
+
+    server._tool_manager.call_tool = call_tool
+    enforce_deadlines(server)
+    with deadline_scope(5.0):
+        with pytest.raises(asyncio.TimeoutError, match="upstream timed out"):
+            await server._tool_manager.call_tool("lookup", {})
+
+
+def test_nested_deadlines_never_extend():
+    """Test that an inner scope cannot outlast the outer one."""
+    with deadline_scope(1.0):
+        with deadline_scope(60.0):
+            assert remaining() <= 1.0
+        with deadline_scope(None):
+            assert remaining() <= 1.0
+    assert remaining() is None
+
+
+@pytest.mark.asyncio
+async def test_upstream_requests_use_the_time_left():
+    """Test that API calls get the remaining time and are not sent once late."""
+    timeouts = []
+
+    def handler(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        return httpx.Response(200, json={})
+
+    factory = APIToolFactory()
+    factory._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with deadline_scope(5.0):
+        await factory._request("GET", "http://upstream.test/items")
+    with deadline_scope(0.0):
+        with pytest.raises(McpError):
+            await factory._request("GET", "http://upstream.test/items")
+    await factory.aclose()
+
+    assert len(timeouts) == 1 and 0 < timeouts[0] <= 5.0
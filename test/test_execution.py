@@ -0,0 +1,54 @@
+"""Tests for tool execution policies."""
+
+import os
+import threading
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.utils.execution import ExecutionPolicy, offloaded_tool, shutdown_pools
+
+
+def current_thread() -> str:
+    """Name the thread the tool runs in."""
+    return threading.current_thread().name
+
+
+def current_pid() -> int:
+    """Return the process id the tool runs in."""
+    return os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_offloaded_tools_run_off_the_event_loop():
+    """Test that thread and process tools run outside the calling thread."""
+    server = FastMCP("execution-test")
+    offloaded_tool(server, ExecutionPolicy.THREAD)(current_thread)
+    offloaded_tool(server, ExecutionPolicy.PROCESS)(current_pid)
+
+    try:
+        thread = await server.call_tool("current_thread", {})
+        pid = await server.call_tool("current_pid", {})
+    finally:
+        shutdown_pools()
+
+    assert "mcp-tool" in str(thread)
+    assert str(os.getpid()) not in str(pid)
+
+
+def test_offloaded_tool_keeps_schema():
+    """Test that offloading does not change the tool's input schema."""
+    inline = FastMCP("inline")
+    offloaded = FastMCP("offloaded")
+
+    def scale(value: float, factor: int = 2) -> float:
+        """Scale a value."""
+        return value * factor
+
+    inline.tool()(scale)
+    offloaded_tool(offloaded, ExecutionPolicy.THREAD)(scale)
+
+    assert (
+        offloaded._tool_manager.get_tool("scale").parameters
+        == inline._tool_manager.get_tool("scale").parameters
+    )
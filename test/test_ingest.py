@@ -0,0 +1,232 @@
+"""Tests for bulk ingestion that do not need a database."""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.database import ingest
+from src.database.ingest import BulkIngestor, iter_jsonl
+
+
+class StubCatalog:
+    """Catalog with one collection of the given columns (text unless typed)."""
+
+    def __init__(self, *columns, **types):
+        self.entry = {
+            "columns": [
+                {"name": name, "type": types.get(name, "text")} for name in columns
+            ]
+        }
+
+    async def get(self, collection):
+        return self.entry
+
+
+@pytest.fixture
+def catalog(monkeypatch):
+    stub = StubCatalog("id", "title", "body", "embedding")
+    monkeypatch.setattr(ingest, "get_catalog", lambda: stub)
+    return stub
+
+
+def make_ingestor(**options):
+    """Build an ingestor whose writer only records what it receives."""
+    ingestor = BulkIngestor("docs", batch_size=2, queue_depth=1, **options)
+    ingestor.written = []
+
+    async def write(queue):
+        while True:
+            records = await queue.get()
+            if records is ingest._DONE:
+                return
+            ingestor.written.extend(records)
+
+    ingestor._write = write
+    return ingestor
+
+
+async def documents(rows, read=None, closed=None):
+    """Yield the rows, counting reads and noting when the stream is closed."""
+    try:
+        for row in rows:
+            if read is not None:
+                read.append(row)
+            yield row
+    finally:
+        if closed is not None:
+            closed.set()
+
+
+def test_merge_sql_updates_only_the_loaded_columns():
+    """Test that upserts cast vectors and never update the primary key."""
+    ingestor = BulkIngestor("docs", mode="upsert", embedder=None)
+    ingestor.columns = ["id", "title", "embedding"]
+    sql = ingestor._merge_sql()
+    assert 'SELECT "id", "title", "embedding"::vector FROM' in sql
+    assert sql.endswith(
+        'ON CONFLICT ("id") DO UPDATE SET "title" = EXCLUDED."title", '
+        '"embedding" = EXCLUDED."embedding"'
+    )
+    ingestor.mode = "copy"
+    assert "ON CONFLICT" not in ingestor._merge_sql()
+
+
+@pytest.mark.asyncio
+async def test_iter_jsonl_skips_blank_lines(tmp_path):
+    """Test that every non-blank line is decoded as one document."""
+    path = tmp_path / "docs.jsonl"
+    path.write_text(json.dumps({"id": 1}) + "\n\n" + json.dumps({"id": 2}) + "\n")
+    assert [document async for document in iter_jsonl(str(path))] == [
+        {"id": 1},
+        {"id": 2},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_documents_with_different_fields_are_rejected(catalog):
+    """Test that a field missing from a later document is not written as NULL."""
+    ingestor = make_ingestor(embedder=None)
+    rows = [{"id": 1, "title": "a", "body": "x"}, {"id": 2, "title": "b"}]
+    with pytest.raises(ValueError, match=r"Document 1 .*missing \['body'\]"):
+        await ingestor.ingest(documents(rows))
+
+    ingestor = make_ingestor(embedder=None)
+    rows = [{"id": 1, "title": "a"}, {"id": 2, "title": "b", "body": "x"}]
+    with pytest.raises(ValueError, match=r"extra \['body'\]"):
+        await ingestor.ingest(documents(rows))
+
+
+@pytest.mark.asyncio
+async def test_embedder_fills_vectors_a_document_leaves_out(catalog):
+    """Test that the vector field may be omitted when an embedder is set."""
+
+    async def embed(texts):
+        return [[float(len(text))] for text in texts]
+
+    ingestor = make_ingestor(embedder=embed, text_field="title")
+    rows = [{"id": 1, "title": "ab"}, {"id": 2, "title": "c", "embedding": [9.0]}]
+    await ingestor.ingest(documents(rows))
+    assert ingestor.columns == ["id", "title", "embedding"]
+    assert sorted(ingestor.written) == [(1, "ab", [2.0]), (2, "c", [9.0])]
+
+
+@pytest.mark.asyncio
+async def test_values_are_converted_to_the_column_types(monkeypatch):
+    """Test that JSON strings become the values binary COPY needs."""
+    stub = StubCatalog(
+        "id",
+        "created",
+        "price",
+        "tags",
+        "meta",
+        "embedding",
+        id="uuid",
+        created="timestamp with time zone",
+        price="numeric(10,2)",
+        tags="uuid[]",
+        meta="jsonb",
+        embedding="vector(2)",
+    )
+    monkeypatch.setattr(ingest, "get_catalog", lambda: stub)
+    key = uuid.uuid4()
+    rows = [
+        {
+            "id": str(key),
+            "created": "2024-05-01T12:30:00Z",
+            "price": 9.99,
+            "tags": [str(key), None],
+            "meta": {"a": 1},
+            "embedding": [1.0, 2.0],
+        },
+        {
+            "id": str(key),
+            "created": None,
+            "price": "1.5",
+            "tags": None,
+            "meta": "x",
+            "embedding": None,
+        },
+    ]
+    ingestor = make_ingestor(embedder=None)
+    await ingestor.ingest(documents(rows))
+    assert ingestor.written == [
+        (
+            key,
+            datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+            Decimal("9.99"),
+            [key, None],
+            '{"a": 1}',
+            [1.0, 2.0],
+        ),
+        (key, None, Decimal("1.5"), None, '"x"', None),
+    ]
+
+    ingestor = make_ingestor(embedder=None)
+    rows[0]["created"] = "yesterday"
+    with pytest.raises(ValueError, match="Invalid value for column created"):
+        await ingestor.ingest(documents(rows))
+
+
+@pytest.mark.asyncio
+async def test_slow_writer_holds_back_the_reader(catalog):
+    """Test that the bounded queues stop reading while the writer is stalled."""
+    ingestor = make_ingestor(embedder=None, embed_concurrency=1)
+    release = asyncio.Event()
+
+    async def stalled_write(queue):
+        await release.wait()
+        while await queue.get() is not ingest._DONE:
+            pass
+
+    ingestor._write = stalled_write
+    read = []
+    rows = [{"id": i, "title": "t"} for i in range(1000)]
+    task = asyncio.create_task(ingestor.ingest(documents(rows, read)))
+    await asyncio.sleep(0.05)
+    # Two queues of one batch, one batch in each stage: a handful of batches
+    assert len(read) <= 5 * ingestor.batch_size
+    release.set()
+    await task
+    assert len(read) == 1000
+
+
+@pytest.mark.asyncio
+async def test_failing_stage_cancels_the_others(catalog):
+    """Test that a writer failure stops the reader and closes the input."""
+    ingestor = make_ingestor(embedder=None)
+
+    async def failing_write(queue):
+        await queue.get()
+        raise RuntimeError("disk full")
+
+    ingestor._write = failing_write
+    closed = asyncio.Event()
+    rows = ({"id": i, "title": "t"} for i in range(10**9))
+    with pytest.raises(RuntimeError, match="disk full"):
+        await ingestor.ingest(documents(rows, closed=closed))
+    await asyncio.wait_for(closed.wait(), 1)
+
+
+def test_database_tools_are_registered_with_a_database():
+    """Test that the server lists the database tools when one is enabled."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import asyncio, src.main; "
+            "print([t.name for t in asyncio.run(src.main.mcp.list_tools())])",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "DB_ENABLED": "true"},
+    )
+    assert "'ingest_documents'" in result.stdout
+    assert "'database_pool_stats'" in result.stdout
@@ -0,0 +1,132 @@
+"""Tests for per-tool concurrency limits."""
+
+import asyncio
+
+import pytest
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel.server import request_ctx
+from mcp.shared.context import RequestContext
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.utils.limits import (
+    OVERLOADED,
+    ConcurrencyLimiter,
+    Priority,
+    current_priority,
+    limited_tool,
+    propagate_tool_errors,
+)
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retryable_error():
+    """Test that calls beyond the queue depth fail fast instead of waiting."""
+    limiter = ConcurrencyLimiter("slow", max_concurrency=1, queue_depth=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(McpError) as excinfo:
+        await limiter.acquire()
+
+    assert excinfo.value.error.code == OVERLOADED
+    assert excinfo.value.error.data["retryable"] is True
+    limiter.release()
+    await waiter
+    assert limiter.stats()["active"] == 1
+    assert limiter.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_interactive_calls_go_ahead_of_batch():
+    """Test that queued interactive calls are served before batch calls."""
+    limiter = ConcurrencyLimiter("search", max_concurrency=1, queue_depth=4)
+    await limiter.acquire()
+    order = []
+
+    async def call(label, priority):
+        await limiter.acquire(priority)
+        order.append(label)
+        limiter.release()
+
+    tasks = [
+        asyncio.create_task(call("batch", Priority.BATCH)),
+        asyncio.create_task(call("interactive", Priority.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0)
+    limiter.release()
+    await asyncio.gather(*tasks)
+
+    assert order == ["interactive", "batch"]
+
+
+@pytest.mark.asyncio
+async def test_queue_timeout_frees_the_queue_slot():
+    """Test that a waiter that times out is rejected and leaves the queue."""
+    limiter = ConcurrencyLimiter(
+        "slow", max_concurrency=1, queue_depth=1, queue_timeout=0.01
+    )
+    await limiter.acquire()
+
+    with pytest.raises(McpError):
+        await limiter.acquire()
+
+    assert limiter.stats()["queued"] == 0
+    assert limiter.timed_out == 1
+    limiter.release()
+    await limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_shed_calls_reach_clients_as_retryable_errors():
+    """Test that a client session sees the overload error, not a tool result."""
+    server = FastMCP("limits-test")
+    release = asyncio.Event()
+
+    @limited_tool(server, max_concurrency=1, queue_depth=0)
+    async def slow() -> str:
+        await release.wait()
+        return "done"
+
+    @server.tool()
+    def broken() -> str:
+        raise RuntimeError("broken")
+
+    propagate_tool_errors(server)
+    async with create_connected_server_and_client_session(server) as client:
+        first = asyncio.create_task(client.call_tool("slow", {}))
+        await asyncio.sleep(0.05)
+        with pytest.raises(McpError) as excinfo:
+            await client.call_tool("slow", {})
+        release.set()
+        assert not (await first).isError
+
+        # Ordinary failures are still tool results
+        assert (await client.call_tool("broken", {})).isError
+    assert excinfo.value.error.code == OVERLOADED
+    assert excinfo.value.error.data["retryable"] is True
+    assert excinfo.value.error.data["reason"] == "queue_full"
+
+
+def test_sessions_declare_their_priority_class():
+    """Test that a session's declared class applies unless a call overrides it."""
+
+    class Session:
+        client_params = types.InitializeRequestParams(
+            protocolVersion="2025-06-18",
+            capabilities={"experimental": {"priority": {"class": "batch"}}},
+            clientInfo={"name": "test", "version": "1"},
+        )
+
+    def priority(meta):
+        token = request_ctx.set(RequestContext(1, meta, Session(), None))
+        try:
+            return current_priority()
+        finally:
+            request_ctx.reset(token)
+
+    assert priority(None) == Priority.BATCH
+    meta = types.RequestParams.Meta(priority="interactive")
+    assert priority(meta) == Priority.INTERACTIVE
@@ -0,0 +1,96 @@
+"""Tests for LISTEN connections that reconnect."""
+
+import asyncio
+
+import pytest
+
+from src.database.listen import NotificationListener
+
+
+class FakeConnection:
+    """Stands in for an asyncpg connection."""
+
+    def __init__(self):
+        self.on_terminate = None
+        self.on_notify = None
+        self.terminated = False
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def add_listener(self, channel, callback):
+        self.on_notify = callback
+
+    async def execute(self, query):
+        return "SELECT 1"
+
+    def notify(self, payload):
+        self.on_notify(self, 1, "changes", payload)
+
+    def drop(self):
+        self.on_terminate(self)
+
+    def terminate(self):
+        self.terminated = True
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_after_the_connection_drops():
+    """Test that notifications resume on a new connection after a drop."""
+    connections = []
+    failures = [ConnectionError("starting up")]
+
+    async def connect():
+        if failures:
+            raise failures.pop()
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    payloads = []
+    reconnected = []
+    listener = NotificationListener(
+        "changes",
+        payloads.append,
+        on_reconnect=lambda: reconnected.append(True),
+        connect=connect,
+        max_backoff=0.01,
+    )
+    listener.start()
+    await asyncio.wait_for(listener.connected.wait(), 1)
+    connections[0].notify("articles")
+    assert reconnected == []
+
+    connections[0].drop()
+    await asyncio.sleep(0.05)
+    await asyncio.wait_for(listener.connected.wait(), 1)
+    assert connections[0].terminated
+    connections[1].notify("authors")
+    assert payloads == ["articles", "authors"]
+    assert reconnected == [True]
+
+    await listener.stop()
+    assert connections[1].terminated
+
+
+@pytest.mark.asyncio
+async def test_unresponsive_connection_is_replaced():
+    """Test that a connection failing the keepalive check is reopened."""
+    connections = []
+
+    class Hung(FakeConnection):
+        async def execute(self, query):
+            await asyncio.sleep(10)
+
+    async def connect():
+        connections.append(Hung() if not connections else FakeConnection())
+        return connections[-1]
+
+    listener = NotificationListener(
+        "changes", lambda payload: None, connect=connect, keepalive_interval=0.02
+    )
+    listener.start()
+    await asyncio.sleep(0.2)
+    assert len(connections) == 2
+    assert connections[0].terminated
+    assert listener.reconnects == 1
+    await listener.stop()
@@ -0,0 +1,103 @@
+"""Tests for memoized tools and prompts and compiled prompt templates."""
+
+import asyncio
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.utils import memo
+from src.utils.memo import PromptTemplate, TTLCache, cached_tool, memoize
+
+
+@pytest.mark.asyncio
+async def test_cached_tool_shares_entries_across_spellings():
+    """Test that equivalent calls hit one entry and errors are not cached."""
+    server = FastMCP("memo-test")
+    calls = []
+
+    @cached_tool(server, maxsize=8)
+    def scale(values: list, factor: float = 2.0) -> list:
+        """Scale values, failing on negative factors."""
+        calls.append((values, factor))
+        if factor < 0:
+            raise ValueError("negative factor")
+        return [v * factor for v in values]
+
+    await server.call_tool("scale", {"values": [1, 2]})
+    await server.call_tool("scale", {"values": [1, 2], "factor": 2.0})
+    for _ in range(2):
+        with pytest.raises(Exception):
+            await server.call_tool("scale", {"values": [1], "factor": -1})
+
+    assert len(calls) == 3
+    stats = memo.cache_stats()["tool:scale"]
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 3, 1)
+
+
+def test_ttl_and_lru_eviction(monkeypatch):
+    """Test that entries expire after the TTL and the LRU entry is evicted."""
+    now = [100.0]
+    monkeypatch.setattr(memo.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=2, ttl=10)
+    double = memoize(lambda x: x * 2, cache)
+
+    double(1)
+    double(2)
+    double(1)  # 1 is now the most recently used
+    double(3)  # evicts 2
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 1)
+    double(2)
+    now[0] += 11
+    double(3)
+    assert cache.misses == 5
+
+
+def test_unhashable_arguments_are_not_cached():
+    """Test that values without a safe key are never looked up by repr."""
+
+    class Matrix:
+        __hash__ = None
+
+        def __init__(self, total):
+            self.total = total
+
+        def __repr__(self):
+            return "Matrix(...)"
+
+    cache = TTLCache()
+    total = memoize(lambda m, scale=1: m.total * scale, cache)
+    assert total(Matrix(1)) == 1
+    assert total(Matrix(2)) == 2
+    assert len(cache) == 0
+
+    # JSON containers are still keyed by value
+    size = memoize(lambda items: len(items), cache)
+    assert size([1, {"a": 2}]) == size([1, {"a": 2}]) == 2
+    assert (len(cache), cache.hits) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_run_once():
+    """Test that concurrent calls with the same arguments share one run."""
+    runs = 0
+
+    async def slow(x: int) -> int:
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return x + 1
+
+    cached = memoize(slow, TTLCache())
+    assert await asyncio.gather(*(cached(1) for _ in range(5))) == [2] * 5
+    assert runs == 1
+
+
+def test_prompt_template_matches_format():
+    """Test that compiled templates render like str.format."""
+    text = "Compare {a} and {b}:\n{{literal}} {a}"
+    template = PromptTemplate(text)
+
+    assert template.fields == {"a", "b"}
+    assert template.render(a="x", b=1) == text.format(a="x", b=1)
+    with pytest.raises(ValueError):
+        PromptTemplate("{value:>10}")
@@ -0,0 +1,44 @@
+"""Tests for the Prometheus metrics registry and tool instrumentation."""
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.utils.metrics import MetricsRegistry, instrument_tools, registry
+
+
+def test_render_counter_and_histogram():
+    """Test the text exposition of labelled counters and histograms."""
+    metrics = MetricsRegistry()
+    metrics.counter("jobs_total", "Jobs run.", ["queue"]).labels("fast").inc(2)
+    latency = metrics.histogram("job_seconds", "Job latency.", buckets=[0.1, 1.0])
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    text = metrics.render()
+
+    assert '# TYPE jobs_total counter\njobs_total{queue="fast"} 2\n' in text
+    assert 'job_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'job_seconds_bucket{le="1"} 2\n' in text
+    assert 'job_seconds_bucket{le="+Inf"} 2\n' in text
+    assert "job_seconds_sum 0.55\n" in text
+    assert "job_seconds_count 2\n" in text
+
+
+@pytest.mark.asyncio
+async def test_instrumented_tools_record_calls_and_errors():
+    """Test that tool calls and failures are counted per tool."""
+    server = FastMCP("metrics-test")
+
+    @server.tool()
+    def metrics_test_fail() -> str:
+        """Always fail."""
+        raise RuntimeError("boom")
+
+    instrument_tools(server)
+    with pytest.raises(Exception):
+        await server.call_tool("metrics_test_fail", {})
+
+    text = registry.render()
+    assert 'mcp_tool_calls_total{tool="metrics_test_fail"} 1\n' in text
+    assert 'mcp_tool_errors_total{tool="metrics_test_fail"} 1\n' in text
+    assert 'mcp_tool_in_flight{tool="metrics_test_fail"} 0\n' in text
@@ -0,0 +1,50 @@
+"""Tests for keyset pagination cursors."""
+
+import pytest
+
+from src.database.pagination import (
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+    fingerprint,
+    next_cursor,
+)
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes to the position it was built from."""
+    search = fingerprint("fts", "articles", "postgres")
+    token = encode_cursor("fts", 0.0607927, 42, search)
+
+    assert decode_cursor(token, "fts", search) == (0.0607927, 42)
+
+
+def test_cursor_rejected_for_other_search():
+    """Test that cursors cannot be replayed against a different search."""
+    token = encode_cursor("fts", 0.5, 1, fingerprint("fts", "articles", "a"))
+
+    with pytest.raises(ValueError):
+        decode_cursor(token, "fts", fingerprint("fts", "articles", "b"))
+    with pytest.raises(ValueError):
+        decode_cursor(token, "vector", fingerprint("fts", "articles", "a"))
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "fts", fingerprint("fts", "articles", "a"))
+
+
+def test_next_cursor_trims_lookahead_row():
+    """Test that the extra lookahead row is dropped and drives the cursor."""
+    search = fingerprint("vector", "articles", [0.1, 0.2], 0.7)
+    rows = [{"id": i, "distance": i / 10} for i in range(4)]
+
+    token = next_cursor(rows, 3, "vector", "distance", "id", search)
+
+    assert [row["id"] for row in rows] == [0, 1, 2]
+    assert decode_cursor(token, "vector", search) == (0.2, 2)
+    assert next_cursor(rows, 3, "vector", "distance", "id", search) is None
+
+
+def test_clamp_limit():
+    """Test that page sizes are capped by the configured maximum."""
+    assert clamp_limit(10_000, 100) == 100
+    assert clamp_limit(0, 100) == 1
+    assert clamp_limit(25, 100) == 25
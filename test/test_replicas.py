@@ -0,0 +1,129 @@
+"""Tests for read replica routing and pool instrumentation."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from src.database.pool import InstrumentedQueuePool
+from src.database.replicas import Replica, ReplicaRouter
+
+
+class FakeEngine:
+    """Engine whose connections succeed, fail or hang."""
+
+    def __init__(self, behaviour="ok"):
+        self.behaviour = behaviour
+
+    def connect(self):
+        engine = self
+
+        class Connection:
+            async def __aenter__(self):
+                if engine.behaviour == "hang":
+                    await asyncio.sleep(10)
+                if engine.behaviour == "down":
+                    raise OSError("connection refused")
+                return self
+
+            async def __aexit__(self, *args):
+                return False
+
+            async def execute(self, statement):
+                return None
+
+        return Connection()
+
+
+def make_router(strategy="round_robin", *behaviours):
+    replicas = [
+        Replica(f"replica-{i}", FakeEngine(behaviour))
+        for i, behaviour in enumerate(behaviours)
+    ]
+    return ReplicaRouter(replicas, strategy=strategy, health_timeout=0.05)
+
+
+def test_round_robin_skips_unhealthy_replicas():
+    """Test that reads rotate over the replicas still in rotation."""
+    router = make_router("round_robin", "ok", "ok", "ok")
+    router.mark_unhealthy(router.replicas[1])
+    chosen = [router.choose().name for _ in range(4)]
+    assert chosen == ["replica-0", "replica-2"] * 2
+
+    for replica in router.replicas:
+        router.mark_unhealthy(replica)
+    assert router.choose() is None
+
+
+def test_least_outstanding_prefers_the_idlest_replica():
+    """Test that least_outstanding routes to the replica with least work."""
+    router = make_router("least_outstanding", "ok", "ok")
+    router.replicas[0].outstanding = 3
+    assert router.choose().name == "replica-1"
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_take_a_replica_out_of_rotation():
+    """Test that a disconnect fails the read over to the other replicas."""
+    router = make_router("round_robin", "ok", "ok")
+    with pytest.raises(OSError):
+        async with router.acquire() as replica:
+            assert replica.outstanding == 1
+            raise OSError("connection reset")
+    assert not replica.healthy
+    assert replica.outstanding == 0
+
+    async with router.acquire() as other:
+        assert other is not replica
+
+    with pytest.raises(exc.ProgrammingError):
+        async with router.acquire():
+            raise exc.ProgrammingError("SELECT", {}, Exception("syntax"))
+    assert other.healthy
+
+
+@pytest.mark.asyncio
+async def test_health_checks_time_out_while_connecting():
+    """Test that a replica that hangs on connect is marked unhealthy in time."""
+    router = make_router("round_robin", "ok", "hang", "down")
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await router.check_all()
+    assert loop.time() - start < 1
+    assert [replica.healthy for replica in router.replicas] == [True, False, False]
+
+    router.replicas[1].engine.behaviour = "ok"
+    assert await router.check(router.replicas[1])
+    assert router.replicas[1].failures == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_only_waits_for_a_free_slot():
+    """Test that opening connections is not a wait and timeouts not checkouts."""
+
+    def creator():
+        return mock.MagicMock()
+
+    pool = InstrumentedQueuePool(creator, pool_size=1, max_overflow=0, timeout=0.05)
+    first = await greenlet_spawn(pool.connect)
+    assert pool.checkouts == 1
+    assert pool.wait_seconds_total < 0.05
+
+    with pytest.raises(exc.TimeoutError):
+        await greenlet_spawn(pool.connect)
+    assert pool.checkouts == 1
+    assert pool.checkout_timeouts == 1
+
+    async def release():
+        await asyncio.sleep(0.02)
+        await greenlet_spawn(first.close)
+
+    pool._timeout = 1
+    releasing = asyncio.create_task(release())
+    second = await greenlet_spawn(pool.connect)
+    await releasing
+    assert pool.checkouts == 2
+    assert 0.015 < pool.wait_seconds_max < 0.5
+    await greenlet_spawn(second.close)
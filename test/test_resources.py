@@ -0,0 +1,79 @@
+"""Tests for chunked file resources."""
+
+import os
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.resources import FileStore, register_chunked_resources, resource_uri
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Serve a directory with one large binary file and one small text file."""
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "big.bin").write_bytes(os.urandom(250_000))
+    (tmp_path / "notes.txt").write_text("hello")
+    server = FastMCP("resources-test")
+    store = FileStore(str(tmp_path), chunk_size=100_000, cache_file_size=1000)
+    register_chunked_resources(
+        server, store, "artifact", "Test files", listing=store.listing
+    )
+    server.store = store
+    return server
+
+
+async def read(server, uri):
+    """Read a resource and return its single content item."""
+    (item,) = await server.read_resource(uri)
+    return item
+
+
+@pytest.mark.asyncio
+async def test_reads_large_files_in_chunks(server, tmp_path):
+    """Test that following nextUri reassembles the file chunk by chunk."""
+    expected = (tmp_path / "data" / "big.bin").read_bytes()
+    uri, data = resource_uri("artifact", "data/big.bin"), b""
+    while uri:
+        item = await read(server, uri)
+        assert len(item.content) <= 100_000
+        data += item.content
+        uri = item.meta.get("nextUri")
+    assert data == expected
+
+    item = await read(server, resource_uri("artifact", "data/big.bin", 1000, 10))
+    assert item.content == expected[1000:1010]
+    assert item.meta["nextUri"].endswith("offset=1010&length=10")
+
+
+@pytest.mark.asyncio
+async def test_conditional_reads_and_cache(server, tmp_path):
+    """Test ETag revalidation and that small files are served from the cache."""
+    first = await read(server, "artifact://notes.txt")
+    assert first.content == "hello"
+    etag = first.meta["etag"]
+
+    unchanged = await read(
+        server, resource_uri("artifact", "notes.txt", if_none_match=etag)
+    )
+    assert unchanged.content == b"" and unchanged.meta["notModified"]
+    assert server.store.cache.hits == 0
+    await read(server, "artifact://notes.txt")
+    assert server.store.cache.hits == 1
+
+    (tmp_path / "notes.txt").write_text("hello again")
+    changed = await read(
+        server, resource_uri("artifact", "notes.txt", if_none_match=etag)
+    )
+    assert changed.content == "hello again" and changed.meta["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_lists_files_and_rejects_escapes(server):
+    """Test listing with sizes and that paths outside the root are refused."""
+    resources = await server.list_resources()
+    listed = {str(r.uri): r.meta["size"] for r in resources}
+    assert listed == {"artifact://data/big.bin": 250_000, "artifact://notes.txt": 5}
+
+    with pytest.raises(Exception, match="Not a resource"):
+        await read(server, "artifact://../../etc/passwd")
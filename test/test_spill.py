@@ -0,0 +1,69 @@
+"""Tests for paging large tool results."""
+
+import json
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.tools.result_pages import register_result_pages
+from src.utils.spill import SpillStore
+
+
+@pytest.fixture
+def server(tmp_path):
+    """A server whose tool returns 1000 rows, paged 100 at a time."""
+    server = FastMCP("spill-test")
+
+    @server.tool()
+    def search(rows: int = 1000) -> dict:
+        return {"results": [{"id": i, "text": "x" * 300} for i in range(rows)]}
+
+    register_result_pages(server, SpillStore(directory=str(tmp_path)))
+    return server
+
+
+def text(result):
+    """Decode the JSON text of a tool result's last content block."""
+    if isinstance(result, tuple):
+        result = result[0]
+    content = getattr(result, "content", result)
+    return json.loads(content[-1].text)
+
+
+@pytest.mark.asyncio
+async def test_large_results_are_paged(server):
+    """Test that following next_offset returns every row exactly once."""
+    first = text(await server.call_tool("search", {}))
+    rows, page = first["results"], first["result_page"]
+    assert len(rows) == 100 and page["total"] == 1000 and page["field"] == "results"
+
+    offset = page["next_offset"]
+    while offset is not None:
+        result = await server.call_tool(
+            "fetch_result_page", {"handle": page["handle"], "offset": offset}
+        )
+        body = text(result)
+        rows += body["items"]
+        offset = body["result_page"]["next_offset"]
+    assert [row["id"] for row in rows] == list(range(1000))
+
+
+@pytest.mark.asyncio
+async def test_small_results_are_not_paged(server):
+    """Test that results under the thresholds are returned whole."""
+    body = text(await server.call_tool("search", {"rows": 50}))
+    assert len(body["results"]) == 50 and "result_page" not in body
+
+
+@pytest.mark.asyncio
+async def test_store_overflows_to_disk_and_evicts(tmp_path):
+    """Test that older results move to disk and the oldest are dropped."""
+    store = SpillStore(memory_limit=100, disk_limit=200, directory=str(tmp_path))
+    items = [b'"%s"' % (b"x" * 8) for _ in range(8)]  # 88 bytes each
+    handles = [await store.put(items) for _ in range(4)]
+
+    assert store.stats()["memory_bytes"] == 88 and store.stats()["disk_bytes"] == 176
+    with pytest.raises(ValueError):
+        await store.page(handles[0], 0, 10)
+    data, total, next_offset = await store.page(handles[1], 6, 10)
+    assert json.loads(data) == ["x" * 8] * 2 and total == 8 and next_offset is None
@@ -0,0 +1,33 @@
+"""Startup time tests for the MCP Server Template."""
+
+import os
+import subprocess
+import sys
+
+from src.config import config
+from src.utils.startup import measure_import_time
+
+
+def test_startup_within_budget():
+    """Test that importing the server entry point stays within the budget."""
+    elapsed_ms = measure_import_time("src.main")
+    assert elapsed_ms <= config.startup_budget_ms, (
+        f"Importing src.main took {elapsed_ms:.1f} ms, "
+        f"over the {config.startup_budget_ms:.1f} ms startup budget"
+    )
+
+
+def test_heavy_modules_not_imported_at_startup():
+    """Test that the database stack is not imported without a database."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, src.main; print('sqlalchemy' in sys.modules)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "DB_ENABLED": "false"},
+    )
+    assert result.stdout.strip() == "False"
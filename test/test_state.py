@@ -0,0 +1,210 @@
+"""Tests for shared rate limits and caches."""
+
+import asyncio
+from importlib.util import find_spec
+
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.exceptions import McpError
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.api.factory import APIToolFactory
+from src.api.models import RateLimitConfig
+from src.utils.limits import OVERLOADED, propagate_tool_errors
+from src.utils.ratelimit import RateLimiter
+from src.utils.state import MemoryBackend, RedisBackend, SharedCache
+
+needs_fakeredis = pytest.mark.skipif(
+    find_spec("fakeredis") is None or find_spec("lupa") is None,
+    reason="fakeredis[lua] is not installed",
+)
+
+
+def fake_redis():
+    import fakeredis
+
+    return fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer())
+
+
+@pytest.mark.asyncio
+async def test_buckets_are_taken_from_together():
+    """Test that a take succeeds on every bucket or on none of them."""
+    backend = MemoryBackend()
+    buckets = [("minute", 1 / 60, 2.0), ("hour", 1 / 3600, 1.0)]
+    assert await backend.take(buckets) == 0
+    assert await backend.take(buckets) > 0
+    # The rejected take left the minute bucket's second token in place
+    assert await backend.take(buckets[:1]) == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_with_retry_after():
+    """Test that a call over the limit fails fast with a retryable error."""
+    limiter = RateLimiter("upstream", RateLimitConfig(requests_per_minute=1))
+    limiter._backend = MemoryBackend()
+    await limiter.acquire()
+    with pytest.raises(McpError) as error:
+        await limiter.acquire()
+    assert error.value.error.code == OVERLOADED
+    assert error.value.error.data["reason"] == "rate_limited"
+    assert error.value.error.data["retryAfter"] > 1
+    assert limiter.stats() == {"allowed": 1, "rejected": 1}
+
+
+@needs_fakeredis
+@pytest.mark.asyncio
+async def test_redis_buckets_are_shared_and_atomic():
+    """Test that replicas sharing Redis share one limit, even when racing."""
+    client = fake_redis()
+    replicas = [RedisBackend(client=client) for _ in range(4)]
+    limits = RateLimitConfig(requests_per_minute=10, requests_per_hour=100)
+    limiters = [RateLimiter("api", limits, backend, max_wait=0) for backend in replicas]
+
+    async def call(limiter):
+        try:
+            await limiter.acquire()
+            return True
+        except McpError:
+            return False
+
+    results = await asyncio.gather(*(call(limiters[i % 4]) for i in range(40)))
+    assert sum(results) == 10
+    assert all(backend.available for backend in replicas)
+    await client.aclose()
+
+
+@needs_fakeredis
+@pytest.mark.asyncio
+async def test_cache_is_shared_between_replicas():
+    """Test that a value cached by one replica is served by another."""
+    client = fake_redis()
+    first = SharedCache("test", 60, backend=RedisBackend(client=client))
+    second = SharedCache("test", 60, backend=RedisBackend(client=client))
+    await first.set(["query", 1], {"rows": [1, 2]})
+    # Both share this process's local cache; drop it as another replica would
+    second.local.clear()
+    assert await second.get(["query", 1]) == {"rows": [1, 2]}
+    assert second.shared_hits == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_cached_values_cannot_be_changed_by_callers():
+    """Test that modifying a value taken from the cache leaves the cache as is."""
+    cache = SharedCache("copies", 60, backend=MemoryBackend())
+    cache.local.clear()
+    value = {"rows": [1, 2]}
+    await cache.set("query", value)
+    value["rows"].append(3)
+    (await cache.get("query"))["rows"].append(4)
+    assert await cache.get("query") == {"rows": [1, 2]}
+
+
+class _DownClient:
+    def register_script(self, script):
+        async def run(keys, args):
+            raise ConnectionError("unreachable")
+
+        return run
+
+    async def get(self, key):
+        raise ConnectionError("unreachable")
+
+    async def set(self, key, value, px):
+        raise ConnectionError("unreachable")
+
+
+@pytest.mark.asyncio
+async def test_unavailable_store_falls_back_to_local_share():
+    """Test that limits are enforced locally, scaled down, while Redis is down."""
+    backend = RedisBackend(client=_DownClient(), local_share=0.5, retry_interval=60)
+    limiter = RateLimiter("api", RateLimitConfig(requests_per_minute=4), backend)
+    limiter.max_wait = 0
+    await limiter.acquire()
+    await limiter.acquire()
+    with pytest.raises(McpError):
+        await limiter.acquire()
+    assert not backend.available and backend.failures == 1
+
+    await backend.set("key", b"1", 60)
+    assert await backend.get("key") == b"1"
+
+
+@pytest.mark.asyncio
+async def test_api_tools_are_rate_limited_and_cached():
+    """Test that generated tools share the limit and skip it on cache hits."""
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    factory = APIToolFactory()
+    factory._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    limiter = RateLimiter("rl.test", RateLimitConfig(requests_per_minute=2))
+    limiter._backend = MemoryBackend()
+    limiter.max_wait = 0
+    cache = SharedCache("api:rl.test", 60, backend=MemoryBackend())
+    cache.local.clear()
+    get_item = factory._operation_function(
+        "/items/{id}",
+        "get",
+        [{"name": "id", "in": "path"}],
+        {},
+        "http://rl.test",
+        limiter,
+        cache,
+    )
+
+    assert await get_item(id=1) == {"path": "/items/1"}
+    assert await get_item(id=1) == {"path": "/items/1"}
+    await get_item(id=2)
+    with pytest.raises(McpError):
+        await get_item(id=3)
+    await factory.aclose()
+
+    assert requests == ["/items/1", "/items/2"]
+
+
+@pytest.mark.asyncio
+async def test_clients_see_rate_limit_errors():
+    """Test that a client session gets the retry-after of a rate-limited call."""
+    factory = APIToolFactory()
+    factory._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+    )
+    limiter = RateLimiter("rl.client", RateLimitConfig(requests_per_minute=1))
+    limiter._backend = MemoryBackend()
+    limiter.max_wait = 0
+    operation = factory._operation_function(
+        "/items/{id}", "get", [{"name": "id", "in": "path"}], {}, "http://rl", limiter
+    )
+    server = FastMCP("rate-limit-test")
+
+    @server.tool()
+    async def get_item(id: int) -> dict:
+        return await operation(id=id)
+
+    propagate_tool_errors(server)
+    async with create_connected_server_and_client_session(server) as client:
+        assert not (await client.call_tool("get_item", {"id": 1})).isError
+        with pytest.raises(McpError) as error:
+            await client.call_tool("get_item", {"id": 2})
+    await factory.aclose()
+
+    assert error.value.error.code == OVERLOADED
+    assert error.value.error.data["reason"] == "rate_limited"
+    assert error.value.error.data["retryAfter"] > 0
+
+
+def test_rate_limits_are_scoped_by_api_name():
+    """Test that APIs on one host keep separate limits unless names clash."""
+    factory = APIToolFactory()
+    per_minute = RateLimitConfig(requests_per_minute=60)
+    first = factory._rate_limiter("search", per_minute)
+    second = factory._rate_limiter("admin", RateLimitConfig(requests_per_minute=5))
+    assert first.buckets[0][0] != second.buckets[0][0]
+    assert factory._rate_limiter("search", per_minute) is first
+    with pytest.raises(ValueError, match="Conflicting rate limits"):
+        factory._rate_limiter("search", RateLimitConfig(requests_per_minute=5))
@@ -0,0 +1,152 @@
+"""Tests for the stdio transport."""
+
+import asyncio
+import io
+import json
+import time
+
+import pytest
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+from src.resources.subscriptions import close_session, enable_subscriptions, get_hub
+from src.transport.dispatch import JSONRPCDispatcher
+from src.transport.stdio import StdioTransport
+
+
+def make_server() -> FastMCP:
+    """Build a server with a tool that records how many calls overlap."""
+    server = FastMCP("stdio-test")
+    running = {"now": 0, "peak": 0}
+
+    @server.tool()
+    async def wait(seconds: float) -> float:
+        """Sleep, then return the seconds slept."""
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            running["now"] -= 1
+        return seconds
+
+    server.running = running
+    return server
+
+
+def call(request_id, seconds):
+    """Build a tools/call request for the wait tool."""
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "wait", "arguments": {"seconds": seconds}},
+    }
+
+
+async def serve(server, messages, max_concurrency=64):
+    """Serve the messages as stdin lines and return the decoded responses."""
+    stdin = io.BytesIO(b"".join(json.dumps(m).encode() + b"\n" for m in messages))
+    stdout = io.BytesIO()
+    transport = StdioTransport(
+        JSONRPCDispatcher(server), max_concurrency, stdin=stdin, stdout=stdout
+    )
+    await asyncio.wait_for(transport.serve(), 5)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_requests_run_concurrently_up_to_the_limit():
+    """Test that requests overlap, but never more than max_concurrency."""
+    server = make_server()
+    start = time.perf_counter()
+    responses = await serve(server, [call(i, 0.05) for i in range(8)], 4)
+    assert time.perf_counter() - start < 0.3
+    assert sorted(r["id"] for r in responses) == list(range(8))
+    assert server.running["peak"] == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_requests_are_not_answered():
+    """Test that notifications/cancelled stops the request it names."""
+    server = make_server()
+    cancel = {
+        "jsonrpc": "2.0",
+        "method": "notifications/cancelled",
+        "params": {"requestId": "slow"},
+    }
+    ping = {"jsonrpc": "2.0", "id": 2, "method": "ping"}
+    start = time.perf_counter()
+    responses = await serve(server, [call("slow", 10), cancel, ping])
+    assert time.perf_counter() - start < 1
+    assert [r["id"] for r in responses] == [2]
+
+
+@pytest.mark.asyncio
+async def test_malformed_ids_are_rejected_without_stopping_the_server():
+    """Test that unhashable ids and cancel targets do not break the loop."""
+    server = make_server()
+    messages = [
+        {"jsonrpc": "2.0", "id": [1], "method": "ping"},
+        {"jsonrpc": "2.0", "id": {"a": 1}, "method": "ping"},
+        {
+            "jsonrpc": "2.0",
+            "method": "notifications/cancelled",
+            "params": {"requestId": [1]},
+        },
+        {"jsonrpc": "2.0", "id": 3, "method": "ping"},
+    ]
+    responses = await serve(server, messages)
+    errors = [r for r in responses if "error" in r]
+    assert [e["error"]["code"] for e in errors] == [types.INVALID_REQUEST] * 2
+    assert all(e["id"] is None for e in errors)
+    assert {"jsonrpc": "2.0", "id": 3, "result": {}} in responses
+
+
+@pytest.mark.asyncio
+async def test_requests_go_through_the_server_handlers():
+    """Test that subscriptions and errors behave as on the SDK transports."""
+    server = make_server()
+    enable_subscriptions(server)
+    dispatcher = JSONRPCDispatcher(server)
+    sent = []
+    dispatcher.session.send = sent.append
+
+    async def request(request_id, method, params=None):
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        return await dispatcher.dispatch(message)
+
+    initialize = await request(
+        1,
+        "initialize",
+        {
+            "protocolVersion": "2025-06-18",
+            "capabilities": {"experimental": {"priority": {"class": "batch"}}},
+            "clientInfo": {"name": "test", "version": "1"},
+        },
+    )
+    assert initialize["result"]["capabilities"]["resources"]["subscribe"] is True
+    assert dispatcher.session.client_params.clientInfo.name == "test"
+
+    uri = "artifact://stdio.csv"
+    assert (await request(2, "resources/subscribe", {"uri": uri}))["result"] == {}
+    get_hub().changed(uri)
+    await get_hub().flush()
+    assert sent == [
+        {
+            "jsonrpc": "2.0",
+            "method": "notifications/resources/updated",
+            "params": {"uri": uri},
+        }
+    ]
+    close_session(dispatcher.session)
+    assert not get_hub().subscribed(uri)
+
+    missing = await request(3, "tools/missing")
+    assert missing["error"]["code"] == types.METHOD_NOT_FOUND
+    invalid = await request(4, "resources/subscribe", {})
+    assert invalid["error"]["code"] == types.INVALID_PARAMS
+    failed = await request(5, "tools/call", {"name": "wait", "arguments": {}})
+    assert failed["result"]["isError"] is True
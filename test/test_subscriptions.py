@@ -0,0 +1,115 @@
+"""Tests for resource subscriptions and change notifications."""
+
+import asyncio
+import os
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel.server import NotificationOptions
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from src.resources import (
+    FileStore,
+    Subscriber,
+    SubscriptionHub,
+    enable_subscriptions,
+    get_hub,
+)
+
+
+def recorder():
+    """Create a subscriber that records the notifications it is sent."""
+    messages = []
+    subscriber = Subscriber(messages.append)
+    subscriber.messages = messages
+    return subscriber
+
+
+@pytest.mark.asyncio
+async def test_changes_in_a_window_are_coalesced():
+    """Test that a burst of changes sends one notification per URI."""
+    hub = SubscriptionHub(window=0.05)
+    subscriber = recorder()
+    hub.subscribe("db://collections/articles", subscriber)
+    hub.listen(subscriber)
+
+    for _ in range(100):
+        hub.changed("db://collections/articles")
+        hub.changed("db://collections/unwatched")
+    hub.list_changed("tools")
+    await asyncio.sleep(0.2)
+
+    assert sorted(message["method"] for message in subscriber.messages) == [
+        "notifications/resources/updated",
+        "notifications/tools/list_changed",
+    ]
+    assert subscriber.messages[0]["params"] == {"uri": "db://collections/articles"}
+
+
+@pytest.mark.asyncio
+async def test_fan_out_drops_failed_subscribers():
+    """Test that every subscriber is notified and a failing one is removed."""
+    hub = SubscriptionHub(window=0.01, send_timeout=0.1)
+    subscribers = [recorder() for _ in range(50)]
+
+    async def hang(message):
+        await asyncio.sleep(10)
+
+    stuck = Subscriber(hang)
+    for subscriber in subscribers + [stuck]:
+        hub.subscribe("artifact://report.csv", subscriber)
+
+    hub.changed("artifact://report.csv")
+    await hub.flush()
+
+    assert all(len(subscriber.messages) == 1 for subscriber in subscribers)
+    assert hub.stats()["subscriptions"] == 50
+
+
+@pytest.mark.asyncio
+async def test_file_watch_reports_modified_files(tmp_path):
+    """Test that rewriting a watched file notifies its subscribers."""
+    (tmp_path / "report.csv").write_text("a,b\n")
+    hub = SubscriptionHub(window=0.01)
+    subscriber = recorder()
+    hub.subscribe("artifact://report.csv", subscriber)
+    watch = asyncio.create_task(FileStore(str(tmp_path)).watch(hub, "artifact", 0.05))
+    try:
+        await asyncio.sleep(0.1)
+        (tmp_path / "report.csv").write_text("a,b\n1,2\n")
+        os.utime(tmp_path / "report.csv", ns=(0, 0))
+        await asyncio.sleep(0.3)
+    finally:
+        watch.cancel()
+
+    assert subscriber.messages == [
+        {
+            "jsonrpc": "2.0",
+            "method": "notifications/resources/updated",
+            "params": {"uri": "artifact://report.csv"},
+        }
+    ]
+
+
+def test_capabilities_advertise_subscriptions():
+    """Test that the server advertises subscriptions and list changes."""
+    server = FastMCP("subscriptions-test")
+    enable_subscriptions(server)
+    capabilities = server._mcp_server.get_capabilities(NotificationOptions(), {})
+    assert capabilities.resources.subscribe is True
+    assert capabilities.tools.listChanged is True
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_are_dropped_when_the_session_closes():
+    """Test that a closed session no longer holds subscriptions."""
+    server = FastMCP("subscriptions-test")
+    enable_subscriptions(server)
+    hub = get_hub()
+    before = hub.stats()["subscriptions"]
+    async with create_connected_server_and_client_session(server) as client:
+        await client.subscribe_resource("db://collections/articles")
+        await client.list_tools()
+        assert hub.stats()["subscriptions"] == before + 1
+    assert hub.stats()["subscriptions"] == before
+    assert not hub.subscribed("db://collections/articles")
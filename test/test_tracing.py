@@ -0,0 +1,49 @@
+"""Tests for request tracing and the sampling profiler."""
+
+import json
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.utils import tracing
+from src.utils.profiler import collapsed, sample_stacks
+
+
+@pytest.mark.asyncio
+async def test_tool_call_trace(tmp_path, monkeypatch):
+    """Test that a tool call produces a root span with nested child spans."""
+    monkeypatch.setattr(tracing, "_tracer", None)
+    target = tmp_path / "spans.jsonl"
+    tracer = tracing.configure_tracing(str(target), "trace-test")
+    server = FastMCP("trace-test")
+
+    @server.tool()
+    def traced_add(a: int, b: int) -> int:
+        """Add two numbers inside a child span."""
+        with tracing.span("add.compute") as current:
+            current.set_attribute("operands", 2)
+            return a + b
+
+    tracing.trace_tools(server)
+    await server.call_tool("traced_add", {"a": 1, "b": 2})
+    await tracer.exporter.flush()
+
+    payload = json.loads(target.read_text())
+    spans = {
+        span["name"]: span
+        for span in payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    }
+    root = spans["tools/call traced_add"]
+    assert "parentSpanId" not in root
+    assert {span["traceId"] for span in spans.values()} == {root["traceId"]}
+    assert spans["tool.validate"]["parentSpanId"] == root["spanId"]
+    assert spans["tool.execute"]["parentSpanId"] == root["spanId"]
+    assert spans["add.compute"]["parentSpanId"] == spans["tool.execute"]["spanId"]
+
+
+def test_collapsed_stacks():
+    """Test that profiles render one 'frames count' line per stack."""
+    assert collapsed({"main;a": 1, "main;a;b": 3}) == "main;a;b 3\nmain;a 1\n"
+    for line in collapsed(sample_stacks(0.02, interval=0.005)).splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert stack and int(count) > 0
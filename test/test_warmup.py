@@ -0,0 +1,102 @@
+"""Tests for startup warm-up and readiness."""
+
+import asyncio
+
+import httpx
+import pytest
+from mcp.server.fastmcp import FastMCP
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.api.factory import APIToolFactory
+from src.api.models import RateLimitConfig
+from src.utils.ratelimit import RateLimiter
+from src.utils.state import MemoryBackend
+from src.utils.warmup import (
+    readiness_endpoint,
+    set_ready,
+    warm_tool_validators,
+    warm_up,
+)
+
+
+@pytest.mark.asyncio
+async def test_failed_and_slow_steps_do_not_block_startup():
+    """Test that warm-up reports each step and gives up at the timeout."""
+
+    async def fast():
+        return 3
+
+    async def broken():
+        raise ConnectionError("refused")
+
+    async def slow():
+        await asyncio.sleep(10)
+
+    report = await warm_up({"fast": fast, "broken": broken, "slow": slow}, 0.05)
+    assert report["fast"]["result"] == 3
+    assert "refused" in report["broken"]["error"]
+    assert report["slow"] == {"error": "timed out"}
+
+
+@pytest.mark.asyncio
+async def test_tool_definitions_are_cached_for_validation():
+    """Test that warming fills the tool cache calls are validated against."""
+    server = FastMCP("warmup-test")
+
+    @server.tool()
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    assert await warm_tool_validators(server) == 1
+    assert "add" in server._mcp_server._tool_cache
+
+
+@pytest.mark.asyncio
+async def test_upstream_connections_are_opened_per_api():
+    """Test that each API is contacted once per connection its limit allows."""
+    hosts = []
+
+    def handler(request):
+        hosts.append((request.method, request.url.host))
+        return httpx.Response(404)
+
+    factory = APIToolFactory()
+    factory._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    limiter = RateLimiter("two", RateLimitConfig(requests_per_minute=1))
+    limiter._backend = MemoryBackend()
+    limiter.max_wait = 0
+    factory._base_urls = {"https://one.test/v1": None, "https://two.test": limiter}
+    assert await factory.warm_connections(2) == 3
+    await factory.aclose()
+    assert sorted(hosts) == [("HEAD", "one.test")] * 2 + [("HEAD", "two.test")]
+    assert limiter.stats() == {"allowed": 1, "rejected": 1}
+
+
+def test_readiness_follows_startup_and_shutdown():
+    """Test that the readiness endpoint answers 503 until ready."""
+    app = Starlette(routes=[Route("/ready", readiness_endpoint)])
+    client = TestClient(app)
+    set_ready(False)
+    assert client.get("/ready").status_code == 503
+    set_ready(True, {"json codec": {"seconds": 0.001, "result": "json"}})
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["warmup"]["json codec"]["result"] == "json"
+    set_ready(False)
+    assert client.get("/ready").status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_the_api_provider(monkeypatch):
+    """Test that shutdown closes the upstream client of the API tools."""
+    import src.main
+    from src.api.provider import DynamicToolProvider
+
+    provider = DynamicToolProvider()
+    client = provider._factory._http_client
+    monkeypatch.setattr(src.main.config.db, "DB_ENABLED", False)
+    monkeypatch.setattr(src.main, "_api_provider", provider)
+    await src.main.shutdown()
+    assert client.is_closed